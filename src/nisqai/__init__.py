@@ -20,6 +20,8 @@ import nisqai.encode
 import nisqai.layer
 import nisqai.measure
 import nisqai.network
+import nisqai.serve
+import nisqai.simulate
 import nisqai.utils
 import nisqai.visual
 import nisqai.optimize
@@ -11,4 +11,8 @@
 #   limitations under the License.
 
 from nisqai.cost._classical_costs import indicator
+from nisqai.cost._network_costs import (
+    NetworkCost, Misclassification, CrossEntropy, Hinge, class_probabilities,
+    MulticlassCost, MulticlassCrossEntropy, class_scores, readout_matrix
+)
 from nisqai.cost._quantum_costs import HilbertSchmidtDistance
@@ -0,0 +1,292 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Cost functions which evaluate the outcomes of a batch of data points at once.
+
+A network cost is a callable
+
+    cost(outcomes, labels, predictor) --> float
+
+which returns the total cost of a batch of data points, where outcomes are the
+MeasurementOutcomes of the data points, labels are their labels, and predictor is
+the predictor function of the network. Networks divide the total by the number of
+data points. Costs must be non-negative so that partial sums are lower bounds
+(see Network.cost with a bound).
+
+Differentiable costs also implement
+
+    cost.gradient(p, labels) --> numpy.ndarray
+
+which returns the derivative of the total cost with respect to the class probability
+p of each data point, for use with Network.gradient.
+
+The class probability of a data point is the probability that the first measured
+bit is one. For exact outcomes (shots=None) it is exact, otherwise it is the
+fraction of shots in which the first bit is one.
+
+Multiclass costs instead input the class scores of the data points (see class_scores)
+
+    cost(scores, labels) --> float
+    cost.gradient(scores, labels) --> numpy.ndarray
+
+for use with nisqai.network.MulticlassNetwork.
+"""
+
+from numpy import arange, array, asarray, clip, log, maximum, ones, stack, where, zeros
+
+from nisqai.cost._classical_costs import DistributionCostFunctions
+
+
+def class_probabilities(outcomes):
+    """Returns the probabilities that the measured bit is one as an array.
+
+    The outcomes must have a single measured bit. With more bits, split_predictor
+    predicts from the largest bit average, and no single probability matches its prediction.
+    Use a MulticlassNetwork for several measured bits.
+
+    Args:
+        outcomes : Union[list[MeasurementOutcome], numpy.ndarray]
+            MeasurementOutcomes of the data points, or an array of shape
+            (num_data_points, 2) with the probabilities of both values of the bit.
+    """
+    if isinstance(outcomes, list):
+        averages = [out.average() for out in outcomes]
+        if any(len(average) != 1 for average in averages):
+            raise ValueError("Class probabilities require outcomes of a single measured bit.")
+        return array([average[0] for average in averages], dtype=float)
+
+    probs = asarray(outcomes, dtype=float)
+    if probs.shape[1] != 2:
+        raise ValueError("Class probabilities require outcomes of a single measured bit.")
+    return probs[:, 1]
+
+
+# Ways to read the class scores of a multiclass network from its measurement outcomes
+READOUTS = ("qubits", "bitstrings")
+
+
+def readout_matrix(num_bits, num_classes, readout="qubits"):
+    """Returns the matrix M such that the class scores are probs @ M for probabilities probs of all bit strings.
+
+    Args:
+        num_bits : int
+            Number of measured bits.
+
+        num_classes : int
+            Number of classes.
+
+        readout : str (default: "qubits")
+            "qubits": The score of class c is the probability that the measured bit c is one
+                (one-vs-rest). Requires at least num_classes measured bits.
+            "bitstrings": The score of class c is the probability of the bit strings whose
+                integer value is c modulo num_classes. The scores sum to one.
+    """
+    integers = arange(2 ** num_bits)
+    if readout == "qubits":
+        if num_bits < num_classes:
+            raise ValueError(
+                "The qubits readout requires {} measured bits, got {}.".format(num_classes, num_bits)
+            )
+        # The first bit is the most significant bit of the index
+        shifts = arange(num_bits - 1, num_bits - 1 - num_classes, -1)
+        return ((integers[:, None] >> shifts) & 1).astype(float)
+    if readout == "bitstrings":
+        if 2 ** num_bits < num_classes:
+            raise ValueError(
+                "The bitstrings readout requires at least {} bit strings, got {}.".format(num_classes, 2 ** num_bits)
+            )
+        matrix = zeros((2 ** num_bits, num_classes))
+        matrix[integers, integers % num_classes] = 1.0
+        return matrix
+    raise ValueError("Unknown readout {}. Options are {}.".format(readout, ", ".join(READOUTS)))
+
+
+def class_scores(outcomes, num_classes, readout="qubits"):
+    """Returns the scores of all classes for each outcome as an array of shape (len(outcomes), num_classes).
+
+    All scores of a data point come from the same shots, see readout_matrix.
+
+    Args:
+        outcomes : Union[list[MeasurementOutcome], numpy.ndarray]
+            MeasurementOutcomes of the data points, or an array of shape
+            (num_data_points, 2 ** n) with the probabilities of all bit strings.
+
+        num_classes : int
+            Number of classes.
+
+        readout : str (default: "qubits")
+            How class scores are read from the bit strings. See readout_matrix.
+    """
+    if isinstance(outcomes, list):
+        outcomes = [out.probabilities() for out in outcomes]
+    probs = asarray(outcomes, dtype=float)
+    num_bits = probs.shape[1].bit_length() - 1
+    return probs @ readout_matrix(num_bits, num_classes, readout)
+
+
+class NetworkCost:
+    """Base class for cost functions of a batch of data points."""
+
+    def __call__(self, outcomes, labels, predictor=None):
+        """Returns the total cost of the data points.
+
+        Args:
+            outcomes : list[MeasurementOutcome]
+                Outcomes of the data points.
+
+            labels : numpy.ndarray
+                Labels (zero or one) of the data points.
+
+            predictor : Callable
+                Predictor function of the network.
+        """
+        raise NotImplementedError
+
+    def gradient(self, p, labels):
+        """Returns the derivatives of the total cost with respect to the class probabilities.
+
+        Args:
+            p : numpy.ndarray
+                Class probabilities of the data points.
+
+            labels : numpy.ndarray
+                Labels (zero or one) of the data points.
+        """
+        raise NotImplementedError("{} is not differentiable.".format(type(self).__name__))
+
+
+class Misclassification(NetworkCost):
+    """Number of data points whose prediction is not their label."""
+
+    def __call__(self, outcomes, labels, predictor=None):
+        if predictor is None:
+            raise ValueError("The misclassification cost requires a predictor.")
+        predictions = array([predictor(out) for out in outcomes])
+        return float((predictions != asarray(labels)).sum())
+
+
+class CrossEntropy(NetworkCost):
+    """Cross entropy (in bits) between the labels and the class probabilities.
+
+    The cost of a data point with label y and class probability p is
+
+        -y log2(p) - (1 - y) log2(1 - p).
+    """
+
+    def __init__(self, eps=1e-12):
+        """Initializes a CrossEntropy cost.
+
+        Args:
+            eps : float (default: 1e-12)
+                Class probabilities are clipped to [eps, 1 - eps] to keep the cost finite.
+        """
+        self.eps = eps
+
+    def __call__(self, outcomes, labels, predictor=None):
+        p = clip(class_probabilities(outcomes), self.eps, 1 - self.eps)
+        y = asarray(labels, dtype=float)
+
+        # Sum of the cross entropies of all data points, as one pair of flat distributions
+        network = stack([1 - p, p], axis=1).ravel()
+        known = stack([1 - y, y], axis=1).ravel()
+        return float(DistributionCostFunctions(network, known).cross_entropy_reverse())
+
+    def gradient(self, p, labels):
+        p = clip(asarray(p, dtype=float), self.eps, 1 - self.eps)
+        y = asarray(labels, dtype=float)
+        return (-y / p + (1 - y) / (1 - p)) / log(2)
+
+
+class Hinge(NetworkCost):
+    """Hinge loss of the class probabilities.
+
+    The score 2p - 1 of a data point with class probability p is in [-1, 1]. The cost
+    of a data point with label y is max(0, margin - (2y - 1)(2p - 1)).
+    """
+
+    def __init__(self, margin=1.0):
+        """Initializes a Hinge cost.
+
+        Args:
+            margin : float (default: 1.0)
+                Score beyond which correctly classified data points have zero cost.
+        """
+        self.margin = margin
+
+    def __call__(self, outcomes, labels, predictor=None):
+        score = 2 * class_probabilities(outcomes) - 1
+        sign = 2 * asarray(labels, dtype=float) - 1
+        return float(maximum(0.0, self.margin - sign * score).sum())
+
+    def gradient(self, p, labels):
+        sign = 2 * asarray(labels, dtype=float) - 1
+        active = self.margin - sign * (2 * asarray(p, dtype=float) - 1) > 0
+        return where(active, -2 * sign, 0.0)
+
+
+class MulticlassCost:
+    """Base class for cost functions of the class scores of a batch of data points."""
+
+    def __call__(self, scores, labels):
+        """Returns the total cost of the data points.
+
+        Args:
+            scores : numpy.ndarray
+                Class scores of the data points, of shape (num_data_points, num_classes).
+
+            labels : numpy.ndarray
+                Labels (0, 1, ..., num_classes - 1) of the data points.
+        """
+        raise NotImplementedError
+
+    def gradient(self, scores, labels):
+        """Returns the derivatives of the total cost with respect to the class scores.
+
+        Args:
+            scores : numpy.ndarray
+                Class scores of the data points, of shape (num_data_points, num_classes).
+
+            labels : numpy.ndarray
+                Labels (0, 1, ..., num_classes - 1) of the data points.
+        """
+        raise NotImplementedError("{} is not differentiable.".format(type(self).__name__))
+
+
+class MulticlassCrossEntropy(MulticlassCost):
+    """Cross entropy (in bits) between the labels and the normalized class scores.
+
+    The cost of a data point with label y and class scores s is
+
+        -log2(s_y / sum_c s_c).
+    """
+
+    def __init__(self, eps=1e-12):
+        """Initializes a MulticlassCrossEntropy cost.
+
+        Args:
+            eps : float (default: 1e-12)
+                Class scores are clipped to at least eps to keep the cost finite.
+        """
+        self.eps = eps
+
+    def __call__(self, scores, labels):
+        s = clip(asarray(scores, dtype=float), self.eps, None)
+        rows = arange(len(s))
+        return float(-log(s[rows, asarray(labels, dtype=int)] / s.sum(axis=1)).sum() / log(2))
+
+    def gradient(self, scores, labels):
+        s = clip(asarray(scores, dtype=float), self.eps, None)
+        rows = arange(len(s))
+        labels = asarray(labels, dtype=int)
+        grad = ones(s.shape) / s.sum(axis=1, keepdims=True)
+        grad[rows, labels] -= 1 / s[rows, labels]
+        return grad / log(2)
@@ -0,0 +1,125 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from numpy import allclose, arange, array, log2, zeros
+
+from nisqai.cost._network_costs import (
+    CrossEntropy, Hinge, Misclassification, MulticlassCrossEntropy, class_probabilities, class_scores
+)
+from nisqai.measure._measurement_outcome import MeasurementOutcome
+
+
+class NetworkCostsTest(unittest.TestCase):
+    """Unit tests for cost functions of a batch of outcomes."""
+
+    @staticmethod
+    def get_outcomes():
+        """Returns exact outcomes of one bit with probabilities 0.9 and 0.25."""
+        return [MeasurementOutcome.from_probabilities([0.1, 0.9]),
+                MeasurementOutcome.from_probabilities([0.75, 0.25])]
+
+    def test_class_probabilities(self):
+        outcomes = self.get_outcomes()
+        self.assertEqual(list(class_probabilities(outcomes)), [0.9, 0.25])
+
+        # Arrays of probabilities give the same class probabilities
+        probs = array([out.probabilities() for out in outcomes])
+        self.assertEqual(list(class_probabilities(probs)), [0.9, 0.25])
+
+        # Sampled outcomes use the fraction of shots with the bit one
+        sampled = MeasurementOutcome(array([[1], [0], [1], [1]]))
+        self.assertEqual(list(class_probabilities([sampled])), [0.75])
+
+        # With more than one measured bit, no probability matches the prediction of split_predictor
+        with self.assertRaises(ValueError):
+            class_probabilities([MeasurementOutcome.from_probabilities([0.05, 0.05, 0.8, 0.1])])
+        with self.assertRaises(ValueError):
+            class_probabilities(array([[0.05, 0.05, 0.8, 0.1]]))
+
+    def test_misclassification(self):
+        def predictor(outcome):
+            return int(outcome.average()[0] > 0.5)
+
+        cost = Misclassification()
+        self.assertEqual(cost(self.get_outcomes(), array([1, 1]), predictor), 1.0)
+        with self.assertRaises(ValueError):
+            cost(self.get_outcomes(), array([1, 1]))
+
+    def test_cross_entropy(self):
+        cost = CrossEntropy()
+        expected = -log2(0.9) - log2(0.75)
+        self.assertAlmostEqual(cost(self.get_outcomes(), array([1, 0])), expected)
+
+        # Certain wrong predictions have a large but finite cost
+        outcome = MeasurementOutcome.from_probabilities([1.0, 0.0])
+        self.assertAlmostEqual(cost([outcome], array([1])), -log2(1e-12))
+
+    def test_hinge(self):
+        cost = Hinge()
+        # Scores are 0.8 and -0.5
+        self.assertAlmostEqual(cost(self.get_outcomes(), array([1, 0])), 0.2 + 0.5)
+        self.assertAlmostEqual(cost(self.get_outcomes(), array([0, 1])), 1.8 + 1.5)
+        self.assertAlmostEqual(Hinge(margin=0.5)(self.get_outcomes(), array([1, 0])), 0.0)
+
+    def test_gradients(self):
+        p, labels = array([0.9, 0.25, 0.6]), array([1, 0, 0])
+        step = 1e-6
+        for cost in (CrossEntropy(), Hinge()):
+            grad = cost.gradient(p, labels)
+            for ii in range(len(p)):
+                shift = step * (arange(len(p)) == ii)
+                outcomes = [MeasurementOutcome.from_probabilities([1 - q, q]) for q in p + shift]
+                plus = cost(outcomes, labels)
+                outcomes = [MeasurementOutcome.from_probabilities([1 - q, q]) for q in p - shift]
+                minus = cost(outcomes, labels)
+                self.assertAlmostEqual(grad[ii], (plus - minus) / (2 * step), places=5)
+
+        with self.assertRaises(NotImplementedError):
+            Misclassification().gradient(p, labels)
+
+    def test_class_scores(self):
+        outcomes = [MeasurementOutcome.from_probabilities([0.05, 0.05, 0.8, 0.1]),
+                    MeasurementOutcome.from_probabilities([0.5, 0.25, 0.25, 0.0])]
+        # One-vs-rest scores are the probabilities of each measured bit being one
+        self.assertTrue(allclose(class_scores(outcomes, 2), [[0.9, 0.15], [0.25, 0.25]]))
+
+        # Bit strings 00, 01, 10, 11 belong to classes 0, 1, 2, 0
+        self.assertTrue(allclose(class_scores(outcomes, 3, "bitstrings"), [[0.15, 0.05, 0.8], [0.5, 0.25, 0.25]]))
+
+        with self.assertRaises(ValueError):
+            class_scores(outcomes, 3)
+        with self.assertRaises(ValueError):
+            class_scores(outcomes, 5, "bitstrings")
+        with self.assertRaises(ValueError):
+            class_scores(outcomes, 2, "parity")
+
+    def test_multiclass_cross_entropy(self):
+        scores, labels = array([[0.15, 0.05, 0.8], [0.5, 0.25, 0.25]]), array([2, 1])
+        cost = MulticlassCrossEntropy()
+        self.assertAlmostEqual(cost(scores, labels), -log2(0.8) - log2(0.25))
+
+        # Unnormalized scores are normalized
+        self.assertAlmostEqual(cost(2 * scores, labels), cost(scores, labels))
+
+        step = 1e-6
+        grad = cost.gradient(scores, labels)
+        for index in ((0, 0), (0, 2), (1, 1)):
+            shift = zeros(scores.shape)
+            shift[index] = step
+            numerical = (cost(scores + shift, labels) - cost(scores - shift, labels)) / (2 * step)
+            self.assertAlmostEqual(grad[index], numerical, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
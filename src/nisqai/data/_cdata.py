@@ -19,6 +19,7 @@ import numpy as np
 from torchvision import datasets
 
 from nisqai.data.data_sets import iris
+from nisqai.utils._random import as_generator
 
 
 class CData:
@@ -38,6 +39,10 @@ class CData:
         self.raw_data = deepcopy(data)
         self.data = deepcopy(self.raw_data)
 
+        # Steps applied to the raw data by center, scale_features, reduce_features and
+        # pad_one, with the statistics they used. See CData.transform.
+        self.preprocessing = []
+
         # Descriptors for the data set
         self._centered = False
         self._centered = self.is_centered()
@@ -50,6 +55,20 @@ class CData:
         """
         return self.data.shape[1]
 
+    @property
+    def num_raw_features(self):
+        """Returns the number of features of the feature vectors CData.transform takes.
+
+        Return type: int
+        """
+        num_features = self.num_features
+        for step in reversed(self.preprocessing):
+            if step[0] == "project":
+                num_features = step[1].shape[0]
+            elif step[0] == "pad":
+                num_features -= step[1]
+        return num_features
+
     @property
     def num_samples(self):
         """Returns the number of samples (feature vectors) in the data set.
@@ -65,9 +84,36 @@ class CData:
     def center(self):
         """Modifies data by subtracting the mean."""
         if not self._centered:
-            self.data = self.data - np.mean(self.data, axis=0)
+            mean = np.mean(self.data, axis=0)
+            self._affine(mean, np.ones_like(mean))
             self._centered = True
 
+    def _affine(self, shift, scale):
+        """Modifies data by x' = (x - shift) / scale and records the step."""
+        self.data = (self.data - shift) / scale
+        self.preprocessing.append(("affine", np.asarray(shift), np.asarray(scale)))
+
+    def transform(self, feature_vectors):
+        """Returns new feature vectors preprocessed with the same steps and statistics as the data.
+
+        For example, if the data was scaled by 'min-max norm', the minimum and maximum of each
+        feature in the data are used, not those of the new feature vectors.
+
+        Args:
+            feature_vectors : array-like
+                Feature vectors with the same number of features as the raw data,
+                of shape (samples, features).
+        """
+        data = np.array(feature_vectors, dtype=float, ndmin=2)
+        for step in self.preprocessing:
+            if step[0] == "affine":
+                data = (data - step[1]) / step[2]
+            elif step[0] == "project":
+                data = data.dot(step[1])
+            elif step[0] == "pad":
+                data = np.append(data, np.zeros((data.shape[0], step[1])), axis=1)
+        return data
+
     def is_centered(self, tolerance=1e-3):
         """Returns True if the data set is centered, else False."""
         # If we know the data is already centered, return True
@@ -120,35 +166,36 @@ class CData:
         if method == 'min-max norm':
             mmin = self.data.min(axis=0)
             mmax = self.data.max(axis=0)
-            self.data = (self.data - mmin) / (mmax - mmin)
+            self._affine(mmin, mmax - mmin)
 
         # Mean norm
         elif method == 'mean norm':
             mean = self.data.mean(axis=0)
             mmin = self.data.min(axis=0)
             mmax = self.data.max(axis=0)
-            self.data = (self.data - mean) / (mmax - mmin)
+            self._affine(mean, mmax - mmin)
 
         # Standardize
         elif method == 'standardize':
             mean = self.data.mean(axis=0)
             # ddof = 1 gives sample sd
             sd = self.data.std(axis=0, ddof=1)
-            self.data = (self.data - mean) / sd
+            self._affine(mean, sd)
 
         # L2 norm
         elif method == 'L2 norm' or method == "l2 norm":
             norm = np.linalg.norm(self.data, ord=2, axis=0)
-            self.data = self.data / norm
+            self._affine(np.zeros_like(norm), norm)
 
         # L1 norm
         elif method == 'L1 norm' or method == "l1 norm":
             L1norm = sum(abs(self.data))
-            self.data = self.data / L1norm
+            self._affine(np.zeros_like(L1norm), L1norm)
 
         # Infinity norm
         elif method in ("inf norm", "infty norm", "infinity norm", "inf", "infty", "infinity"):
-            self.data /= np.max(self.data, axis=0)
+            mmax = np.max(self.data, axis=0)
+            self._affine(np.zeros_like(mmax), mmax)
 
         else:
             raise ValueError("Unsupported scaling method. See help(scale_features) for supported methods.")
@@ -177,13 +224,13 @@ class CData:
         # Get eigenvectors of covariance matrix
         _, evecs = np.linalg.eig(covariance)
 
-        # Project data with first column as first principle component
-        projected = evecs.T.dot(self.data.T).T
-
         # Only keep the input fraction of features
         nfeatures = ceil(fraction * self.num_features)
 
-        self.data = projected.T[:nfeatures].T
+        # Project data with first column as first principle component
+        projection = evecs[:, :nfeatures]
+        self.data = self.data.dot(projection)
+        self.preprocessing.append(("project", projection))
 
     def pad_one(self):
         """Appends a zero element to each data point, increasing the dimension by one.
@@ -209,6 +256,7 @@ class CData:
         zeros = np.array([[0]] * self.data.shape[0], dtype=self.data.dtype)
 
         self.data = np.append(self.data, zeros, axis=1)
+        self.preprocessing.append(("pad", 1))
 
     def pad_to_power2(self):
         """Appends zero elements to each data point until the dimension the next highest power of two.
@@ -236,9 +284,10 @@ class CData:
     def reset(self):
         """Resets self.data to original input value. Warning: This cannot be undone!
 
-        Modifies: self.data
+        Modifies: self.data, self.preprocessing
         """
         self.data = deepcopy(self.raw_data)
+        self.preprocessing = []
 
     def __getitem__(self, item):
         """Returns the feature vector indexed by item.
@@ -328,13 +377,14 @@ class LabeledCData(CData):
 
 
 def random_data(num_features, num_samples, labels, seed=None):
-    """Returns a CData object with random data."""
-    # Seed the random number generator if one is provided
-    if seed:
-        np.random.seed(seed)
+    """Returns a CData object with random data.
 
+    Args:
+        seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+            Seed for the random number generator. See nisqai.utils.as_generator.
+    """
     # Get some random data
-    data = np.random.rand(num_samples, num_features)
+    data = as_generator(seed).random((num_samples, num_features))
 
     # If labels, return a labeled data object
     if labels:
@@ -351,13 +401,12 @@ def random_data_vertical_boundary(num_samples, seed=None):
     Args:
         num_samples : int
             Number of data points to return.
-    """
-    # Seed the random number generator if one is provided
-    if seed:
-        np.random.seed(seed)
 
+        seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+            Seed for the random number generator. See nisqai.utils.as_generator.
+    """
     # Get some random data
-    data = np.random.rand(num_samples, 2)
+    data = as_generator(seed).random((num_samples, 2))
 
     # Do the labeling
     labels = []
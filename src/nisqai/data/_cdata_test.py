@@ -11,7 +11,7 @@
 #   limitations under the License.
 
 # Imports
-from numpy import array, array_equal, allclose, zeros
+from numpy import array, array_equal, allclose, random, zeros
 
 from nisqai.data._cdata import CData, LabeledCData, random_data, get_iris_setosa_data, get_mnist_data
 
@@ -60,6 +60,18 @@ class DataTest(unittest.TestCase):
         self.assertEqual(cdata.num_features, 2)
         self.assertEqual(cdata.num_samples, 4)
 
+    def test_random_data_seed(self):
+        """Tests that random data is reproducible from a seed without using the global random state."""
+        state = random.get_state()
+        cdata = random_data(num_features=2, num_samples=4, labels=None, seed=3)
+        self.assertTrue(array_equal(cdata.data, random_data(2, 4, None, seed=3).data))
+        self.assertTrue(array_equal(random.get_state()[1], state[1]))
+
+        # A generator is advanced, so consecutive calls give different data
+        rng = random.default_rng(3)
+        self.assertTrue(array_equal(cdata.data, random_data(2, 4, None, seed=rng).data))
+        self.assertFalse(array_equal(cdata.data, random_data(2, 4, None, seed=rng).data))
+
     def test_scale_features_min_max_norm(self):
         """Tests min-max norm method of scale_features."""
         data = array([[0.564, 20.661], [-18.512, 41.168], [-0.009, 20.440]])
@@ -329,6 +341,29 @@ class DataTest(unittest.TestCase):
         self.assertEqual(lcdata.num_features, 64)
         self.assertTrue(allclose(lcdata.labels, [0, 1]))
 
+    def test_transform(self):
+        """Tests new feature vectors are preprocessed with the statistics of the data."""
+        data = array([[0.564, 20.661, 1], [-18.512, 41.168, -1],
+                      [-0.009, 20.440, 7], [3.2, 11.0, 2]])
+        cdata = CData(data)
+        cdata.scale_features("standardize")
+        cdata.scale_features("min-max norm")
+        cdata.reduce_features(0.6)
+        cdata.pad_one()
+
+        # The data itself goes through the same steps
+        self.assertTrue(allclose(cdata.transform(data), cdata.data))
+
+        # A single new feature vector gives a single row
+        new = cdata.transform([1.0, 2.0, 3.0])
+        self.assertEqual(new.shape, (1, 3))
+        self.assertEqual(new[0, 2], 0)
+        self.assertEqual(cdata.num_raw_features, 3)
+
+        # Resetting the data forgets the steps
+        cdata.reset()
+        self.assertTrue(allclose(cdata.transform(data), data))
+
     # TODO: The previous input to LabeledCData was not of the correct type.
     #  Hence, the subsequent checks do not make sense when comparing arrays.
     # def test_data_splitting(self):
@@ -12,13 +12,15 @@
 
 from nisqai.layer._base_ansatz import BaseAnsatz
 from nisqai.data._cdata import CData, LabeledCData
+from nisqai.encode._base_encoding import BaseEncoding
 
 from pyquil import Program
+from pyquil.gates import RY
 
 from numpy import array, cos, sin, isclose, dot, identity
 
 
-class AngleEncoding():
+class AngleEncoding(BaseEncoding):
     """AngleEncoding class."""
 
     def __init__(self, data, encoder, feature_map):
@@ -32,6 +34,7 @@ class AngleEncoding():
 
         # determine number of qubits
         num_qubits = self._compute_num_qubits()
+        super().__init__(num_qubits, data)
 
         self.circuits = [BaseAnsatz(num_qubits) for _ in range(self.data.num_samples)]
 
@@ -97,6 +100,22 @@ class AngleEncoding():
         # write the program into the circuit of the ansatz
         self.circuits[feature_vector_index].circuit = prog
 
+    def _parameter_values(self, feature_vector):
+        """Returns the parameters of the parametric encoding circuit for the feature vector.
+
+        The state cos(theta) |0> + sin(theta) |1> is prepared by RY(2 theta) |0>,
+        so each qubit has the single parameter [2 theta].
+        """
+        values = {}
+        for (qubit_index, features) in self.feature_map.map.items():
+            values[qubit_index] = [2 * self.encoder([feature_vector[x] for x in features])]
+        return values
+
+    def _write_parametric_circuit(self, program, memory_references):
+        """Writes the parametric encoding gates into the program."""
+        for (qubit_index, refs) in memory_references.items():
+            program.inst(RY(refs[0], qubit_index))
+
 
 def angle_to_matrix(theta):
     """Converts a an angle into a state preparation matrix
@@ -10,7 +10,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from numpy import array
+from numpy import array, pi
 
 from nisqai.data._cdata import CData
 from nisqai.encode._angle_encoding import AngleEncoding
@@ -34,7 +34,15 @@ def test_num_circuts():
     assert len(angle_encoding.circuits) == 4
 
 
+def test_parametric_memory_map():
+    """Tests the memory map of the parametric circuit for a data point."""
+    data = array([[0.25], [0.5]])
+    angle_encoding = AngleEncoding(CData(data), angle, direct(1))
+    assert angle_encoding.memory_map(1) == {"enc_q_000_g_000": [2 * pi]}
+
+
 if __name__ == "__main__":
     test_simple()
     test_num_circuts()
+    test_parametric_memory_map()
     print("All tests for AngleEncoding passed.")
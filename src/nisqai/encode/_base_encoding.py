@@ -10,13 +10,91 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from pyquil import Program
+from numpy import zeros
 
 from nisqai.layer._base_ansatz import BaseAnsatz
+from nisqai.layer._params import Parameters
+
+# Prefix for the names of memory references declared by parametric encodings.
+# This keeps them distinct from the memory references of the ansatz parameters.
+ENCODING_PREFIX = "enc_"
+
 
 class BaseEncoding():
-    """Base encoding class inherited by all other encoding classes."""
+    """Base encoding class inherited by all other encoding classes.
+
+    Derived classes that support parametric compilation implement
+
+        (1) _parameter_values(feature_vector)
+            Returns a dictionary of {qubit: list of gate parameters} encoding the feature vector.
+
+        (2) _write_parametric_circuit(program, memory_references)
+            Writes the encoding gates into the program using the declared memory references.
+
+    A parametric encoding is a single circuit whose gate parameters are declared memory
+    regions. Every data point is then encoded by a memory map instead of a new circuit,
+    so the circuit only has to be compiled once.
+    """
 
     def __init__(self, num_qubits, data):
         self.num_qubits = num_qubits
-        self.data = data
\ No newline at end of file
+        self.data = data
+
+    def _parameter_values(self, feature_vector):
+        """Returns a dictionary of {qubit: list of gate parameters} encoding the feature vector."""
+        raise NotImplementedError(
+            "{} does not support parametric encoding.".format(type(self).__name__)
+        )
+
+    def _write_parametric_circuit(self, program, memory_references):
+        """Writes the parametric encoding gates into the program."""
+        raise NotImplementedError(
+            "{} does not support parametric encoding.".format(type(self).__name__)
+        )
+
+    def _parameters(self):
+        """Returns Parameters with the names used in the parametric circuit."""
+        # The names only depend on the structure of the encoding, so any feature vector works
+        values = self._parameter_values(zeros(self.data.num_features))
+        return Parameters(values, prefix=ENCODING_PREFIX)
+
+    def parametric_circuit(self):
+        """Returns a BaseAnsatz which can encode any feature vector in the data.
+
+        The gate parameters are declared as REAL memory regions. Use
+        BaseEncoding.memory_map to get their values for a particular data point.
+        """
+        ansatz = BaseAnsatz(self.num_qubits)
+
+        # Declare the memory references and write the gates using them
+        params = self._parameters()
+        params.declare_memory_references(ansatz.circuit)
+        self._write_parametric_circuit(ansatz.circuit, params.memory_references)
+
+        return ansatz
+
+    def memory_map(self, feature_vector_index):
+        """Returns the memory map encoding the data point indexed by feature_vector_index
+        in the parametric circuit.
+
+        Args:
+            feature_vector_index : int
+                Index of the data point to encode.
+        """
+        return self.feature_memory_map(self.data.data[feature_vector_index])
+
+    def feature_memory_map(self, feature_vector):
+        """Returns the memory map encoding a feature vector in the parametric circuit.
+
+        The feature vector does not have to be in the data, e.g. for predicting new data points.
+
+        Args:
+            feature_vector : numpy.ndarray
+                Feature vector with the same number of features as the data.
+        """
+        if len(feature_vector) != self.data.num_features:
+            raise ValueError(
+                "Expected {} features, got {}.".format(self.data.num_features, len(feature_vector))
+            )
+        values = self._parameter_values(feature_vector)
+        return Parameters(values, prefix=ENCODING_PREFIX).memory_map()
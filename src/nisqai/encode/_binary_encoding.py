@@ -10,13 +10,16 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from pyquil.gates import X
+from math import pi
+
+from pyquil.gates import X, RX
 
 from nisqai.data._cdata import CData, LabeledCData
+from nisqai.encode._base_encoding import BaseEncoding
 from nisqai.layer._base_ansatz import BaseAnsatz
 
 
-class BinaryEncoding:
+class BinaryEncoding(BaseEncoding):
     """BinaryEncoding class. Writes classical binary data into a quantum state
     via a depth one circuit.
 
@@ -35,6 +38,7 @@ class BinaryEncoding:
         # TODO: make sure the data consists of ints only
         # compute the number of qubits needed from the data
         num_qubits = self.data.num_features
+        super().__init__(num_qubits, data)
 
         # store the circuits
         self.circuits = [BaseAnsatz(num_qubits) for _ in range(self.data.num_samples)]
@@ -55,6 +59,19 @@ class BinaryEncoding:
         # write the circuit
         self.circuits[feature_vector_index].add_at(X, inds)
 
+    def _parameter_values(self, feature_vector):
+        """Returns the parameters of the parametric encoding circuit for the feature vector.
+
+        X^z is equal to RX(pi z) up to a global phase, so each qubit has the
+        single parameter [pi z].
+        """
+        return dict((q, [pi * feature_vector[q]]) for q in range(self.num_qubits))
+
+    def _write_parametric_circuit(self, program, memory_references):
+        """Writes the parametric encoding gates into the program."""
+        for (qubit_index, refs) in memory_references.items():
+            program.inst(RX(refs[0], qubit_index))
+
     # TODO: all encoding classes will need this method.
     # TODO: make a BaseEncoding that implements this
     def __getitem__(self, ind):
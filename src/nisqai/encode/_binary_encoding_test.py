@@ -12,7 +12,7 @@
 
 from nisqai.encode._binary_encoding import BinaryEncoding
 from nisqai.data import CData
-from numpy import array
+from numpy import array, pi
 
 
 def test_construct():
@@ -37,7 +37,27 @@ def test_circuits():
     print(encoding.circuits[2])
 
 
+def test_parametric_circuit():
+    """Tests the parametric circuit and memory maps of a BinaryEncoding."""
+    data = array([[1, 0],
+                  [0, 1]], dtype=int)
+    encoding = BinaryEncoding(CData(data))
+    circuit = encoding.parametric_circuit()
+
+    # check the memory references are declared
+    assert "DECLARE enc_q_000_g_000 REAL[1]" in circuit.circuit.out()
+    assert "RX(enc_q_001_g_000) 1" in circuit.circuit.out()
+
+    # check the memory map encodes the data point
+    assert encoding.memory_map(0) == {"enc_q_000_g_000": [pi], "enc_q_001_g_000": [0.0]}
+    assert encoding.memory_map(1) == {"enc_q_000_g_000": [0.0], "enc_q_001_g_000": [pi]}
+
+    # feature vectors which are not in the data are encoded the same way
+    assert encoding.feature_memory_map(array([1, 1])) == {"enc_q_000_g_000": [pi], "enc_q_001_g_000": [pi]}
+
+
 if __name__ == "__main__":
     test_construct()
     test_circuits()
+    test_parametric_circuit()
     print("All tests for BinaryEncoding passed.")
@@ -12,12 +12,14 @@
 
 from nisqai.layer._base_ansatz import BaseAnsatz
 from nisqai.data._cdata import CData, LabeledCData
+from nisqai.encode._base_encoding import BaseEncoding
 
 from numpy import array, cos, sin, exp, dot, identity, isclose
 from pyquil import Program
+from pyquil.gates import RY, RZ
 
 
-class DenseAngleEncoding:
+class DenseAngleEncoding(BaseEncoding):
     """DenseAngleEncoding class. Encode features into the angles of qubits via
 
     |\psi> = cos(\theta/2) |0> + e^{i \phi} sin(\theta / 2) |1>.
@@ -49,6 +51,7 @@ class DenseAngleEncoding:
 
         # determine the number of qubits from the input data
         num_qubits = self._compute_num_qubits()
+        super().__init__(num_qubits, data)
         self.encoder = encoder
         self.feature_map = feature_map
 
@@ -120,6 +123,24 @@ class DenseAngleEncoding:
         # write the program into the circuit of the ansatz
         self.circuits[feature_vector_index].circuit = prog
 
+    def _parameter_values(self, feature_vector):
+        """Returns the parameters of the parametric encoding circuit for the feature vector.
+
+        The state cos(theta / 2) |0> + e^{i phi} sin(theta / 2) |1> is prepared
+        (up to a global phase) by RZ(phi) RY(theta) |0>, so each qubit has the
+        two parameters [theta, phi].
+        """
+        values = {}
+        for (qubit_index, features) in self.feature_map.map.items():
+            angles = self.encoder([feature_vector[x] for x in features])
+            values[qubit_index] = [angles[0], angles[1]]
+        return values
+
+    def _write_parametric_circuit(self, program, memory_references):
+        """Writes the parametric encoding gates into the program."""
+        for (qubit_index, refs) in memory_references.items():
+            program.inst(RY(refs[0], qubit_index), RZ(refs[1], qubit_index))
+
     def __getitem__(self, ind):
         """Returns the circuit for the data point indexed by ind."""
         assert isinstance(ind, int)
@@ -11,11 +11,11 @@
 #   limitations under the License.
 
 from nisqai.data._cdata import CData
-from nisqai.encode._dense_angle_encoding import DenseAngleEncoding
+from nisqai.encode._dense_angle_encoding import DenseAngleEncoding, angles_to_matrix
 from nisqai.encode._encoders import angle_simple_linear
 from nisqai.encode._feature_maps import nearest_neighbor
 
-from numpy import array
+from numpy import array, cos, sin, exp, dot, vdot, pi
 
 
 def test_simple():
@@ -44,7 +44,34 @@ def test_index():
     # assert encoder[0] == correct
 
 
+def test_parametric_memory_map():
+    """Tests the memory map of the parametric circuit for a data point."""
+    data = array([[0.5, 0.25]])
+    encoder = DenseAngleEncoding(CData(data), encoder=angle_simple_linear, feature_map=nearest_neighbor(2, 1))
+
+    assert encoder.memory_map(0) == {"enc_q_000_g_000": [pi / 2], "enc_q_000_g_001": [pi]}
+    assert "RY(enc_q_000_g_000) 0\nRZ(enc_q_000_g_001) 0" in encoder.parametric_circuit().circuit.out()
+
+
+def test_parametric_state():
+    """Tests that the parametric gates prepare the same state as the defined gate, up to a global phase."""
+    angles = (0.3, 1.1)
+    theta, phi = angles
+
+    # RZ(phi) RY(theta) |0>
+    ry = array([[cos(theta / 2), -sin(theta / 2)], [sin(theta / 2), cos(theta / 2)]])
+    rz = array([[exp(-1j * phi / 2), 0], [0, exp(1j * phi / 2)]])
+    parametric_state = dot(rz, dot(ry, array([1, 0])))
+
+    # State prepared by the defined gate
+    state = dot(angles_to_matrix(angles), array([1, 0]))
+
+    assert abs(abs(vdot(parametric_state, state)) - 1.0) < 1e-10
+
+
 if __name__ == "__main__":
     test_simple()
     test_index()
+    test_parametric_memory_map()
+    test_parametric_state()
     print("All tests for DenseAngleEncoding passed.")
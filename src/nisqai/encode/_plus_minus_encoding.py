@@ -10,13 +10,16 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from pyquil.gates import H, Z
+from math import pi
+
+from pyquil.gates import H, Z, RZ
 
 from nisqai.data._cdata import CData, LabeledCData
+from nisqai.encode._base_encoding import BaseEncoding
 from nisqai.layer._base_ansatz import BaseAnsatz
 
 
-class PlusMinusEncoding:
+class PlusMinusEncoding(BaseEncoding):
     """Plus-Minus Encoding class. Encodes binary features
 
      [x_1 x_2 ... x_N]^T
@@ -45,6 +48,7 @@ class PlusMinusEncoding:
         # TODO: make sure the data consists of ints only
         # compute the number of qubits needed from the data
         num_qubits = self.data.num_features
+        super().__init__(num_qubits, data)
 
         # store the circuits
         self.circuits = [BaseAnsatz(num_qubits) for _ in range(self.data.num_samples)]
@@ -66,8 +70,18 @@ class PlusMinusEncoding:
         self.circuits[feature_vector_index].add_layer(H)
         self.circuits[feature_vector_index].add_at(Z, inds)
 
-        # TODO: all encoding classes will need this method.
-        # TODO: make a BaseEncoding that implements this
+    def _parameter_values(self, feature_vector):
+        """Returns the parameters of the parametric encoding circuit for the feature vector.
+
+        Z^x is equal to RZ(pi x) up to a global phase, so each qubit has the
+        single parameter [pi x].
+        """
+        return dict((q, [pi * feature_vector[q]]) for q in range(self.num_qubits))
+
+    def _write_parametric_circuit(self, program, memory_references):
+        """Writes the parametric encoding gates into the program."""
+        for (qubit_index, refs) in memory_references.items():
+            program.inst(H(qubit_index), RZ(refs[0], qubit_index))
 
     def __getitem__(self, ind):
         """Returns the circuit for the data point indexed by ind."""
@@ -76,9 +90,6 @@ class PlusMinusEncoding:
 
         return self.circuits[ind]
 
-        # TODO: all encoding classes will need this method.
-        # TODO: make a BaseEncoding that implements this
-
     def __len__(self):
         """Returns the number of data points in the Encoder."""
         return self.data.num_samples
@@ -10,7 +10,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from numpy import array
+from numpy import array, pi
 
 from nisqai.encode._plus_minus_encoding import PlusMinusEncoding
 from nisqai.data._cdata import CData
@@ -76,6 +76,15 @@ def test_correct_edge2():
     assert encoder[0].__str__() == correct
 
 
+def test_parametric_circuit():
+    """Tests the parametric circuit and memory map of a PlusMinusEncoding."""
+    data = array([[1, 0]], dtype=int)
+    encoder = PlusMinusEncoding(CData(data))
+
+    assert "H 0\nRZ(enc_q_000_g_000) 0\nH 1\nRZ(enc_q_001_g_000) 1" in encoder.parametric_circuit().circuit.out()
+    assert encoder.memory_map(0) == {"enc_q_000_g_000": [pi], "enc_q_001_g_000": [0.0]}
+
+
 if __name__ == "__main__":
     test_basic()
     test_correct()
@@ -10,9 +10,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from nisqai.layer._base_ansatz import BaseAnsatz, REAL_MEM_TYPE
+from nisqai.layer._base_ansatz import BaseAnsatz
+from nisqai.layer._params import product_ansatz_parameters
 from pyquil import gates
-from numpy import empty
 
 
 class AlternatingAnsatz(BaseAnsatz):
@@ -31,12 +31,8 @@ class AlternatingAnsatz(BaseAnsatz):
 
     def _make_params(self):
         """Adds a class attribute with all parameters needed for the ansatz."""
-        self.params = empty((self.num_qubits, self.depth), dtype=list)
-        for q in range(self.num_qubits):
-            for g in range(self.depth):
-                # make a parameter
-                self.params[q, g] = self.circuit.declare(
-                    (q, g), memory_type=REAL_MEM_TYPE)
+        self.params = product_ansatz_parameters(self.num_qubits, self.depth, 0.0)
+        self.params.declare_memory_references(self.circuit)
 
     def write_circuit(self):
         """Adds instructions to the circuit."""
@@ -83,5 +79,5 @@ class AlternatingAnsatz(BaseAnsatz):
         """
         for (g, gate) in enumerate(self.structure):
             self.circuit.inst(
-                gate(self.params[qubit, g + (self.depth // 2) * num], qubit)
+                gate(self.params.memory_references[qubit][g + (self.depth // 2) * num], qubit)
                 )
\ No newline at end of file
@@ -30,12 +30,12 @@ def test_match_expected_program():
 
     # make a program with the correct output
     p = Program()
-    p00 = p.declare((0, 0), memory_type="REAL")
-    p01 = p.declare((0, 1), memory_type="REAL")
-    p10 = p.declare((1, 0), memory_type="REAL")
-    p11 = p.declare((1, 1), memory_type="REAL")
-    p20 = p.declare((2, 0), memory_type="REAL")
-    p21 = p.declare((2, 1), memory_type="REAL")
+    p00 = p.declare("q_000_g_000", memory_type="REAL")
+    p01 = p.declare("q_000_g_001", memory_type="REAL")
+    p10 = p.declare("q_001_g_000", memory_type="REAL")
+    p11 = p.declare("q_001_g_001", memory_type="REAL")
+    p20 = p.declare("q_002_g_000", memory_type="REAL")
+    p21 = p.declare("q_002_g_001", memory_type="REAL")
     p.inst(
         gates.RX(p00, 0),
         gates.RX(p10, 1),
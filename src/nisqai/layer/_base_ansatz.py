@@ -17,6 +17,8 @@ from pyquil.quil import percolate_declares
 from pyquil.quilbase import Gate
 from pyquil.api import QuantumComputer
 
+from nisqai.simulate._base_simulator import BaseSimulator
+
 REAL_MEM_TYPE = "REAL"
 BIT_MEM_TYPE = "BIT"
 
@@ -38,9 +40,10 @@ class BaseAnsatz:
         """Returns a compiled circuit for a given quantum computer.
 
         Args:
-            computer : Union[str, QuantumComputer]
-                Quantum computer to compile to, specified by a string or
-                a pyquil.api._quantum_computer.QuantumComputer object.
+            computer : Union[str, QuantumComputer, BaseSimulator]
+                Quantum computer to compile to, specified by a string,
+                a pyquil.api._quantum_computer.QuantumComputer object, or
+                a NISQAI simulator.
 
             shots : int
                 Number of times to run the circuit.
@@ -55,7 +58,7 @@ class BaseAnsatz:
             computer = get_qc(computer)
         else:
             try:
-                assert type(computer) == QuantumComputer
+                assert type(computer) == QuantumComputer or isinstance(computer, BaseSimulator)
             except AssertionError:
                 raise TypeError
 
@@ -127,7 +130,7 @@ class BaseAnsatz:
         """Orders Quil instructions into a nominal form."""
         # TODO: define nominal form and add more ordering conditions
         # TODO: right now, this just means all DECLARE statements are at the top
-        percolate_declares(self.circuit)
+        self.circuit = percolate_declares(self.circuit)
 
     def __str__(self):
         """Returns a circuit diagram."""
@@ -52,7 +52,7 @@ class Parameters:
             parameteric compilation.
     """
 
-    def __init__(self, parameters):
+    def __init__(self, parameters, prefix=""):
         """Initializes a Parameters class.
 
         Args:
@@ -103,6 +103,11 @@ class Parameters:
                     for its first and second parameterized gates, respectively. Qubit 1
                     has no parameterized gates. Qubit 2 has parameter 3 for its first
                     parameterized gate.
+
+            prefix : str
+                String prepended to every parameter name. Use this to keep the memory
+                references of different circuits (e.g., an encoding and an ansatz)
+                distinct when the circuits are joined into a single program.
         """
         # Store the parameter dictionary
         # TODO: write a method to make sure the parameter dictionary is valid
@@ -111,6 +116,9 @@ class Parameters:
         # Extract the number of qubits
         self._num_qubits = len(self._values.keys())
 
+        # Store the prefix for parameter names
+        self.prefix = prefix
+
         # Make the dictionary of parameter names
         self.names = self._make_parameter_names()
 
@@ -132,6 +140,9 @@ class Parameters:
         Examples:
             q_000_g_005 = Fifth parameterized gate on qubit zero.
             q_999_g_024 = Twenty fourth (!) parameterized gate on qubit 999. (!!!)
+
+        If a prefix is given, it is prepended to each name. For example, with
+        prefix = "enc_" the first name above is enc_q_000_g_005.
         """
         names = {}
         for qubit in self._values.keys():
@@ -140,7 +151,7 @@ class Parameters:
             for gate in range(len(self._values[qubit])):
                 gate_key = format(gate, FORMAT_SPEC)
                 names[qubit].append(
-                    "q_{}_g_{}".format(qubit_key, gate_key)
+                    "{}q_{}_g_{}".format(self.prefix, qubit_key, gate_key)
                 )
         return names
 
@@ -172,14 +183,16 @@ class Parameters:
 
         {parameter name: parameter value}
 
-        pairs.
+        pairs. Parameters with value None are not used in the circuit
+        and are given the value zero.
         """
         # TODO: speedup implementation of this method: crucial for fast implementations
         # TODO: make more Pythonic
         mem_map = {}
         for qubit in range(len(self._values)):
             for gate in range(len(self._values[qubit])):
-                mem_map[self.names[qubit][gate]] = [float(self._values[qubit][gate])]
+                value = self._values[qubit][gate]
+                mem_map[self.names[qubit][gate]] = [0.0 if value is None else float(value)]
         return mem_map
 
     def update_values(self, values):
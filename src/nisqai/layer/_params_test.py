@@ -323,6 +323,19 @@ class ParametersTest(unittest.TestCase):
         # Ensure the new memory map is correct
         self.assertEqual(params.memory_map(), {"q_000_g_000": [1.0]})
 
+    def test_names_prefix(self):
+        """Tests that the prefix is prepended to all parameter names."""
+        # Create Parameters with a prefix
+        params = Parameters({0: [1, 2], 1: [3]}, prefix="enc_")
+
+        # Define the correct names
+        correct_names = {0: ["enc_q_000_g_000", "enc_q_000_g_001"],
+                         1: ["enc_q_001_g_000"]}
+
+        # Test if the names and memory map are correct
+        self.assertEqual(params.names, correct_names)
+        self.assertEqual(params.memory_map()["enc_q_001_g_000"], [3.0])
+
 
 if __name__ == "__main__":
     unittest.main()
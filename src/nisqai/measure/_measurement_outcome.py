@@ -23,9 +23,13 @@ the circuit is run.
 
 A MeasurementOutcome inputs this data and makes it easy to work with,
 interpret, visualize, modify, and prepare for future encoding.
+
+Simulators can also give the exact probabilities of all bit strings
+(the limit of infinitely many shots). MeasurementOutcome.from_probabilities
+stores these instead of sampled bit strings.
 """
 
-from numpy import ndarray, zeros
+from numpy import arange, asarray, bincount, dot, ndarray
 
 
 class MeasurementOutcome:
@@ -73,6 +77,38 @@ class MeasurementOutcome:
         # get the number of shots
         self._shots = self._raw_outcome.shape[0]
 
+        # exact probabilities, only set for outcomes made by from_probabilities
+        self._probabilities = None
+
+    @classmethod
+    def from_probabilities(cls, probabilities):
+        """Returns a MeasurementOutcome holding the exact probabilities of all bit strings.
+
+        Such an outcome has no sampled bit strings and its number of shots is None.
+        Averages are computed exactly from the probabilities.
+
+        Args:
+            probabilities : array-like
+                Probabilities of all 2^n bit strings, where the index of a bit string
+                is its integer value with the first bit the most significant.
+        """
+        probabilities = asarray(probabilities, dtype=float)
+        num_qubits = len(probabilities).bit_length() - 1
+        if len(probabilities) != 2 ** num_qubits:
+            raise ValueError("The number of probabilities must be a power of two.")
+
+        outcome = cls.__new__(cls)
+        outcome._raw_outcome = None
+        outcome._num_qubits = num_qubits
+        outcome._shots = None
+        outcome._probabilities = probabilities
+        return outcome
+
+    @property
+    def is_exact(self):
+        """Returns True if the outcome holds exact probabilities instead of sampled bit strings."""
+        return self._probabilities is not None
+
     @property
     def raw_outcome(self):
         """Returns the initial, raw outcome used to instantiate the class."""
@@ -87,9 +123,28 @@ class MeasurementOutcome:
     def shots(self):
         """Returns the number of shots -- i.e., the number of times
         the circuit was simulated to obtain measurement results.
+
+        None for exact outcomes.
         """
         return self._shots
 
+    def probabilities(self):
+        """Returns the probability of each bit string, indexed by its integer value.
+
+        For sampled outcomes these are the observed frequencies.
+        """
+        if self.is_exact:
+            return self._probabilities
+
+        weights = 2 ** arange(self.num_qubits - 1, -1, -1)
+        integers = self._raw_outcome.dot(weights).astype(int)
+        return bincount(integers, minlength=2 ** self.num_qubits) / self._shots
+
+    def _bits(self):
+        """Returns an array of all bit strings, indexed by their integer value."""
+        shifts = arange(self.num_qubits - 1, -1, -1)
+        return (arange(2 ** self.num_qubits)[:, None] >> shifts) & 1
+
     def as_int(self, index):
         """Returns the integer value of a bit string.
 
@@ -154,14 +209,12 @@ class MeasurementOutcome:
 
     def average(self):
         """Returns an average over all bit strings (taken as vectors)."""
-        # Initialize a vector to store the average
-        avg = zeros(self.num_qubits)
+        # Average each bit over the exact probabilities
+        if self.is_exact:
+            return dot(self._probabilities, self._bits())
 
-        # Loop over all raw measurement outcomes
-        for vec in self._raw_outcome:
-            avg += vec
-
-        return avg / self._shots
+        # Average each bit over all sampled bit strings
+        return self._raw_outcome.mean(axis=0, dtype=float)
 
     # TODO: implement
     def average_outcome(self):
@@ -170,6 +223,9 @@ class MeasurementOutcome:
 
     def __getitem__(self, index):
         """Returns the sampled outcome for the given index."""
+        if self.is_exact:
+            raise ValueError("Exact outcomes do not have sampled bit strings.")
+
         # input checking
         if type(index) != int:
             try:
@@ -186,4 +242,6 @@ class MeasurementOutcome:
 
     def __len__(self):
         """Returns the number of shots/samples in a measurement outcome."""
+        if self.is_exact:
+            raise TypeError("Exact outcomes do not have a number of shots.")
         return self.shots
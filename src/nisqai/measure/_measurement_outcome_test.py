@@ -197,6 +197,34 @@ class TestMeasuremnetOutcome(unittest.TestCase):
         self.assertAlmostEqual(avg[0], 0.5)
         self.assertAlmostEqual(avg[1], 0.5)
 
+    def test_from_probabilities(self):
+        """Tests an outcome holding exact probabilities."""
+        # Probabilities of 00, 01, 10, 11
+        outcome = MeasurementOutcome.from_probabilities([0.1, 0.2, 0.3, 0.4])
+
+        self.assertTrue(outcome.is_exact)
+        self.assertIsNone(outcome.shots)
+        self.assertEqual(outcome.num_qubits, 2)
+
+        # The first bit is one for 10 and 11, the second bit for 01 and 11
+        avg = outcome.average()
+        self.assertAlmostEqual(avg[0], 0.7)
+        self.assertAlmostEqual(avg[1], 0.6)
+
+        # There are no sampled bit strings
+        with self.assertRaises(ValueError):
+            outcome[0]
+
+        # The number of probabilities must be a power of two
+        with self.assertRaises(ValueError):
+            MeasurementOutcome.from_probabilities([0.5, 0.25, 0.25])
+
+    def test_probabilities(self):
+        """Tests the observed frequencies of sampled bit strings."""
+        outcome = MeasurementOutcome(array([[0, 1], [1, 1], [0, 1], [0, 0]]))
+        self.assertFalse(outcome.is_exact)
+        self.assertEqual(list(outcome.probabilities()), [0.25, 0.5, 0.0, 0.25])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -33,6 +33,12 @@ class PredictorTest(unittest.TestCase):
 
         self.assertEqual(split_predictor(meas), 1)
 
+    def test_split_predictor_exact(self):
+        # Same bit averages as test_split_predictor_one
+        meas = MeasurementOutcome.from_probabilities([0.25, 0.25, 0.0, 0.5])
+
+        self.assertEqual(split_predictor(meas), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
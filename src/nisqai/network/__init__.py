@@ -10,4 +10,12 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from nisqai.network._adaptive import AdaptiveShots
+from nisqai.network._bounds import CostLowerBound
+from nisqai.network._checkpoint import Checkpoint
+from nisqai.network._memo import CostMemo
+from nisqai.network._minibatch import MiniBatchSampler
 from nisqai.network._network import Network
+from nisqai.network._multiclass import MulticlassNetwork
+from nisqai.network._artifact import load_network, save_network
+from nisqai.network._sweep import Sweep, config_key, grid_search, load_results, random_search
@@ -0,0 +1,151 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Adaptive allocation of shots to the data points of a network.
+
+Most data points are classified with a large margin and a few shots are enough
+to know their prediction. AdaptiveShots starts with a few shots for every data
+point and repeatedly doubles the shots of the points whose estimated class
+probability is within a confidence margin of the decision threshold.
+"""
+
+from numpy import clip, sqrt, vstack
+
+from nisqai.measure import MeasurementOutcome
+
+
+class AdaptiveShots:
+    """Adaptive shot allocation for Network.cost.
+
+    The class probability of a data point is estimated by the average of the measured
+    bit, MeasurementOutcome.average()[0], and compared to the threshold 0.5 which
+    split_predictor uses for a single measured bit. A data point is ambiguous while
+
+        |p - 0.5| < confidence * sqrt(p (1 - p) / shots).
+
+    Networks must measure a single bit: with more bits, split_predictor decides by the
+    largest bit average, which this margin does not describe.
+
+    Each round doubles the shots of all ambiguous data points, until no point is
+    ambiguous, every ambiguous point has max_shots, or the budget is spent.
+
+    Each top-up runs in a single execution. Executables are cached by number of shots,
+    and the doubling only uses a few different numbers of shots, so later cost
+    evaluations do not compile again.
+
+    Example usage:
+
+        >>> adaptive = AdaptiveShots(initial_shots=20, max_shots=1000, budget=5000)
+        >>> qnn.cost(angles, adaptive=adaptive)
+        >>> adaptive.shots_used
+    """
+
+    def __init__(self, initial_shots=20, max_shots=1000, budget=None, confidence=2.0, threshold=0.5):
+        """Initializes an AdaptiveShots.
+
+        Args:
+            initial_shots : int (default: 20)
+                Number of shots for every data point in the first round.
+
+            max_shots : int (default: 1000)
+                Maximum number of shots for a single data point.
+
+            budget : int (default: None)
+                Maximum total number of shots for one cost evaluation. The first round
+                is always run, so the budget should be at least initial_shots times the
+                number of data points. If None, the total is only limited by max_shots.
+
+            confidence : float (default: 2.0)
+                Number of standard errors defining the margin around the threshold.
+
+            threshold : float (default: 0.5)
+                Class probability at which the predictor changes its prediction.
+        """
+        if not 0 < initial_shots <= max_shots:
+            raise ValueError("initial_shots must be positive and at most max_shots.")
+
+        self.initial_shots = initial_shots
+        self.max_shots = max_shots
+        self.budget = budget
+        self.confidence = confidence
+        self.threshold = threshold
+
+        # Statistics of the last evaluation
+        self.shots_used = 0
+        self.rounds = 0
+
+    def is_ambiguous(self, outcome):
+        """Returns True if the class of the outcome is not known with the desired confidence."""
+        shots = outcome.shots
+
+        # Never estimate a zero variance from a finite number of shots
+        p = clip(outcome.average()[0], 0.5 / shots, 1 - 0.5 / shots)
+        return abs(p - self.threshold) < self.confidence * sqrt(p * (1 - p) / shots)
+
+    def outcomes(self, network, indices, max_workers=None):
+        """Returns the MeasurementOutcomes of the data points with adaptively allocated shots.
+
+        Args:
+            network : nisqai.network.Network
+                Network to propagate the data points through, with its angles already set.
+                Must measure a single bit.
+
+            indices : list[int]
+                Indices of the data points.
+
+            max_workers : int
+                Number of threads used to propagate data points. See Network.cost.
+        """
+        num_bits = getattr(network._measurement, "num_measurements", 1)
+        if num_bits != 1:
+            raise ValueError(
+                "Adaptive shots require a network which measures one bit, not {}.".format(num_bits)
+            )
+
+        # First round with the same number of shots for every data point
+        raw = dict(zip(indices, (out.raw_outcome for out in network._map(
+            lambda ii: network.propagate(ii, None, self.initial_shots), indices, max_workers, sampled=True
+        ))))
+        self.shots_used = self.initial_shots * len(indices)
+        self.rounds = 1
+
+        while True:
+            # Data points which need more shots, with the number of additional shots
+            extra = {}
+            for ii in indices:
+                shots = len(raw[ii])
+                if shots < self.max_shots and self.is_ambiguous(MeasurementOutcome(raw[ii])):
+                    extra[ii] = min(shots, self.max_shots - shots)
+
+            # Keep within the budget, favoring the data points with the fewest shots
+            if self.budget is not None:
+                remaining = self.budget - self.shots_used
+                allowed = {}
+                for ii in sorted(extra, key=lambda ii: len(raw[ii])):
+                    if extra[ii] <= remaining:
+                        allowed[ii] = extra[ii]
+                        remaining -= extra[ii]
+                extra = allowed
+
+            if len(extra) == 0:
+                break
+
+            # Run the additional shots and merge them with the previous ones
+            more = network._map(
+                lambda ii: network.propagate(ii, None, extra[ii]), list(extra), max_workers, sampled=True
+            )
+            for (ii, out) in zip(extra, more):
+                raw[ii] = vstack([raw[ii], out.raw_outcome])
+            self.shots_used += sum(extra.values())
+            self.rounds += 1
+
+        return [MeasurementOutcome(raw[ii]) for ii in indices]
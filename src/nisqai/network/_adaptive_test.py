@@ -0,0 +1,100 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from numpy import array, pi
+
+from nisqai.data._cdata import LabeledCData
+from nisqai.encode._binary_encoding import BinaryEncoding
+from nisqai.layer._product_ansatz import ProductAnsatz
+from nisqai.measure._measure import Measurement
+from nisqai.measure._measurement_outcome import MeasurementOutcome
+from nisqai.measure._predictors import split_predictor
+from nisqai.network._adaptive import AdaptiveShots
+from nisqai.network._network import Network
+from nisqai.simulate._statevector import StatevectorSimulator
+
+
+class TestAdaptiveShots(unittest.TestCase):
+    """Unit tests for AdaptiveShots class."""
+
+    @staticmethod
+    def get_network():
+        """Returns a network which predicts the first bit of each data point."""
+        data = array([[1, 0], [0, 1], [1, 1], [0, 0]])
+        cdata = LabeledCData(data, labels=array([1, 0, 1, 0]))
+        layers = [BinaryEncoding(cdata), ProductAnsatz(2, gate_depth=2), Measurement(2, [0])]
+        return Network(layers, StatevectorSimulator(seed=2), predictor=split_predictor)
+
+    def test_is_ambiguous(self):
+        """Tests the confidence margin around the threshold."""
+        adaptive = AdaptiveShots(confidence=2.0)
+        self.assertFalse(adaptive.is_ambiguous(MeasurementOutcome(array([[1, 0]] * 20))))
+        self.assertTrue(adaptive.is_ambiguous(MeasurementOutcome(array([[1, 0], [0, 0]] * 10))))
+
+    def test_clear_points(self):
+        """Tests that clearly classified data points only get the initial shots."""
+        qnn = self.get_network()
+        adaptive = AdaptiveShots(initial_shots=10, max_shots=100)
+
+        self.assertEqual(qnn.cost([pi, 0.0, pi, 0.0], adaptive=adaptive), 0.0)
+        self.assertEqual(adaptive.shots_used, 40)
+        self.assertEqual(adaptive.rounds, 1)
+
+    def test_one_bit(self):
+        """Tests that networks which measure more than one bit are rejected."""
+        qnn = self.get_network()
+        layers = qnn._layers[:2] + [Measurement(2, [0, 1])]
+        qnn = Network(layers, StatevectorSimulator(), predictor=split_predictor)
+        with self.assertRaises(ValueError):
+            qnn.cost([pi, 0.0, pi, 0.0], adaptive=AdaptiveShots())
+
+    def test_budget(self):
+        """Tests that ambiguous data points get more shots within the budget."""
+        qnn = self.get_network()
+
+        # The first bit is one with probability one half for every data point
+        adaptive = AdaptiveShots(initial_shots=10, max_shots=1000, budget=200)
+        qnn.cost([pi / 2, 0.0, pi, 0.0], adaptive=adaptive)
+        self.assertGreater(adaptive.rounds, 1)
+        self.assertGreater(adaptive.shots_used, 40)
+        self.assertLessEqual(adaptive.shots_used, 200)
+
+        # Without a budget, the shots of each data point are limited by max_shots
+        adaptive = AdaptiveShots(initial_shots=10, max_shots=40)
+        qnn.cost([pi / 2, 0.0, pi, 0.0], adaptive=adaptive)
+        self.assertLessEqual(adaptive.shots_used, 160)
+
+    def test_compile_once(self):
+        """Tests that each top-up is one execution and repeated evaluations reuse the compiled executables."""
+        qnn = self.get_network()
+        qnn._set_angles([pi / 2, 0.0, pi, 0.0])
+        calls = []
+        propagate = qnn.propagate
+        qnn.propagate = lambda index, angles, shots: calls.append(index) or propagate(index, angles, shots)
+
+        adaptive = AdaptiveShots(initial_shots=10, max_shots=75)
+        for _ in range(5):
+            del calls[:]
+            outcomes = adaptive.outcomes(qnn, [0, 1, 2, 3])
+            self.assertGreater(adaptive.rounds, 1)
+            self.assertLessEqual(len(calls), 4 * adaptive.rounds)
+            for out in outcomes:
+                self.assertLessEqual(out.shots, 75)
+
+        # The shots of each top-up are 10, 20 or 35, so each data point compiles at most three times
+        self.assertLessEqual(qnn.cache_info()["misses"], 4 * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Trained model artifacts, so inference processes can load a network without its training data.
+
+An artifact is a compressed NumPy .npz file holding:
+
+    meta: JSON with the encoder class, predictor, cost function and encoder function, which
+        are stored by the module and name they are imported from.
+    layer_<i>: Quil text of the i-th layer after the encoder, loaded as a BaseAnsatz.
+    params: Values of the ansatz Parameters as a float array (NaN for None).
+    feature_map_*: Qubits and features of the feature map of the encoder as index arrays.
+    preprocessing_<i>_*: Statistics of the preprocessing steps of the data. See CData.transform.
+    executable_<shots>: The compiled parametric network, if it can be pickled.
+
+Only load artifacts from sources you trust, since executables are stored with pickle.
+"""
+
+from importlib import import_module
+from inspect import ismethod
+import json
+import os
+import pickle
+
+from numpy import array, asarray, cumsum, frombuffer, isnan, load, nan, savez_compressed, uint8, zeros
+from pyquil import Program
+
+from nisqai.data._cdata import CData
+from nisqai.encode._base_encoding import BaseEncoding
+from nisqai.encode._feature_maps import FeatureMap
+from nisqai.layer._base_ansatz import BaseAnsatz
+from nisqai.layer._params import Parameters
+from nisqai.network._network import Network
+from nisqai.simulate._statevector import StatevectorSimulator
+
+# Version of the artifact format
+ARTIFACT_VERSION = 1
+
+# Simulators which can be created from their name when no computer is given to load_network
+_SIMULATORS = {StatevectorSimulator().name: StatevectorSimulator}
+
+
+def save_network(network, path, shots=1000):
+    """Writes a trained network to an artifact file at path.
+
+    The file is replaced atomically. Training data is not stored: the loaded network
+    predicts new feature vectors with Network.predict_stream (after CData.transform,
+    if the data was preprocessed).
+
+    Args:
+        network : nisqai.network.Network
+            Network to save. Requires an encoder derived from BaseEncoding, and a
+            predictor, cost function and encoder function which can be imported
+            by name (not lambdas or local functions).
+
+        path : str
+            Path of the artifact file.
+
+        shots : Union[int, None] (default: 1000)
+            Number of shots of the compiled executable to store. If None, or if the
+            executable cannot be pickled, the loaded network compiles on first use.
+    """
+    encoder = network._encoder
+    if not isinstance(encoder, BaseEncoding):
+        raise TypeError("Saving a network requires an encoder derived from BaseEncoding.")
+
+    meta = dict(
+        version=ARTIFACT_VERSION,
+        encoder=_qualified_name(type(encoder)),
+        num_features=encoder.data.num_features,
+        layer_qubits=[layer.num_qubits for layer in network._layers[1:]],
+        predictor=None if network.predictor is None else _qualified_name(network.predictor),
+        cost_function=[_qualified_name(type(network.cost_function)), vars(network.cost_function)],
+        computer=network.computer.name,
+        preprocessing=[step[0] for step in encoder.data.preprocessing],
+    )
+    arrays = dict(
+        ("layer_{}".format(ii), array(layer.circuit.out())) for (ii, layer) in enumerate(network._layers[1:])
+    )
+
+    # Ansatz parameters, with the number of parameters of each qubit
+    params = network._ansatz.params
+    arrays["params"] = array([nan if val is None else val for val in params.list_values()], dtype=float)
+    arrays["params_lengths"] = array([len(vals) for vals in params.grid_values()], dtype=int)
+
+    # Encoder function and feature map, for encodings which have them
+    if hasattr(encoder, "feature_map"):
+        meta["encoder_function"] = _qualified_name(encoder.encoder)
+        qubits = sorted(encoder.feature_map.map)
+        arrays["feature_map_qubits"] = array(qubits, dtype=int)
+        arrays["feature_map_lengths"] = array([len(encoder.feature_map.map[q]) for q in qubits], dtype=int)
+        arrays["feature_map_features"] = array(
+            [x for q in qubits for x in encoder.feature_map.map[q]], dtype=int
+        )
+
+    # Statistics of the preprocessing steps
+    for (ii, step) in enumerate(encoder.data.preprocessing):
+        for (jj, value) in enumerate(step[1:]):
+            arrays["preprocessing_{}_{}".format(ii, jj)] = asarray(value)
+
+    # Compiled parametric network
+    if shots is not None:
+        try:
+            executable = pickle.dumps(network.compile(None, shots))
+            arrays["executable_{}".format(shots)] = frombuffer(executable, dtype=uint8)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            pass
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as file:
+        savez_compressed(file, meta=array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+
+
+def load_network(path, computer=None, **kwargs):
+    """Returns the network stored in the artifact file at path.
+
+    The network is parametric, so every feature vector is run with the stored executable.
+
+    Example usage:
+
+        >>> save_network(qnn, "model.npz")
+        >>> # ... in the inference process ...
+        >>> qnn = load_network("model.npz")
+        >>> predictions = list(qnn.predict_stream(qnn.data.transform(raw_feature_vectors)))
+
+    Args:
+        path : str
+            Path of a file written by save_network.
+
+        computer : Union[str, pyquil.api.QuantumComputer, nisqai.simulate.BaseSimulator]
+            Computer to run the network on. Defaults to the computer the network was saved
+            with, if it is a NISQAI simulator, else to the name of the computer. The stored
+            executable is only used if the computer has the same name.
+
+        kwargs
+            Other keyword arguments of Network, e.g. batched or cache_size.
+    """
+    with load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta["version"] != ARTIFACT_VERSION:
+            raise ValueError("Unsupported artifact version {}.".format(meta["version"]))
+
+        # Placeholder data with the number of features of the network and its preprocessing
+        cdata = CData(zeros((1, meta["num_features"])))
+        for (ii, kind) in enumerate(meta["preprocessing"]):
+            values = [data[key] for key in sorted(data.files) if key.startswith("preprocessing_{}_".format(ii))]
+            if kind == "pad":
+                values = [int(val) for val in values]
+            cdata.preprocessing.append(tuple([kind] + values))
+
+        # Encoder
+        args = [cdata]
+        if "encoder_function" in meta:
+            ends = cumsum(data["feature_map_lengths"])
+            features = data["feature_map_features"]
+            mapping = dict(
+                (int(q), tuple(int(x) for x in features[end - length:end]))
+                for (q, length, end) in zip(data["feature_map_qubits"], data["feature_map_lengths"], ends)
+            )
+            args += [_import(meta["encoder_function"]), FeatureMap(mapping)]
+        layers = [_import(meta["encoder"])(*args)]
+
+        # Layers after the encoder, with the ansatz parameters
+        for (ii, num_qubits) in enumerate(meta["layer_qubits"]):
+            layer = BaseAnsatz(num_qubits)
+            layer.circuit = Program(str(data["layer_{}".format(ii)]))
+            layers.append(layer)
+
+        values = [None if isnan(val) else float(val) for val in data["params"]]
+        ends = cumsum(data["params_lengths"])
+        layers[1].params = Parameters(
+            dict((q, values[end - length:end]) for (q, (length, end)) in enumerate(zip(data["params_lengths"], ends)))
+        )
+
+        predictor = None if meta["predictor"] is None else _import(meta["predictor"])
+        (cost_name, cost_attributes) = meta["cost_function"]
+        cost_function = _import(cost_name)(**cost_attributes)
+
+        if computer is None:
+            computer = _SIMULATORS[meta["computer"]]() if meta["computer"] in _SIMULATORS else meta["computer"]
+        network = Network(layers, computer, predictor, parametric=True, cost_function=cost_function, **kwargs)
+
+        # Compiled executables, if they were compiled for a computer with the same name
+        if network.computer.name == meta["computer"]:
+            for key in data.files:
+                if key.startswith("executable_"):
+                    shots = int(key[len("executable_"):])
+                    network._cache.put(
+                        (None, shots, network.computer.name, network._structure_hash()),
+                        pickle.loads(data[key].tobytes())
+                    )
+        return network
+
+
+def _qualified_name(obj):
+    """Returns the name a class or function is imported by, as module:name."""
+    name = getattr(obj, "__qualname__", "")
+    if not name or "<" in name or ismethod(obj):
+        raise ValueError(
+            "{!r} cannot be saved by name. Use a function or class defined at module level.".format(obj)
+        )
+    return "{}:{}".format(obj.__module__, name)
+
+
+def _import(qualified_name):
+    """Returns the class or function with the name returned by _qualified_name."""
+    (module, name) = qualified_name.split(":")
+    obj = import_module(module)
+    for attr in name.split("."):
+        obj = getattr(obj, attr)
+    return obj
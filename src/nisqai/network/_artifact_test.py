@@ -0,0 +1,105 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, pi, random
+
+from nisqai.cost._network_costs import CrossEntropy
+from nisqai.data._cdata import LabeledCData
+from nisqai.encode._dense_angle_encoding import DenseAngleEncoding
+from nisqai.encode._encoders import angle_simple_linear
+from nisqai.encode._feature_maps import nearest_neighbor
+from nisqai.layer._product_ansatz import ProductAnsatz
+from nisqai.measure._measure import Measurement
+from nisqai.measure._predictors import split_predictor
+from nisqai.network._artifact import load_network, save_network
+from nisqai.network._network import Network
+from nisqai.simulate._statevector import StatevectorSimulator
+
+
+def get_network():
+    """Returns a network with a dense angle encoding of preprocessed data on the statevector simulator."""
+    rng = random.default_rng(3)
+    cdata = LabeledCData(rng.normal(size=(6, 4)) * 5 + 2, labels=array([0, 1, 0, 1, 1, 0]))
+    cdata.scale_features("min-max norm")
+    encoder = DenseAngleEncoding(cdata, angle_simple_linear, nearest_neighbor(4, 2))
+    layers = [encoder, ProductAnsatz(2, gate_depth=2), Measurement(2, [0])]
+    return Network(layers, StatevectorSimulator(seed=1), predictor=split_predictor,
+                   cost_function=CrossEntropy(eps=1e-6))
+
+
+class TestArtifact(unittest.TestCase):
+    """Unit tests for saving and loading networks."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_load(self):
+        """Tests that a loaded network predicts new feature vectors like the saved network."""
+        qnn = get_network()
+        angles = [pi / 3, 0.2, 1.1, None]
+        qnn._ansatz.params.update_values(angles)
+        path = os.path.join(self.directory, "model.npz")
+        save_network(qnn, path, shots=500)
+        self.assertEqual(os.listdir(self.directory), ["model.npz"])
+
+        loaded = load_network(path, StatevectorSimulator(seed=1))
+        self.assertEqual(loaded.num_data_points, 1)
+        self.assertEqual(loaded._ansatz.params.list_values(), angles)
+        self.assertIs(loaded.predictor, split_predictor)
+        self.assertIsInstance(loaded.cost_function, CrossEntropy)
+        self.assertEqual(loaded.cost_function.eps, 1e-6)
+        self.assertEqual(loaded._encoder.feature_map.map, {0: (0, 1), 1: (2, 3)})
+
+        # New raw feature vectors are preprocessed with the statistics of the training data
+        raw = random.default_rng(4).normal(size=(20, 4)) * 5 + 2
+        features = qnn.data.transform(raw)
+        self.assertTrue((loaded.data.transform(raw) == features).all())
+
+        # The stored executable is used without compiling
+        expected = list(qnn.predict_stream(features, shots=500))
+        self.assertEqual(list(loaded.predict_stream(loaded.data.transform(raw), shots=500)), expected)
+        self.assertEqual(loaded.cache_info()["misses"], 0)
+
+        # Exact probabilities agree as well
+        self.assertEqual(list(loaded.predict_stream(features, shots=None)),
+                         list(qnn.predict_stream(features, shots=None)))
+
+    def test_without_executable(self):
+        """Tests that a network saved without an executable compiles on first use."""
+        qnn = get_network()
+        path = os.path.join(self.directory, "model.npz")
+        save_network(qnn, path, shots=None)
+        loaded = load_network(path)
+        self.assertIsInstance(loaded.computer, StatevectorSimulator)
+        self.assertEqual(len(list(loaded.predict_stream([[0.5, 0.5, 0.5, 0.5]], shots=10))), 1)
+        self.assertEqual(loaded.cache_info()["misses"], 1)
+
+    def test_invalid(self):
+        """Tests that networks whose predictor cannot be imported by name are not saved."""
+        qnn = get_network()
+        qnn.predictor = lambda outcome: 0
+        path = os.path.join(self.directory, "model.npz")
+        with self.assertRaises(ValueError):
+            save_network(qnn, path)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Cost values which are only known to be bounded from below."""
+
+
+class CostLowerBound(float):
+    """Lower bound of a cost, returned when an evaluation stops early.
+
+    A CostLowerBound is a float, so optimizers can use it like any other cost value.
+    Since the true cost is at least this value, a candidate with this cost is never
+    better than the bound the evaluation was stopped against.
+
+    Example usage:
+
+        >>> val = qnn.cost(angles, bound=0.2)
+        >>> if isinstance(val, CostLowerBound):
+        >>>     print("Stopped after", val.num_evaluated, "data points.")
+    """
+
+    def __new__(cls, value, num_evaluated):
+        """Returns a CostLowerBound.
+
+        Args:
+            value : float
+                Lower bound of the cost.
+
+            num_evaluated : int
+                Number of data points evaluated before stopping.
+        """
+        bound = super().__new__(cls, value)
+        bound.num_evaluated = num_evaluated
+        return bound
+
+    @property
+    def is_lower_bound(self):
+        """Returns True. The true cost may be larger than this value."""
+        return True
+
+    def __repr__(self):
+        return "CostLowerBound({}, num_evaluated={})".format(float(self), self.num_evaluated)
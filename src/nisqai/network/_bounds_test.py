@@ -0,0 +1,32 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from nisqai.network._bounds import CostLowerBound
+
+
+class TestCostLowerBound(unittest.TestCase):
+    """Unit tests for CostLowerBound class."""
+
+    def test_float(self):
+        """Tests that a CostLowerBound compares like a float."""
+        bound = CostLowerBound(0.5, num_evaluated=3)
+        self.assertIsInstance(bound, float)
+        self.assertTrue(bound.is_lower_bound)
+        self.assertEqual(bound.num_evaluated, 3)
+        self.assertEqual(bound, 0.5)
+        self.assertLess(0.25, bound)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Bounded least recently used (LRU) cache with hit and miss counters."""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Least recently used cache of a bounded size.
+
+    When the cache is full, adding a new item discards the item which was
+    used least recently. Lookups are counted as hits or misses so the
+    effectiveness of the cache can be monitored.
+    """
+
+    def __init__(self, maxsize=128):
+        """Initializes an LRUCache.
+
+        Args:
+            maxsize : Union[int, None]
+                Maximum number of items to store. If None, the cache is unbounded.
+                If zero, nothing is stored.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be a non-negative integer or None.")
+        self._maxsize = maxsize
+        self._items = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Returns the maximum number of items in the cache."""
+        return self._maxsize
+
+    @property
+    def hits(self):
+        """Returns the number of lookups which found an item."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Returns the number of lookups which did not find an item."""
+        return self._misses
+
+    def get(self, key, default=None):
+        """Returns the item stored at key, or default if there is no such item.
+
+        Args:
+            key : hashable
+                Key of the item.
+
+            default : Any
+                Value returned if the key is not in the cache.
+        """
+        try:
+            value = self._items[key]
+        except KeyError:
+            self._misses += 1
+            return default
+        self._items.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores the value at key, discarding the least recently used item if the cache is full.
+
+        Args:
+            key : hashable
+                Key of the item.
+
+            value : Any
+                Item to store.
+        """
+        if self._maxsize == 0:
+            return
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if self._maxsize is not None and len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """Removes all items from the cache and resets the hit and miss counters."""
+        self._items.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def info(self):
+        """Returns a dictionary of statistics for the cache."""
+        return {"hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._items),
+                "maxsize": self._maxsize}
+
+    def __contains__(self, key):
+        """Returns True if the key is in the cache. Does not count as a hit or miss."""
+        return key in self._items
+
+    def __len__(self):
+        """Returns the number of items in the cache."""
+        return len(self._items)
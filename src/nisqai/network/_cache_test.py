@@ -0,0 +1,73 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from nisqai.network._cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Unit tests for LRUCache class."""
+
+    def test_hits_and_misses(self):
+        """Tests that lookups are counted as hits and misses."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.info(), {"hits": 1, "misses": 1, "size": 1, "maxsize": 2})
+
+    def test_evicts_least_recently_used(self):
+        """Tests that the least recently used item is discarded when the cache is full."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        # Use "a" so that "b" is the least recently used item
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_zero_size(self):
+        """Tests that a cache of size zero stores nothing."""
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_unbounded(self):
+        """Tests that a cache with no maximum size keeps all items."""
+        cache = LRUCache(maxsize=None)
+        for ii in range(1000):
+            cache.put(ii, ii)
+        self.assertEqual(len(cache), 1000)
+
+    def test_clear(self):
+        """Tests that clearing the cache removes all items and resets the counters."""
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        self.assertEqual(cache.info(), {"hits": 0, "misses": 0, "size": 0, "maxsize": 128})
+
+    def test_invalid_size(self):
+        """Tests that a negative size raises an error."""
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
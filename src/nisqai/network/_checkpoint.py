@@ -0,0 +1,117 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Checkpoints of Network.train runs, so a long run can continue after a crash."""
+
+import json
+import os
+
+from numpy import array, asarray, load, savez_compressed
+
+# Prefix of the optimizer state arrays in checkpoint files
+_OPTIMIZER_PREFIX = "optimizer_"
+
+
+class Checkpoint:
+    """State of a training run at the end of an optimizer iteration.
+
+    A checkpoint holds:
+
+        angles: The angles the optimizer continues from.
+        history: The cost of every evaluation of the objective so far.
+        optimizer_state: State of NISQAI optimizers ("bounded_Powell", "adam", "sgd"),
+            e.g. the bounded_Powell direction vectors or the Adam moment estimates.
+            Empty for other trainers, which restart from the angles.
+        rng_state: States of the random number generators of the mini-batch sampler
+            and the simulator, if they are used.
+
+    Checkpoints are stored as compressed NumPy .npz files. See Network.train for
+    writing checkpoints periodically and resuming from them.
+
+    Example usage:
+
+        >>> qnn.train(initial_angles, trainer="bounded_Powell", checkpoint="run.npz")
+        >>> # ... the process crashes, then later ...
+        >>> qnn.train(initial_angles, trainer="bounded_Powell", checkpoint="run.npz", resume="run.npz")
+    """
+
+    def __init__(self, trainer, angles, history=(), iteration=0, optimizer_state=None, rng_state=None):
+        """Initializes a Checkpoint.
+
+        Args:
+            trainer : str
+                Name of the optimization method.
+
+            angles : array-like
+                Angles the optimizer continues from.
+
+            history : Iterable[float]
+                Cost of every evaluation of the objective so far.
+
+            iteration : int
+                Number of completed optimizer iterations.
+
+            optimizer_state : dict[str, array-like]
+                State of the optimizer, passed back to it as the state option.
+
+            rng_state : dict
+                States of random number generators, as dicts of built-in types.
+        """
+        self.trainer = trainer
+        self.angles = asarray(angles, dtype=float)
+        self.history = [float(val) for val in history]
+        self.iteration = iteration
+        self.optimizer_state = {} if optimizer_state is None else dict(optimizer_state)
+        self.rng_state = {} if rng_state is None else dict(rng_state)
+
+    def save(self, path):
+        """Writes the checkpoint to the file at path.
+
+        The file is replaced atomically, so a crash while writing leaves the previous checkpoint intact.
+
+        Args:
+            path : str
+                Path of the checkpoint file.
+        """
+        meta = dict(trainer=self.trainer, iteration=self.iteration, rng_state=self.rng_state)
+        arrays = dict(
+            (_OPTIMIZER_PREFIX + key, asarray(val)) for (key, val) in self.optimizer_state.items()
+        )
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as file:
+            savez_compressed(
+                file, angles=self.angles, history=array(self.history, dtype=float),
+                meta=array(json.dumps(meta)), **arrays
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the checkpoint stored in the file at path.
+
+        Args:
+            path : str
+                Path of a file written by Checkpoint.save.
+        """
+        with load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            optimizer_state = dict(
+                (key[len(_OPTIMIZER_PREFIX):], data[key]) for key in data.files
+                if key.startswith(_OPTIMIZER_PREFIX)
+            )
+            return cls(meta["trainer"], data["angles"], data["history"], meta["iteration"],
+                       optimizer_state, meta["rng_state"])
+
+    @property
+    def best_cost(self):
+        """Returns the lowest cost evaluated so far, or None if there are no evaluations."""
+        return min(self.history) if self.history else None
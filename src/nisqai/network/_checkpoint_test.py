@@ -0,0 +1,71 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, random
+
+from nisqai.network._checkpoint import Checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Unit tests for Checkpoint class."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_load(self):
+        """Tests that a loaded checkpoint equals the saved checkpoint."""
+        rng = random.default_rng(2)
+        rng_state = dict(simulator=rng.bit_generator.state, sampler=dict(epoch=1, position=2, order=[1, 0, 2]))
+        checkpoint = Checkpoint(
+            "bounded_Powell", [0.1, 0.2], history=[1.5, 0.5, 0.75], iteration=3,
+            optimizer_state=dict(direc=array([[0.0, 1.0], [1.0, 0.0]]), nfev=3, fun=0.5),
+            rng_state=rng_state
+        )
+        path = os.path.join(self.directory, "run.npz")
+        checkpoint.save(path)
+        self.assertEqual(os.listdir(self.directory), ["run.npz"])
+
+        loaded = Checkpoint.load(path)
+        self.assertEqual(loaded.trainer, "bounded_Powell")
+        self.assertEqual(list(loaded.angles), [0.1, 0.2])
+        self.assertEqual(loaded.history, [1.5, 0.5, 0.75])
+        self.assertEqual(loaded.best_cost, 0.5)
+        self.assertEqual(loaded.iteration, 3)
+        self.assertEqual(loaded.optimizer_state["direc"].tolist(), [[0.0, 1.0], [1.0, 0.0]])
+        self.assertEqual(int(loaded.optimizer_state["nfev"]), 3)
+        self.assertEqual(loaded.rng_state, rng_state)
+
+        # The random number generator continues where it was saved
+        expected = rng.random()
+        restored = random.default_rng()
+        restored.bit_generator.state = loaded.rng_state["simulator"]
+        self.assertEqual(restored.random(), expected)
+
+    def test_overwrite(self):
+        """Tests that saving replaces the previous checkpoint."""
+        path = os.path.join(self.directory, "run.npz")
+        Checkpoint("adam", [0.0], history=[2.0]).save(path)
+        Checkpoint("adam", [1.0], history=[2.0, 1.0], iteration=1).save(path)
+        self.assertEqual(list(Checkpoint.load(path).angles), [1.0])
+        self.assertIsNone(Checkpoint("adam", [0.0]).best_cost)
+
+
+if __name__ == "__main__":
+    unittest.main()
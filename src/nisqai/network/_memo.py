@@ -0,0 +1,104 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Memoization of cost values by angle vector for Network.train."""
+
+from numpy import asarray, round as npround
+
+from nisqai.network._cache import LRUCache
+
+
+class CostMemo:
+    """Bounded cache of cost values keyed by the rounded angle vector.
+
+    Optimizers such as Powell and bounded_Powell evaluate the same (or nearly the
+    same) angles more than once, e.g. at the end points of line searches and after
+    restarts. A CostMemo returns the stored cost instead of evaluating the network again.
+
+    Cached values are exact if the cost is deterministic, i.e. if the network computes
+    exact probabilities (shots=None). Costs estimated from samples are only cached if
+    allow_sampled is True, in which case the first estimate is reused.
+
+    Example usage:
+
+        >>> memo = CostMemo(maxsize=256)
+        >>> qnn.train(initial_angles, trainer="Powell", shots=None, memo=memo)
+        >>> memo.info()
+    """
+
+    def __init__(self, maxsize=128, decimals=10, allow_sampled=False):
+        """Initializes a CostMemo.
+
+        Args:
+            maxsize : Union[int, None] (default: 128)
+                Maximum number of cost values to store. See LRUCache.
+
+            decimals : int (default: 10)
+                Angles are rounded to this many decimals before lookup, so angle vectors
+                which only differ by rounding errors share a cost value.
+
+            allow_sampled : bool (default: False)
+                If True, costs estimated from a finite number of shots are cached too.
+        """
+        self.decimals = decimals
+        self.allow_sampled = allow_sampled
+        self._cache = LRUCache(maxsize)
+
+    def key(self, angles, indices=None):
+        """Returns the lookup key of the angles and the data points the cost is evaluated on.
+
+        Args:
+            angles : Union[dict, list, numpy.ndarray]
+                Angles for the unitary ansatz.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points, e.g. a mini-batch. None means all data points.
+        """
+        if isinstance(angles, dict):
+            angles = [a for q in sorted(angles) for a in angles[q]]
+        rounded = npround(asarray(angles, dtype=float).ravel(), self.decimals) + 0.0
+        return tuple(rounded), None if indices is None else tuple(int(ii) for ii in indices)
+
+    def evaluate(self, cost, angles, indices=None):
+        """Returns cost(angles), using the stored value if the angles were evaluated before.
+
+        Args:
+            cost : Callable
+                Function of the angles which returns the cost.
+
+            angles : Union[dict, list, numpy.ndarray]
+                Angles for the unitary ansatz.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points the cost is evaluated on.
+        """
+        key = self.key(angles, indices)
+        value = self._cache.get(key)
+        if value is None:
+            value = cost(angles)
+            self._cache.put(key, value)
+        return value
+
+    def clear(self):
+        """Removes all stored cost values and resets the statistics."""
+        self._cache.clear()
+
+    def info(self):
+        """Returns a dictionary with the hits, misses, size and maxsize of the memo.
+
+        Each hit is a cost evaluation which was saved.
+        """
+        return self._cache.info()
+
+    def __len__(self):
+        """Returns the number of stored cost values."""
+        return len(self._cache)
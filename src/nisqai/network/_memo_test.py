@@ -0,0 +1,62 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from numpy import array
+
+from nisqai.network._memo import CostMemo
+
+
+class TestCostMemo(unittest.TestCase):
+    """Unit tests for CostMemo class."""
+
+    def test_evaluate(self):
+        """Tests that each angle vector is evaluated once."""
+        calls = []
+
+        def cost(angles):
+            calls.append(angles)
+            return sum(angles)
+
+        memo = CostMemo()
+        self.assertEqual(memo.evaluate(cost, array([1.0, 2.0])), 3.0)
+        self.assertEqual(memo.evaluate(cost, array([1.0, 2.0 + 1e-14])), 3.0)
+        self.assertEqual(memo.evaluate(cost, array([1.0, 2.5])), 3.5)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(memo.info(), {"hits": 1, "misses": 2, "size": 2, "maxsize": 128})
+
+    def test_key(self):
+        """Tests lookup keys of angles and mini-batches."""
+        memo = CostMemo(decimals=3)
+
+        # Angles given as a dictionary are flattened by qubit
+        self.assertEqual(memo.key({1: [3.0], 0: [1.0, 2.0]}), memo.key([1.0, 2.0, 3.0]))
+
+        # Negative zero and zero are the same angle
+        self.assertEqual(memo.key([-0.0001]), memo.key([0.0]))
+
+        # Costs on different mini-batches are stored separately
+        self.assertNotEqual(memo.key([1.0], indices=[0, 1]), memo.key([1.0], indices=[2, 3]))
+        self.assertNotEqual(memo.key([1.0], indices=[0, 1]), memo.key([1.0]))
+
+    def test_bounded(self):
+        """Tests that the least recently used cost value is discarded."""
+        memo = CostMemo(maxsize=1)
+        memo.evaluate(sum, [1.0])
+        memo.evaluate(sum, [2.0])
+        self.assertEqual(len(memo), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
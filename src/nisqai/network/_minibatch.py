@@ -0,0 +1,136 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Sampling of mini-batches of data point indices for stochastic training."""
+
+from numpy import array
+
+from nisqai.utils._random import as_generator
+
+# Sampling strategies for MiniBatchSampler
+SAMPLING_STRATEGIES = ("shuffle", "random")
+
+
+class MiniBatchSampler:
+    """Draws mini-batches of data point indices.
+
+    Two sampling strategies are supported:
+
+        "shuffle": The data points are split into consecutive batches of a random
+            permutation, so every data point is used once per epoch. If reshuffle
+            is True, a new permutation is drawn at the start of every epoch.
+
+        "random": Every batch is drawn independently and uniformly at random
+            (without replacement within the batch).
+
+    Example usage:
+
+        >>> sampler = MiniBatchSampler(100, batch_size=10, seed=0)
+        >>> indices = sampler.next()
+    """
+
+    def __init__(self, num_data_points, batch_size, sampling="shuffle", reshuffle=True, seed=None):
+        """Initializes a MiniBatchSampler.
+
+        Args:
+            num_data_points : int
+                Number of data points to sample from.
+
+            batch_size : int
+                Number of data points in each batch. Must be between one and num_data_points.
+
+            sampling : str (default: "shuffle")
+                Sampling strategy, either "shuffle" or "random".
+
+            reshuffle : bool (default: True)
+                If True, draw a new permutation at the start of each epoch.
+                Only used by the "shuffle" strategy.
+
+            seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+                Seed for the random number generator. See nisqai.utils.as_generator.
+        """
+        if not 1 <= batch_size <= num_data_points:
+            raise ValueError("batch_size must be between one and the number of data points.")
+        if sampling not in SAMPLING_STRATEGIES:
+            raise ValueError(
+                "Unknown sampling strategy {}. Options are {}.".format(sampling, SAMPLING_STRATEGIES)
+            )
+
+        self.num_data_points = num_data_points
+        self.batch_size = batch_size
+        self.sampling = sampling
+        self.reshuffle = reshuffle
+        self.rng = as_generator(seed)
+
+        # Number of completed epochs and position in the current permutation
+        self._epoch = 0
+        self._position = 0
+        self._order = self.rng.permutation(num_data_points)
+
+    @property
+    def epoch(self):
+        """Returns the number of completed passes over the data."""
+        return self._epoch
+
+    @property
+    def batches_per_epoch(self):
+        """Returns the number of batches which cover all data points once."""
+        return -(-self.num_data_points // self.batch_size)
+
+    def next(self):
+        """Returns the indices of the next mini-batch as a numpy.ndarray."""
+        if self.sampling == "random":
+            batch = self.rng.choice(self.num_data_points, size=self.batch_size, replace=False)
+            self._position += self.batch_size
+            if self._position >= self.num_data_points:
+                self._position -= self.num_data_points
+                self._epoch += 1
+            return batch
+
+        # The last batch of an epoch may be smaller than the batch size
+        batch = self._order[self._position:self._position + self.batch_size]
+        self._position += self.batch_size
+        if self._position >= self.num_data_points:
+            self._position = 0
+            self._epoch += 1
+            if self.reshuffle:
+                self._order = self.rng.permutation(self.num_data_points)
+        return batch
+
+    def get_state(self):
+        """Returns the state of the sampler as a dict of built-in types, e.g. for checkpoints."""
+        return dict(
+            rng=self.rng.bit_generator.state,
+            epoch=self._epoch,
+            position=self._position,
+            order=[int(ii) for ii in self._order]
+        )
+
+    def set_state(self, state):
+        """Restores the state of the sampler from MiniBatchSampler.get_state.
+
+        Args:
+            state : dict
+                State returned by get_state of a sampler with the same data points and batch size.
+        """
+        if len(state["order"]) != self.num_data_points:
+            raise ValueError("The state is for a sampler of {} data points.".format(len(state["order"])))
+        self.rng.bit_generator.state = state["rng"]
+        self._epoch = state["epoch"]
+        self._position = state["position"]
+        self._order = array(state["order"])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
@@ -0,0 +1,80 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from nisqai.network._minibatch import MiniBatchSampler
+
+
+class TestMiniBatchSampler(unittest.TestCase):
+    """Unit tests for MiniBatchSampler class."""
+
+    def test_shuffle_covers_epoch(self):
+        """Tests that every data point is used once per epoch."""
+        sampler = MiniBatchSampler(10, batch_size=4, seed=1)
+        self.assertEqual(sampler.batches_per_epoch, 3)
+
+        batches = [sampler.next() for _ in range(3)]
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+        self.assertEqual(sorted(i for b in batches for i in b), list(range(10)))
+        self.assertEqual(sampler.epoch, 1)
+
+    def test_reshuffle(self):
+        """Tests that the order is kept between epochs unless reshuffling."""
+        sampler = MiniBatchSampler(6, batch_size=6, reshuffle=False, seed=2)
+        self.assertEqual(list(sampler.next()), list(sampler.next()))
+
+        sampler = MiniBatchSampler(6, batch_size=6, reshuffle=True, seed=2)
+        epochs = [list(sampler.next()) for _ in range(5)]
+        self.assertTrue(any(e != epochs[0] for e in epochs[1:]))
+
+    def test_seed(self):
+        """Tests that the same seed gives the same batches."""
+        for sampling in ("shuffle", "random"):
+            first = MiniBatchSampler(20, 5, sampling=sampling, seed=3)
+            second = MiniBatchSampler(20, 5, sampling=sampling, seed=3)
+            for _ in range(6):
+                self.assertEqual(list(first.next()), list(second.next()))
+
+    def test_random(self):
+        """Tests that random batches have distinct indices."""
+        sampler = MiniBatchSampler(5, batch_size=3, sampling="random", seed=4)
+        for _ in range(10):
+            batch = sampler.next()
+            self.assertEqual(len(set(batch)), 3)
+
+    def test_state(self):
+        """Tests that a restored sampler continues with the same batches."""
+        for sampling in ("shuffle", "random"):
+            sampler = MiniBatchSampler(7, 3, sampling=sampling, seed=5)
+            for _ in range(4):
+                sampler.next()
+
+            restored = MiniBatchSampler(7, 3, sampling=sampling)
+            restored.set_state(sampler.get_state())
+            self.assertEqual(restored.epoch, sampler.epoch)
+            for _ in range(6):
+                self.assertEqual(list(restored.next()), list(sampler.next()))
+
+        with self.assertRaises(ValueError):
+            MiniBatchSampler(8, 3).set_state(sampler.get_state())
+
+    def test_invalid(self):
+        """Tests invalid arguments."""
+        with self.assertRaises(ValueError):
+            MiniBatchSampler(5, batch_size=6)
+        with self.assertRaises(ValueError):
+            MiniBatchSampler(5, batch_size=2, sampling="stratified")
+
+
+if __name__ == "__main__":
+    unittest.main()
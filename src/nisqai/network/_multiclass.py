@@ -0,0 +1,131 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Multiclass networks which score all classes from the same circuit executions."""
+
+from numpy import argmax
+
+from nisqai.cost._network_costs import (
+    READOUTS, Misclassification, MulticlassCost, class_scores, readout_matrix
+)
+from nisqai.network._network import Network
+
+
+class MulticlassNetwork(Network):
+    """Network which classifies data points into several classes.
+
+    The encoder and ansatz are shared by all classes, and the scores of all classes are
+    read from the same shots (see nisqai.cost.class_scores). Each data point is run once
+    per evaluation instead of once per class, as with one binary network for each class.
+    The prediction of a data point is the class with the highest score.
+
+    Labels must be the integers 0, 1, ..., num_classes - 1.
+
+    Example usage:
+
+        >>> layers = [encoder, ProductAnsatz(3), Measurement(3, [0, 1, 2])]
+        >>> qnn = MulticlassNetwork(layers, StatevectorSimulator(), num_classes=3,
+        >>>                         cost_function=MulticlassCrossEntropy())
+        >>> res = qnn.train(initial_angles, trainer="adam")
+    """
+
+    def __init__(self, layers, computer, num_classes=None, readout="qubits", predictor=None,
+                 cost_function=None, **kwargs):
+        """Initializes a MulticlassNetwork.
+
+        Args:
+            layers : iterable
+                Iterable object of network elements. See Network.
+
+            computer : Union[str, pyquil.api.QuantumComputer, nisqai.utils.ComputerDispatcher,
+                             nisqai.simulate.BaseSimulator]
+                Specifies which computer to run the network on. See Network.
+
+            num_classes : int (default: None)
+                Number of classes. Defaults to the number of distinct labels in the data.
+
+            readout : str (default: "qubits")
+                "qubits": The score of class c is the probability that measured bit c is one
+                    (one-vs-rest). Requires at least num_classes measured qubits.
+                "bitstrings": The score of class c is the probability of the bit strings whose
+                    integer value is c modulo num_classes.
+
+            predictor : Callable (default: None)
+                Function that inputs a MeasurementOutcome and outputs a class.
+                Defaults to MulticlassNetwork.class_predictor.
+
+            cost_function : Union[nisqai.cost.MulticlassCost, nisqai.cost.Misclassification] (default: None)
+                Cost function of the class scores, e.g. nisqai.cost.MulticlassCrossEntropy(),
+                or the number of misclassified data points. Defaults to Misclassification().
+
+            kwargs
+                Other keyword arguments of Network, e.g. batched or deduplicate.
+        """
+        if readout not in READOUTS:
+            raise ValueError("Unknown readout {}. Options are {}.".format(readout, ", ".join(READOUTS)))
+        if cost_function is not None and not isinstance(cost_function, (MulticlassCost, Misclassification)):
+            raise TypeError("Multiclass networks require a MulticlassCost or the Misclassification cost.")
+
+        self.readout = readout
+        self.num_classes = layers[0].data.num_classes if num_classes is None else num_classes
+        super().__init__(layers, computer, predictor=self.class_predictor if predictor is None else predictor,
+                         cost_function=cost_function, **kwargs)
+
+        # Make sure the measured bits can hold the classes
+        if hasattr(self._measurement, "num_measurements"):
+            readout_matrix(self._measurement.num_measurements, self.num_classes, self.readout)
+
+    def class_scores(self, outcome):
+        """Returns the scores of all classes for the MeasurementOutcome of a data point."""
+        return class_scores([outcome], self.num_classes, self.readout)[0]
+
+    def class_predictor(self, outcome):
+        """Returns the class with the highest score for the MeasurementOutcome of a data point."""
+        return int(argmax(self.class_scores(outcome)))
+
+    def predict_scores(self, angles=None, shots=1000, max_workers=None, indices=None):
+        """Returns the class scores of the data points as an array of shape (len(indices), num_classes).
+
+        Args:
+            angles : Union[dict, list]
+                Angles for the unitary ansatz.
+
+            shots : Union[int, None]
+                Number of times to execute the circuit of each data point.
+                If None, exact probabilities are used (simulators only).
+
+            max_workers : int (default: None)
+                If greater than one, data points are propagated in a pool of this many threads.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points. Defaults to all data points.
+        """
+        return self._class_scores(self.propagate_all(angles, shots, max_workers, indices))
+
+    def cost(self, angles, shots=1000, max_workers=None, indices=None, adaptive=None, bound=None):
+        """Returns the cost of the network. See Network.cost.
+
+        Adaptive shots are not supported, since they decide between two classes.
+        """
+        if adaptive is not None:
+            raise ValueError("Multiclass networks do not support adaptive shots.")
+        return super().cost(angles, shots, max_workers, indices, adaptive, bound)
+
+    def _class_scores(self, outcomes):
+        """Returns the class scores of the outcomes as an array of shape (len(outcomes), num_classes)."""
+        return class_scores(outcomes, self.num_classes, self.readout)
+
+    def _total_cost(self, outcomes, indices):
+        """Returns the total cost of the outcomes of the data points with the given indices."""
+        if isinstance(self.cost_function, MulticlassCost):
+            return self.cost_function(self._class_scores(outcomes), self._encoder.data.labels[indices])
+        return super()._total_cost(outcomes, indices)
@@ -0,0 +1,110 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from numpy import arange, array, pi, random
+
+from nisqai.cost._network_costs import CrossEntropy, MulticlassCrossEntropy
+from nisqai.data._cdata import LabeledCData
+from nisqai.encode._binary_encoding import BinaryEncoding
+from nisqai.layer._product_ansatz import ProductAnsatz
+from nisqai.measure._measure import Measurement
+from nisqai.network._adaptive import AdaptiveShots
+from nisqai.network._multiclass import MulticlassNetwork
+from nisqai.simulate._statevector import StatevectorSimulator
+from nisqai.utils._profiler import Profiler
+
+
+def get_network(readout="qubits", **kwargs):
+    """Returns a three class network on the statevector simulator.
+
+    With the qubits readout, the class of each data point is the position of its one bit.
+    With the bitstrings readout, it is the integer value of its bits.
+    """
+    if readout == "qubits":
+        data = array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 1, 0], [1, 0, 0]])
+    else:
+        data = array([[0, 0], [0, 1], [1, 0], [0, 1], [0, 0]])
+    cdata = LabeledCData(data, labels=array([0, 1, 2, 1, 0]))
+    num_qubits = data.shape[1]
+    layers = [BinaryEncoding(cdata), ProductAnsatz(num_qubits, gate_depth=2),
+              Measurement(num_qubits, range(num_qubits))]
+    return MulticlassNetwork(layers, StatevectorSimulator(seed=1), readout=readout, **kwargs)
+
+
+class TestMulticlassNetwork(unittest.TestCase):
+    """Unit tests for MulticlassNetwork class."""
+
+    def test_predict(self):
+        """Tests that all classes are predicted from one execution per data point."""
+        for readout in ("qubits", "bitstrings"):
+            profiler = Profiler()
+            qnn = get_network(readout, profiler=profiler)
+            self.assertEqual(qnn.num_classes, 3)
+
+            # With angles [pi, 0] the measured bits are exactly the encoded bits
+            angles = [pi, 0.0] * qnn._encoder.num_qubits
+            self.assertEqual(list(qnn.predict_all(angles, shots=100)), [0, 1, 2, 1, 0])
+            self.assertEqual(profiler.timers["run"]["calls"], 5)
+            self.assertEqual(qnn.cost(angles, shots=100), 0.0)
+
+            scores = qnn.predict_scores(angles, shots=None)
+            self.assertEqual(scores.shape, (5, 3))
+            self.assertEqual(list(scores.argmax(axis=1)), [0, 1, 2, 1, 0])
+
+            # Feature vectors which are not in the data
+            features = [[0, 0, 1], [1, 0, 0]] if readout == "qubits" else [[1, 0], [0, 0]]
+            self.assertEqual(list(qnn.predict_stream(features, angles, shots=100)), [2, 0])
+
+    def test_cross_entropy(self):
+        """Tests the gradient of the cross entropy of the class scores and training with it."""
+        rng = random.default_rng(2)
+        for readout in ("qubits", "bitstrings"):
+            for batched in (False, True):
+                qnn = get_network(readout, batched=batched, cost_function=MulticlassCrossEntropy())
+                angles = rng.uniform(0, 2 * pi, len(qnn._ansatz.params.list_names()))
+                grad = qnn.gradient(angles, shots=None)
+
+                step = 1e-5
+                for ii in range(len(angles)):
+                    shift = step * (arange(len(angles)) == ii)
+                    numerical = (qnn.cost(angles + shift, shots=None) -
+                                 qnn.cost(angles - shift, shots=None)) / (2 * step)
+                    self.assertAlmostEqual(grad[ii], numerical, places=5)
+
+        qnn = get_network(cost_function=MulticlassCrossEntropy())
+        initial_angles = [2.0, 0.3] * 3
+        initial_cost = qnn.cost(initial_angles, shots=None)
+        res = qnn.train(initial_angles, trainer="adam", shots=None, maxiter=30, learning_rate=0.1)
+        self.assertLess(res.fun, initial_cost)
+
+    def test_invalid(self):
+        """Tests invalid readouts, cost functions, measurements and adaptive shots."""
+        with self.assertRaises(ValueError):
+            get_network("parity")
+        with self.assertRaises(TypeError):
+            get_network(cost_function=CrossEntropy())
+        with self.assertRaises(ValueError):
+            get_network(num_classes=4)
+
+        # Adaptive shots decide between two classes
+        qnn = get_network()
+        angles = [pi, 0.0] * 3
+        with self.assertRaises(ValueError):
+            qnn.cost(angles, adaptive=AdaptiveShots())
+        with self.assertRaises(ValueError):
+            qnn.train(angles, adaptive=AdaptiveShots(), maxiter=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
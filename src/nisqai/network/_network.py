@@ -10,24 +10,58 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from copy import copy
+from itertools import islice
+import threading
+
+from nisqai.cost._network_costs import Misclassification, class_probabilities
+from nisqai.encode._base_encoding import BaseEncoding
+from nisqai.layer._base_ansatz import BaseAnsatz
 from nisqai.measure import MeasurementOutcome
+from nisqai.network._bounds import CostLowerBound
+from nisqai.network._cache import LRUCache
+from nisqai.network._checkpoint import Checkpoint
+from nisqai.network._minibatch import MiniBatchSampler
+from nisqai.simulate._base_simulator import BaseSimulator, SimulatorExecutable
+from nisqai.simulate._statevector import StatevectorSimulator
+from nisqai.utils._engine_pool import ComputerDispatcher
+from nisqai.utils._random import spawn_generators
+
+from numpy import array, asarray, pi, tensordot, unique, zeros
+
+from pyquil import Program, get_qc
+from pyquil.api import QuantumComputer
+from pyquil.quilatom import MemoryReference
+from pyquil.quilbase import Declare
 
-from numpy import array
+# Gates of the form exp(-i angle P / 2), up to a global phase, for the parameter-shift rule
+SHIFT_RULE_GATES = ("RX", "RY", "RZ", "PHASE")
 
-from pyquil import get_qc
-from pyquil.api import QuantumComputer
+# Trainers which use the gradient of the cost
+GRADIENT_TRAINERS = ("adam", "sgd")
 
 # TODO: This should be updated to something like
 #  from nisqai.trainer import this_optimization_method
 #  for now this is just for simplicity
 # from scipy.optimize import minimize
 from nisqai.optimize import minimize
+from nisqai.optimize._minimize import NISQAI_METHODS
+
+
+# Prebuilt layers after the encoder. The circuits and their lengths identify the version of the layers.
+_SuffixTemplate = namedtuple(
+    "_SuffixTemplate", ["circuits", "version", "structure_hash", "defined_gates", "declares", "body"]
+)
 
 
 class Network:
     """Network class."""
 
-    def __init__(self, layers, computer, predictor=None):
+    def __init__(self, layers, computer, predictor=None, parametric=False, cache_size=128, batched=False,
+                 cost_function=None, profiler=None, deduplicate=False):
         """Initializes a network with the input layers.
 
         Args:
@@ -48,7 +82,8 @@ class Network:
                     (4) If network continues after measurement, an encoding ansatz
                         must follow a measurement ansatz.
 
-            computer : Union[str, pyquil.api.QuantumComputer]
+            computer : Union[str, pyquil.api.QuantumComputer, nisqai.utils.ComputerDispatcher,
+                             nisqai.simulate.BaseSimulator]
                 Specifies which computer to run the network on.
 
                 Examples:
@@ -56,9 +91,55 @@ class Network:
                     "1q-qvm"
                     "5q-qvm"
 
+                A ComputerDispatcher from an EnginePool spreads circuit executions
+                over several QVM servers. See nisqai.utils.EnginePool.
+
+                A NISQAI simulator, e.g. nisqai.simulate.StatevectorSimulator(),
+                runs the network locally with NumPy, without QVM or quilc.
+
             predictor : Callable
                 Function that inputs a bit string and outputs a label
                 (i.e., either 0 or 1) representing the class.
+
+            parametric : bool (default: False)
+                If True, the encoding gate parameters are declared as memory regions
+                so that the network is compiled once (for each number of shots) and
+                every data point is run by only swapping memory maps.
+
+                Requires an encoder derived from BaseEncoding which implements a
+                parametric circuit, e.g. DenseAngleEncoding or BinaryEncoding.
+
+            cache_size : Union[int, None] (default: 128)
+                Maximum number of compiled executables to keep in memory. The least
+                recently used executable is discarded when the cache is full.
+                If None, the cache is unbounded. If zero, nothing is cached.
+
+            batched : bool (default: False)
+                If True, all data points are simulated together: the encoded states are
+                computed once and stacked into an array, and each evaluation of the network
+                applies the unitary of the other layers to all of them in a single matrix
+                multiplication. Used by Network.propagate_all, predict_all and cost.
+
+                Requires a StatevectorSimulator as the computer and an encoder derived from
+                BaseEncoding which implements a parametric circuit.
+
+            cost_function : nisqai.cost.NetworkCost (default: None)
+                Cost function which inputs the outcomes and labels of a batch of data points
+                and returns their total cost, e.g. nisqai.cost.CrossEntropy() or
+                nisqai.cost.Hinge(). Defaults to nisqai.cost.Misclassification(), the number
+                of data points whose prediction is not their label. Costs of the class
+                probability (CrossEntropy, Hinge) require a measurement of a single qubit.
+
+            profiler : nisqai.utils.Profiler (default: None)
+                If given, the time spent building, compiling and running circuits, constructing
+                outcomes and predicting is recorded in the profiler. See nisqai.utils.Profiler.
+
+            deduplicate : bool (default: False)
+                If True, data points with identical feature vectors are propagated once and
+                share their outcome in Network.propagate_all, predict_all, cost and gradient.
+                Executions drop to the number of distinct feature vectors, e.g. the number of
+                distinct bit patterns of binary data. With a finite number of shots, duplicate
+                data points then share one sampled outcome instead of independent samples.
         """
         # TODO: check if ordering of layers is valid
 
@@ -72,7 +153,7 @@ class Network:
         # Store the computer backend
         if type(computer) == str:
             self.computer = get_qc(computer)
-        elif type(computer) == QuantumComputer:
+        elif type(computer) in (QuantumComputer, ComputerDispatcher) or isinstance(computer, BaseSimulator):
             self.computer = computer
         else:
             raise TypeError
@@ -83,6 +164,49 @@ class Network:
         # TODO: Make sure the predictor function is valid (returns 0 or 1)
         self.predictor = predictor
 
+        # Cost function of a batch of outcomes
+        self.cost_function = Misclassification() if cost_function is None else cost_function
+
+        # Instrumentation of the phases of propagating data points
+        self.profiler = profiler
+
+        # Template of all layers after the encoder, built when first needed. See Network._suffix.
+        self._suffix_template = None
+
+        # Cache of compiled executables. Compilation is serialized since
+        # the compiler client cannot be shared between threads.
+        self._cache = LRUCache(cache_size)
+        self._compile_lock = threading.Lock()
+
+        # Storage for the computer used by each worker thread
+        self._local = threading.local()
+
+        # Build the parametric network once, if requested
+        self.parametric = parametric
+        if self.parametric:
+            if not isinstance(self._encoder, BaseEncoding):
+                raise TypeError(
+                    "Parametric networks require an encoder derived from BaseEncoding."
+                )
+            self._template = self._build_parametric()
+            self._template_hash = self._structure_hash()
+
+        # Check the batched simulation can be used. The encoded states are computed when first needed.
+        self.batched = batched
+        self._batch_states = None
+        if self.batched:
+            if not isinstance(self.computer, StatevectorSimulator):
+                raise TypeError("Batched networks require a StatevectorSimulator.")
+            if not isinstance(self._encoder, BaseEncoding):
+                raise TypeError(
+                    "Batched networks require an encoder derived from BaseEncoding."
+                )
+
+        # Index of the first data point with the same feature vector as each data point,
+        # computed when first needed
+        self.deduplicate = deduplicate
+        self._representatives = None
+
     @property
     def data(self):
         """Returns the LabeledCData object of the network's encoder."""
@@ -93,13 +217,34 @@ class Network:
         # TODO: what about multicircuit networks?
         #  note 2/4/19: I think this could be handled with another class
 
-        # Grab the initial encoder circuit for the given index
-        circuit = self._encoder[data_ind]
+        with self._timer("build"):
+            # Grab the initial encoder circuit for the given index
+            encoder = self._encoder[data_ind]
+
+            # Splice the encoder circuit into the prebuilt template of all other layers.
+            # DEFGATEs and DECLAREs go first, as after BaseAnsatz.order().
+            # TODO: allow self.layers to take sublists
+            #  for example, [encoder, [layer1, layer2, layer3, ...], measure]
+            #  this could make it easier to build networks using, say, list comprehensions
+            suffix = self._suffix()
+            declares, body = [], []
+            for inst in encoder.circuit.instructions:
+                (declares if isinstance(inst, Declare) else body).append(inst)
+
+            program = Program()
+            program.inst(encoder.circuit.defined_gates, suffix.defined_gates, declares, suffix.declares,
+                         body, suffix.body)
+
+            circuit = BaseAnsatz(encoder.num_qubits)
+            circuit.circuit = program
+            return circuit
+
+    def _build_parametric(self):
+        """Builds the network as a single quantum circuit with a parametric encoding."""
+        # Grab the parametric encoder circuit
+        circuit = self._encoder.parametric_circuit()
 
         # Add all other layers
-        # TODO: allow self.layers to take sublists
-        #  for example, [encoder, [layer1, layer2, layer3, ...], measure]
-        #  this could make it easier to build networks using, say, list comprehensions
         for ii in range(1, len(self._layers)):
             circuit += self._layers[ii]
 
@@ -111,18 +256,219 @@ class Network:
         """Returns the compiled program for the data point
         indicated by the index.
 
+        Executables are cached by data point, shots, computer and the structure
+        of the layers after the encoder, so repeated calls only compile once.
+
         Args:
-            index : int
-                Index of data point.
+            index : Union[int, None]
+                Index of data point. Ignored for parametric networks, which
+                share the same executable for all data points. If None, the
+                network with a parametric encoding is compiled, which requires
+                an encoder derived from BaseEncoding (see Network.predict_stream).
 
             shots : int
                 Number of times to run the circuit.
         """
-        # Get the right program to compile. Note type(program) == BaseAnsatz.
-        program = self._build(index)
+        # Parametric networks are compiled once for each number of shots
+        if self.parametric:
+            index = None
+
+        with self._compile_lock:
+            # Return the cached executable if there is one
+            structure_hash = self._structure_hash()
+            key = (index, shots, self.computer.name, structure_hash)
+            executable = self._cache.get(key)
+            if executable is not None:
+                self._count("compile.hit")
+                return executable
+            self._count("compile.miss")
+
+            # Get the right program to compile. Note type(program) == BaseAnsatz.
+            if self.parametric:
+                # Rebuild the parametric network if a layer changed since it was built
+                if self._template_hash != structure_hash:
+                    self._template = self._build_parametric()
+                    self._template_hash = structure_hash
+                program = self._template
+            elif index is None:
+                program = self._build_parametric()
+            else:
+                program = self._build(index)
+
+            # Compile the program to the appropriate computer
+            with self._timer("compile"):
+                executable = program.compile(self._compile_target(), shots)
+            self._cache.put(key, executable)
+            return executable
+
+    def _timer(self, name):
+        """Returns a context manager which times the block in the profiler, if the network has one."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.timer(name)
+
+    def _count(self, name, n=1):
+        """Adds n to the counter with the given name in the profiler, if the network has one."""
+        if self.profiler is not None:
+            self.profiler.count(name, n)
+
+    def _predict(self, outcome):
+        """Returns the prediction of the predictor for the outcome, timed by the profiler."""
+        with self._timer("predict"):
+            return self.predictor(outcome)
+
+    def _structure_hash(self):
+        """Returns a hash of the circuits of all layers after the encoder.
+
+        Parameter values are stored in memory maps, not circuits, so the hash
+        only changes if the structure of the layers changes.
+        """
+        return self._suffix().structure_hash
 
-        # Compile the program to the appropriate computer
-        return program.compile(self.computer, shots)
+    def _suffix(self):
+        """Returns the prebuilt template of all layers after the encoder.
+
+        The template holds the DEFGATEs, DECLAREs and other instructions of the layers
+        and the hash of their circuits. It is rebuilt only if the circuit of a layer is
+        replaced or instructions are added to it. Call Network.rebuild after changing
+        instructions of a layer in place.
+        """
+        circuits = [self._layers[ii].circuit for ii in range(1, len(self._layers))]
+        version = [len(circuit) for circuit in circuits]
+
+        suffix = self._suffix_template
+        if (suffix is None or suffix.version != version or
+                any(old is not new for (old, new) in zip(suffix.circuits, circuits))):
+            program = Program()
+            for circuit in circuits:
+                program += circuit
+            suffix = _SuffixTemplate(
+                circuits=circuits,
+                version=version,
+                structure_hash=hash(tuple(circuit.out() for circuit in circuits)),
+                defined_gates=list(program.defined_gates),
+                declares=[inst for inst in program.instructions if isinstance(inst, Declare)],
+                body=[inst for inst in program.instructions if not isinstance(inst, Declare)]
+            )
+            self._suffix_template = suffix
+        return suffix
+
+    def rebuild(self):
+        """Rebuilds the template of the layers after the encoder on next use.
+
+        Only needed after instructions of a layer were changed in place, without
+        changing the number of instructions or replacing the circuit.
+        """
+        self._suffix_template = None
+
+    def clear_cache(self):
+        """Removes all compiled executables from the cache."""
+        self._cache.clear()
+
+    def cache_info(self):
+        """Returns a dictionary with the hits, misses, size and maxsize of the executable cache."""
+        return self._cache.info()
+
+    def _compile_target(self):
+        """Returns the quantum computer to compile programs for."""
+        # All computers of a dispatcher are identical (and share the quilc server of an
+        # EnginePool), so compile for the first one
+        if type(self.computer) == ComputerDispatcher:
+            return self.computer.computers[0]
+        return self.computer
+
+    def _thread_computer(self):
+        """Returns the computer to run programs on in the current thread.
+
+        A QuantumComputer stores the loaded program and its results in its QAM,
+        so each worker thread runs programs on a copy with its own QAM. A
+        ComputerDispatcher already gives each thread its own computer, and
+        simulators do not store any state between runs.
+        """
+        if (threading.current_thread() is threading.main_thread() or
+                type(self.computer) == ComputerDispatcher or
+                isinstance(self.computer, BaseSimulator)):
+            return self.computer
+
+        computer = getattr(self._local, "computer", None)
+        if computer is None:
+            computer = copy(self.computer)
+            computer.qam = copy(self.computer.qam)
+            self._local.computer = computer
+        return computer
+
+    def _map(self, function, indices, max_workers=None, sampled=False):
+        """Returns a list of function(index) for each index in indices.
+
+        If max_workers is greater than one, the calls are spread over a pool of
+        threads. Results are always returned in the same order as the indices.
+
+        If sampled is True and the computer is a simulator, each call samples with its own
+        child generator of the simulator's generator (see nisqai.utils.spawn_generators),
+        so the results do not depend on the number of workers or the order they finish in.
+        """
+        if sampled and isinstance(self.computer, BaseSimulator):
+            indices = list(indices)
+            jobs = list(zip(spawn_generators(self.computer.rng, len(indices)), indices))
+            return self._map(lambda job: self._with_rng(job[0], function, job[1]), jobs, max_workers)
+
+        if max_workers is None or max_workers <= 1:
+            return [function(ii) for ii in indices]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(function, indices))
+
+    def _with_rng(self, rng, function, index):
+        """Returns function(index), with simulator runs in the current thread sampling from rng."""
+        self._local.rng = rng
+        try:
+            return function(index)
+        finally:
+            self._local.rng = None
+
+    def _set_angles(self, angles):
+        """Updates the ansatz parameters in place if angles are given."""
+        if angles is not None:
+            self._ansatz.params.update_values(angles)
+
+    def _qubits(self):
+        """Returns the sorted qubit labels used by all layers of the network."""
+        qubits = set(self._encoder.parametric_circuit().circuit.get_qubits())
+        for ii in range(1, len(self._layers)):
+            qubits.update(self._layers[ii].circuit.get_qubits())
+        return sorted(qubits)
+
+    def _encoded_states(self):
+        """Returns the encoded states of all data points as an array of shape (num_data_points, 2, ..., 2).
+
+        The states only depend on the data, so they are simulated once and stored.
+        """
+        if self._batch_states is None:
+            self._batch_states = self._encode_states(
+                [self._encoder.memory_map(ii) for ii in range(self.num_data_points)]
+            )
+        return self._batch_states
+
+    def _encode_states(self, memory_maps):
+        """Returns the states encoded by the memory maps of the encoder, as an array of shape (len(memory_maps), 2, ..., 2)."""
+        prefix = SimulatorExecutable(self._encoder.parametric_circuit().circuit, self._qubits())
+
+        # Stack the memory maps. Each region has shape (size, number of memory maps).
+        batch_map = dict((name, array([m[name] for m in memory_maps]).T) for name in memory_maps[0])
+        return self.computer.batch_wavefunctions(prefix, batch_map, len(memory_maps))
+
+    def _suffix_executable(self):
+        """Returns the executable of all layers after the encoder for batched simulation."""
+        with self._compile_lock:
+            key = ("suffix", self.computer.name, self._structure_hash())
+            executable = self._cache.get(key)
+            if executable is None:
+                program = Program()
+                for ii in range(1, len(self._layers)):
+                    program += self._layers[ii].circuit
+                executable = SimulatorExecutable(program, self._qubits())
+                self._cache.put(key, executable)
+            return executable
 
     def propagate(self, index, angles=None, shots=1000):
         """Runs the network (propagates a data point) and returns the circuit result.
@@ -134,23 +480,130 @@ class Network:
             angles : Union[dict, list]
                 Angles for the unitary ansatz.
 
-            shots : int
-                Number of times to execute the circuit.
+            shots : Union[int, None]
+                Number of times to execute the circuit. If None, the outcome holds the
+                exact probabilities of all bit strings (see MeasurementOutcome.from_probabilities).
+                This requires a simulator backend.
         """
-        # Get the compiled executable instructions
-        executable = self.compile(index, shots)
-
         # Use the memory map from the ansatz parameters
         if angles is None:
             mem_map = self._ansatz.params.memory_map()
         else:
             mem_map = self._ansatz.params.update_values_memory_map(angles)
 
-        # Run the program and store the raw results
-        output = self.computer.run(executable, memory_map=mem_map)
+        return self._run(index, mem_map, shots)
+
+    def _run(self, index, mem_map, shots):
+        """Runs the network for the data point with the given memory map of the ansatz parameters."""
+        self._check_shots(shots)
+
+        # Get the compiled executable instructions. The number of shots
+        # is not used when computing exact probabilities.
+        executable = self.compile(index, 1 if shots is None else shots)
+
+        # Write the encoded data point into memory for parametric networks
+        if self.parametric:
+            mem_map = dict(mem_map, **self._encoder.memory_map(index))
+
+        return self._execute(executable, mem_map, shots)
+
+    def _check_shots(self, shots):
+        """Raises a ValueError if exact probabilities are requested from a computer which cannot compute them."""
+        if shots is None and not isinstance(self.computer, BaseSimulator):
+            raise ValueError("shots=None (exact probabilities) requires a simulator backend.")
+
+    def _execute(self, executable, mem_map, shots):
+        """Runs the compiled executable with the memory map and returns its MeasurementOutcome."""
+        self._count("propagate")
+
+        # Return the exact probabilities of the outcomes if requested
+        if shots is None:
+            with self._timer("run"):
+                probs = self.computer.probabilities(executable, memory_map=mem_map)
+            with self._timer("outcome"):
+                return MeasurementOutcome.from_probabilities(probs)
+
+        # Run the program and store the raw results, sampling from the generator of the job if it has one
+        rng = getattr(self._local, "rng", None)
+        with self._timer("run"):
+            if rng is not None:
+                output = self.computer.run(executable, memory_map=mem_map, rng=rng)
+            else:
+                output = self._thread_computer().run(executable, memory_map=mem_map)
 
         # Return a MeasurementOutcome of the results
-        return MeasurementOutcome(output)
+        with self._timer("outcome"):
+            return MeasurementOutcome(output)
+
+    def propagate_all(self, angles=None, shots=1000, max_workers=None, indices=None):
+        """Runs the network for all data points and returns a list of their MeasurementOutcomes.
+
+        Args:
+            angles : Union[dict, list]
+                Angles for the unitary ansatz.
+
+            shots : Union[int, None]
+                Number of times to execute the circuit for each data point.
+                If None, exact probabilities are used. See Network.propagate.
+
+            max_workers : int (default: None)
+                If greater than one, data points are propagated in a pool of this many threads.
+                Not used by batched networks, which simulate all data points at once.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points to propagate, in order. Defaults to all data points.
+        """
+        # Set the angles once so all workers share them
+        self._set_angles(angles)
+
+        if indices is None:
+            indices = range(self.num_data_points)
+        indices = [int(ii) for ii in indices]
+
+        # Propagate each distinct feature vector once and share its outcome
+        if self.deduplicate:
+            distinct, positions = self._distinct(indices)
+            if len(distinct) < len(indices):
+                outcomes = self._propagate_all(distinct, shots, max_workers)
+                return [outcomes[pos] for pos in positions]
+        return self._propagate_all(indices, shots, max_workers)
+
+    def _distinct(self, indices):
+        """Returns (distinct, positions) such that the data point indices[k] has the same
+        feature vector as the data point distinct[positions[k]].
+
+        Each group of identical feature vectors is represented by its first data point.
+        """
+        if self._representatives is None:
+            rows = self._encoder.data.data.reshape(self.num_data_points, -1)
+            _, first, inverse = unique(rows, axis=0, return_index=True, return_inverse=True)
+            self._representatives = first[inverse.ravel()]
+
+        distinct, positions = unique(self._representatives[indices], return_inverse=True)
+        self._count("deduplicated", len(indices) - len(distinct))
+        return [int(ii) for ii in distinct], positions.ravel()
+
+    def _propagate_all(self, indices, shots, max_workers):
+        """Returns the MeasurementOutcomes of the data points with the given indices. See Network.propagate_all."""
+        if not self.batched:
+            return self._map(lambda ii: self.propagate(ii, None, shots), indices, max_workers, shots is not None)
+
+        return self._batch_outcomes(
+            self._encoded_states()[list(indices)], self._ansatz.params.memory_map(), shots
+        )
+
+    def _batch_outcomes(self, states, mem_map, shots):
+        """Returns the MeasurementOutcomes of encoded states for batched networks.
+
+        The other layers are applied to all states at once, then all states are sampled at once.
+        """
+        self._count("propagate", len(states))
+        with self._timer("simulate"):
+            probs = self.computer.batch_probabilities(states, self._suffix_executable(), mem_map)
+        with self._timer("outcome"):
+            if shots is None:
+                return [MeasurementOutcome.from_probabilities(p) for p in probs]
+            return [MeasurementOutcome(bits) for bits in self.computer.sample_batch(probs, shots)]
 
     def predict(self, index, angles=None, shots=1000):
         """Returns the prediction of the data point corresponding to the index.
@@ -162,31 +615,123 @@ class Network:
             angles : Union[dict, list]
                 Angles for the unitary ansatz.
 
-            shots : int
+            shots : Union[int, None]
                 Number of times to execute the circuit.
+                If None, exact probabilities are used (simulators only).
         """
         # Propagate the network to get the outcome
         output = self.propagate(index, angles, shots)
 
         # Use the predictor function to get the prediction from the output
-        # TODO: NOTE: This is not compatible with classical costs such as cross entropy.
-        prediction = self.predictor(output)
+        prediction = self._predict(output)
 
         # Return the prediction
         return prediction
 
-    def predict_all(self, angles=None, shots=1000):
+    def predict_all(self, angles=None, shots=1000, max_workers=None):
         """Returns predictions for all data points.
 
         Args:
             angles : Untion[dict, list]
                 Angles for the unitary ansatz.
 
-            shots : int
+            shots : Union[int, None]
                 Number of times to execute the circuit for one prediction.
+                If None, exact probabilities are used (simulators only).
+
+            max_workers : int (default: None)
+                If greater than one, data points are propagated in a pool of this many threads
+                so that the latency of each circuit execution overlaps.
         """
+        # Set the angles once so all workers share them
+        self._set_angles(angles)
+
+        # Propagate all data points together for batched networks, and share
+        # the outcomes of identical feature vectors if deduplicating
+        if self.batched or self.deduplicate:
+            return array([self._predict(out) for out in self.propagate_all(None, shots, max_workers)])
+
         # Propagate the network to get the outcomes
-        return array([self.predict(ii, angles, shots) for ii in range(self.num_data_points)])
+        return array(self._map(
+            lambda ii: self.predict(ii, None, shots), range(self.num_data_points), max_workers, shots is not None
+        ))
+
+    def predict_stream(self, feature_vectors, angles=None, shots=1000, chunk_size=100, max_workers=None):
+        """Returns a generator of the predictions of a stream of feature vectors.
+
+        The feature vectors do not have to be in the data of the network. They are read in
+        chunks of chunk_size, and each chunk is encoded into memory maps of the parametric
+        encoding circuit, run, and predicted before the next chunk is read. Only one chunk
+        is held in memory at a time, and the network is compiled once for all chunks.
+
+        Requires an encoder derived from BaseEncoding which implements a parametric circuit.
+
+        Example usage:
+
+            >>> features = (numpy.fromstring(line, sep=",") for line in open("data.csv"))
+            >>> for prediction in qnn.predict_stream(features, chunk_size=500, max_workers=4):
+            >>>     ...
+
+        Args:
+            feature_vectors : Iterable[array-like]
+                Feature vectors to predict, e.g. a generator. Each has the same number of
+                features as the data of the network.
+
+            angles : Union[dict, list]
+                Angles for the unitary ansatz.
+
+            shots : Union[int, None]
+                Number of times to execute the circuit for one prediction.
+                If None, exact probabilities are used (simulators only).
+
+            chunk_size : int (default: 100)
+                Number of feature vectors to encode and run together.
+
+            max_workers : int (default: None)
+                If greater than one, the feature vectors of a chunk are run in a pool of this
+                many threads. Batched networks run each chunk as a single batch instead.
+        """
+        if not isinstance(self._encoder, BaseEncoding):
+            raise TypeError("Streaming prediction requires an encoder derived from BaseEncoding.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self._check_shots(shots)
+
+        # Fix the ansatz parameters for the whole stream
+        self._set_angles(angles)
+        mem_map = self._ansatz.params.memory_map()
+        return self._predict_stream(iter(feature_vectors), mem_map, shots, chunk_size, max_workers)
+
+    def _predict_stream(self, feature_vectors, mem_map, shots, chunk_size, max_workers):
+        """Yields the predictions of the feature vectors in chunks. See Network.predict_stream."""
+        while True:
+            chunk = list(islice(feature_vectors, chunk_size))
+            if not chunk:
+                return
+            for outcome in self._propagate_features(chunk, mem_map, shots, max_workers):
+                yield self._predict(outcome)
+
+    def _propagate_features(self, feature_vectors, mem_map, shots, max_workers):
+        """Returns the MeasurementOutcomes of feature vectors encoded with the parametric encoding circuit."""
+        # Propagate each distinct feature vector once and share its outcome
+        if self.deduplicate:
+            rows = array(feature_vectors)
+            distinct, positions = unique(rows.reshape(len(rows), -1), axis=0, return_inverse=True)
+            if len(distinct) < len(rows):
+                self._count("deduplicated", len(rows) - len(distinct))
+                outcomes = self._propagate_features(distinct.reshape((-1,) + rows.shape[1:]), mem_map, shots,
+                                                    max_workers)
+                return [outcomes[pos] for pos in positions.ravel()]
+
+        maps = [self._encoder.feature_memory_map(vector) for vector in feature_vectors]
+        if self.batched:
+            return self._batch_outcomes(self._encode_states(maps), mem_map, shots)
+
+        executable = self.compile(None, 1 if shots is None else shots)
+        return self._map(
+            lambda encoded: self._execute(executable, dict(mem_map, **encoded), shots), maps, max_workers,
+            shots is not None
+        )
 
     def cost_of_point(self, index, angles=None, shots=1000):
         """Returns the cost of a particular data point.
@@ -198,43 +743,223 @@ class Network:
             angles : Union(dict, list)
                 Angles for the unitary ansatz.
 
-            shots : int
+            shots : Union[int, None]
                 Number of times to execute the circuit.
+                If None, exact probabilities are used (simulators only).
         """
-        # Get the network's prediction of the data point
-        prediction = self.predict(index, angles, shots)
+        # Propagate the data point and evaluate the cost function on its outcome
+        outcome = self.propagate(index, angles, shots)
+        return self._total_cost([outcome], [index])
 
-        # Get the actual label of the data point
-        label = self._encoder.data.labels[index]
-
-        # TODO: Generalize to arbitrary cost functions.
-        #  Input a cost function into the Network, then use this.
-        return int(prediction != label)
-
-    def cost(self, angles, shots=1000):
+    def cost(self, angles, shots=1000, max_workers=None, indices=None, adaptive=None, bound=None):
         """Returns the total cost of the network at the given angles.
 
         Args:
             angles : Union(dict, list)
                 Angles for the unitary ansatz.
 
-            shots : int
+            shots : Union[int, None]
                 Number of times to execute the circuit.
+                If None, exact probabilities are used (simulators only).
+
+            max_workers : int (default: None)
+                If greater than one, data points are propagated in a pool of this many threads
+                so that the latency of each circuit execution overlaps.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points to evaluate the cost on, e.g. a mini-batch.
+                Defaults to all data points.
+
+            adaptive : nisqai.network.AdaptiveShots (default: None)
+                If given, shots are allocated adaptively: each data point starts with a few
+                shots, and only data points whose prediction is uncertain get more.
+                The shots argument is not used. Requires a network which measures one bit.
+
+            bound : float (default: None)
+                If given, data points are evaluated in order (in chunks of max_workers when
+                running in threads) and the evaluation stops as soon as the costs so far prove
+                that the total cost is above the bound. A CostLowerBound, strictly above the
+                bound, is then returned.
+                Batched and adaptive evaluations always evaluate all data points.
+
+        Returns : Union[float, nisqai.network.CostLowerBound]
+            Total cost of the network, normalized by the number of data points evaluated,
+            or a lower bound of it if the evaluation stopped early.
+        """
+        # Set the angles once so all workers share them
+        self._set_angles(angles)
+
+        if indices is None:
+            indices = range(self.num_data_points)
+        indices = [int(ii) for ii in indices]
+
+        # Get the outcome of each data point, in order
+        if adaptive is not None:
+            outcomes = adaptive.outcomes(self, indices, max_workers)
+        elif bound is not None and not self.batched:
+            return self._bounded_cost(indices, shots, max_workers, bound)
+        else:
+            outcomes = self.propagate_all(None, shots, max_workers, indices)
+
+        # Evaluate the cost function on all outcomes at once and normalize.
+        # Outcomes are in index order, so the value does not depend on the
+        # order in which workers finish.
+        return self._total_cost(outcomes, indices) / len(indices)
+
+    def _total_cost(self, outcomes, indices):
+        """Returns the total cost of the outcomes of the data points with the given indices."""
+        return self.cost_function(outcomes, self._encoder.data.labels[indices], self._cost_predictor())
+
+    def _cost_predictor(self):
+        """Returns the predictor to give the cost function, timed if the network has a profiler."""
+        if self.profiler is None or self.predictor is None:
+            return self.predictor
+        return self._predict
+
+    def _bounded_cost(self, indices, shots, max_workers, bound):
+        """Returns the cost of the data points, or a CostLowerBound once the cost is proven to be above bound.
+
+        The cost of each data point is non-negative, so the sum of the costs evaluated
+        so far divided by the number of data points is a lower bound of the total cost.
+        The evaluation only stops when this lower bound is strictly above the bound, so
+        an optimizer never sees a tie with the bound for a point which may be worse.
+        """
+        chunk = max(1, max_workers or 1)
+        total = 0.0
+        for start in range(0, len(indices), chunk):
+            outcomes = self.propagate_all(None, shots, max_workers, indices[start:start + chunk])
+            total += self._total_cost(outcomes, indices[start:start + chunk])
+
+            # Stop if the remaining data points cannot bring the cost below the bound
+            evaluated = min(start + chunk, len(indices))
+            if total / len(indices) > bound and evaluated < len(indices):
+                return CostLowerBound(total / len(indices), evaluated)
+        return total / len(indices)
+
+    def _shift_rule_positions(self):
+        """Returns {parameter name: position in the list of angles} for the ansatz parameters used in the circuit.
+
+        The parameter-shift rule requires each parameter to be the angle of a single
+        rotation gate exp(-i angle P / 2), i.e. RX, RY, RZ or PHASE (up to a global phase).
+        """
+        positions = dict((name, ii) for (ii, name) in enumerate(self._ansatz.params.list_names()))
 
-        Returns : float
-            Total cost of the network.
+        used = set()
+        for ii in range(1, len(self._layers)):
+            for inst in self._layers[ii].circuit.instructions:
+                for param in getattr(inst, "params", []):
+                    if not (isinstance(param, MemoryReference) and param.name in positions):
+                        continue
+                    if inst.name not in SHIFT_RULE_GATES or inst.modifiers:
+                        raise ValueError(
+                            "Parameter {} is used in a {} gate. The parameter-shift rule requires "
+                            "{} gates.".format(param.name, inst.name, ", ".join(SHIFT_RULE_GATES))
+                        )
+                    if param.name in used:
+                        raise ValueError(
+                            "Parameter {} is used in more than one gate.".format(param.name)
+                        )
+                    used.add(param.name)
+        return dict((name, positions[name]) for name in sorted(used, key=positions.get))
+
+    def _class_probabilities(self, memory_maps, indices, shots, max_workers):
+        """Returns the class probabilities of the data points for each memory map of the ansatz parameters.
+
+        Returns:
+            Array of shape (len(memory_maps), len(indices)), followed by the axis of the
+            classes for multiclass networks. See Network._class_scores.
+        """
+        # Evaluate each distinct feature vector once and share its class probabilities
+        if self.deduplicate:
+            distinct, positions = self._distinct(indices)
+            if len(distinct) < len(indices):
+                return self._class_probabilities(memory_maps, distinct, shots, max_workers)[:, positions]
+
+        if self.batched:
+            states = self._encoded_states()[indices]
+            suffix = self._suffix_executable()
+            rows = []
+            for mem_map in memory_maps:
+                with self._timer("simulate"):
+                    probs = self.computer.batch_probabilities(states, suffix, mem_map)
+                if shots is not None:
+                    probs = [MeasurementOutcome(bits) for bits in self.computer.sample_batch(probs, shots)]
+                rows.append(self._class_scores(probs))
+            return array(rows)
+
+        # Submit the runs of all memory maps and data points at once
+        jobs = [(mem_map, ii) for mem_map in memory_maps for ii in indices]
+        outcomes = self._map(lambda job: self._run(job[1], job[0], shots), jobs, max_workers, shots is not None)
+        scores = self._class_scores(outcomes)
+        return scores.reshape((len(memory_maps), len(indices)) + scores.shape[1:])
+
+    def _class_scores(self, outcomes):
+        """Returns the values of the outcomes which the cost function is differentiated with respect to.
+
+        These are the class probabilities of binary networks. See nisqai.cost.class_probabilities.
         """
-        # Variable to store the cost
-        val = 0.0
+        return class_probabilities(outcomes)
+
+    def gradient(self, angles=None, shots=None, max_workers=None, indices=None):
+        """Returns the gradient of the cost with respect to the angles of the ansatz.
+
+        The derivative of the class probability of each data point with respect to an
+        angle is computed by the parameter-shift rule,
 
-        # Add the cost for each data point
-        for ii in range(self.num_data_points):
-            val += self.cost_of_point(ii, angles, shots)
+            dp / d angle = [p(angle + pi / 2) - p(angle - pi / 2)] / 2,
 
-        # Return the total normalized cost
-        return val / self.num_data_points
+        and combined with the derivative of the cost function with respect to the class
+        probabilities. All shifted memory maps are run against the same compiled executable
+        in one batch (one matrix multiplication each for batched networks).
 
-    def train(self, initial_angles, trainer="COBYLA", updates=False, shots=1000, **kwargs):
+        Requires a differentiable cost function, e.g. nisqai.cost.CrossEntropy, and an
+        ansatz whose parameters are each the angle of one rotation gate, e.g. ProductAnsatz,
+        MeraAnsatz or AlternatingAnsatz.
+
+        Args:
+            angles : Union[dict, list]
+                Angles for the unitary ansatz.
+
+            shots : Union[int, None] (default: None)
+                Number of times to execute each circuit. If None, exact probabilities are used.
+
+            max_workers : int (default: None)
+                If greater than one, circuits are run in a pool of this many threads.
+
+            indices : Iterable[int] (default: None)
+                Indices of the data points, e.g. a mini-batch. Defaults to all data points.
+
+        Returns : numpy.ndarray
+            Gradient in the order of the list of angles. Angles which are not used
+            in the circuit have zero derivative.
+        """
+        self._set_angles(angles)
+        if indices is None:
+            indices = range(self.num_data_points)
+        indices = [int(ii) for ii in indices]
+
+        # Memory maps with each parameter shifted up and down
+        positions = self._shift_rule_positions()
+        base = self._ansatz.params.memory_map()
+        memory_maps = [base]
+        for name in positions:
+            for shift in (pi / 2, -pi / 2):
+                memory_maps.append(dict(base, **{name: [base[name][0] + shift]}))
+
+        probs = self._class_probabilities(memory_maps, indices, shots, max_workers)
+
+        # Chain rule: d cost / d angle = sum over data points of d cost / dp * dp / d angle
+        dcost = self.cost_function.gradient(probs[0], self._encoder.data.labels[indices])
+        dprobs = (probs[1::2] - probs[2::2]) / 2
+
+        grad = zeros(len(self._ansatz.params.list_names()))
+        grad[list(positions.values())] = tensordot(dprobs, dcost, axes=dcost.ndim) / len(indices)
+        return grad
+
+    def train(self, initial_angles, trainer="COBYLA", updates=False, shots=1000, max_workers=None,
+              batch_size=None, sampling="shuffle", reshuffle=True, seed=None, adaptive=None,
+              early_abort=False, memo=None, jac=None, checkpoint=None, checkpoint_every=1, resume=None,
+              profile_callback=None, **kwargs):
         """Adjusts the parameters in the Network to minimize the cost.
 
         Args:
@@ -247,8 +972,71 @@ class Network:
             updates : bool (default: False)
                 If True, cost value at each iteration is printed to the console.
 
-            shots : int (default: 1000)
+            shots : Union[int, None] (default: 1000)
                 Number of times to run a single circuit.
+                If None, exact probabilities are used (simulators only).
+
+            max_workers : int (default: None)
+                Number of threads used to propagate data points when computing the cost.
+                See Network.cost.
+
+            batch_size : int (default: None)
+                If given, each evaluation of the objective computes the cost on a random
+                mini-batch of this many data points instead of on all data points.
+                See nisqai.network.MiniBatchSampler.
+
+            sampling : str (default: "shuffle")
+                How mini-batches are drawn, either "shuffle" (every data point once per epoch)
+                or "random" (independent batches). Only used if batch_size is given.
+
+            reshuffle : bool (default: True)
+                If True, the data points are shuffled again at the start of each epoch.
+                Only used if batch_size is given and sampling is "shuffle".
+
+            seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator] (default: None)
+                Seed for drawing mini-batches.
+
+            adaptive : nisqai.network.AdaptiveShots (default: None)
+                Adaptive shot allocation for each cost evaluation. See Network.cost.
+
+            early_abort : bool (default: False)
+                If True, each cost evaluation stops once it is proven to be worse than the
+                lowest cost found so far, and the optimizer gets a lower bound of the cost.
+                The result holds the best fully evaluated angles and their cost.
+                Requires evaluating the cost on all data points, i.e. batch_size=None.
+
+            memo : nisqai.network.CostMemo (default: None)
+                If given, cost values are stored by angle vector (and mini-batch), and
+                angles which were evaluated before are not evaluated again. Requires exact
+                probabilities (shots=None) unless the memo allows sampled costs.
+                Statistics are available from memo.info().
+
+            jac : bool (default: None)
+                If True, the trainer is given the parameter-shift gradient of the cost
+                (see Network.gradient). The cost and the gradient at the same angles are
+                evaluated on the same mini-batch.
+                Defaults to True for the gradient based trainers "adam" and "sgd".
+
+            checkpoint : str (default: None)
+                If given, a nisqai.network.Checkpoint is written to this path at the end of
+                optimizer iterations, holding the angles, optimizer state, random number
+                generator states and the cost of every evaluation so far.
+
+            checkpoint_every : int (default: 1)
+                Number of optimizer iterations between checkpoints.
+
+            resume : str (default: None)
+                Path of a checkpoint to continue from, written by a run with the same
+                trainer, network and arguments. The initial angles are replaced by the
+                checkpointed angles. The NISQAI trainers ("bounded_Powell", "adam", "sgd")
+                continue with their saved state and count the saved iterations and function
+                evaluations towards their limits. Other trainers restart from the angles.
+
+            profile_callback : Callable (default: None)
+                Function called with Profiler.stats() of the network's profiler after every
+                evaluation of the objective, e.g. to stream timings to a log. Requires the
+                network to have a profiler. The final statistics are also stored in the
+                profile attribute of the result, and printed if updates is True.
 
         kwargs: 
             Keyword arguments sent into the `options` argument in the
@@ -259,15 +1047,128 @@ class Network:
                 >>>                          method="Powell", options=dict(maxfev=100))
             This is consistent with how scipy.optimize.minimize is formatted.
         """
+        if early_abort and batch_size is not None:
+            raise ValueError("early_abort compares costs on all data points and cannot be used with batch_size.")
+
+        if profile_callback is not None and self.profiler is None:
+            raise ValueError("profile_callback requires a network with a profiler.")
+
+        if memo is not None and (shots is not None or adaptive is not None) and not memo.allow_sampled:
+            raise ValueError(
+                "Sampled costs are not deterministic. Use shots=None or CostMemo(allow_sampled=True)."
+            )
+
+        trainer_name = trainer if isinstance(trainer, str) else getattr(trainer, "__name__", str(trainer))
+        nisqai_trainer = isinstance(trainer, str) and trainer in NISQAI_METHODS
+
+        # Continue from a checkpoint, if given
+        restored = None
+        if resume is not None:
+            restored = Checkpoint.load(resume)
+            if restored.trainer != trainer_name:
+                raise ValueError(
+                    "The checkpoint was written by trainer {}, not {}.".format(restored.trainer, trainer_name)
+                )
+            initial_angles = restored.angles
+            if nisqai_trainer and restored.optimizer_state:
+                kwargs["state"] = restored.optimizer_state
+
+        # Cost of every evaluation of the objective
+        history = [] if restored is None else list(restored.history)
+
+        # Lowest cost found so far, used as the bound for early aborts, and the angles it was found at
+        best = [None if restored is None else restored.best_cost]
+        best_angles = [None]
+
+        # Draw mini-batches of data points, if requested
+        sampler = None
+        if batch_size is not None:
+            sampler = MiniBatchSampler(self.num_data_points, batch_size, sampling, reshuffle, seed)
+            if restored is not None and "sampler" in restored.rng_state:
+                sampler.set_state(restored.rng_state["sampler"])
+        if restored is not None and "simulator" in restored.rng_state and isinstance(self.computer, BaseSimulator):
+            self.computer.rng.bit_generator.state = restored.rng_state["simulator"]
+
+        # Mini-batch of the last angles, so the cost and the gradient at the same angles use the same batch
+        last_batch = [None, None]
+
+        def batch(angles):
+            if sampler is None:
+                return None
+            key = tuple(asarray(angles, dtype=float).ravel())
+            if last_batch[0] != key:
+                last_batch[:] = [key, sampler.next()]
+            return last_batch[1]
+
         # Define the objective function
         def obj(angles):
-            val = self.cost(angles=angles, shots=shots)
+            indices = batch(angles)
+            bound = best[0] if early_abort else None
+
+            def evaluate(angles):
+                return self.cost(angles=angles, shots=shots, max_workers=max_workers, indices=indices,
+                                 adaptive=adaptive, bound=bound)
+
+            # A stored lower bound stays valid since the best cost never increases
+            with self._timer("train.cost"):
+                val = evaluate(angles) if memo is None else memo.evaluate(evaluate, angles, indices)
+            if profile_callback is not None:
+                profile_callback(self.profiler.stats())
+            if not isinstance(val, CostLowerBound) and (best[0] is None or val < best[0]):
+                best[0] = val
+                best_angles[0] = array(angles, dtype=float)
+            history.append(val)
             if updates:
                 print("Current cost: %0.2f" % val)
             return val
 
-        # Call the trainer
-        res = minimize(obj, initial_angles, method=trainer, options=kwargs)
+        extra = {}
+
+        # Write checkpoints at the end of optimizer iterations
+        if checkpoint is not None:
+            iteration = [0 if restored is None else restored.iteration]
+
+            def save(angles, optimizer_state=None):
+                iteration[0] += 1
+                if iteration[0] % checkpoint_every:
+                    return
+                rng_state = {}
+                if sampler is not None:
+                    rng_state["sampler"] = sampler.get_state()
+                if isinstance(self.computer, BaseSimulator):
+                    rng_state["simulator"] = self.computer.rng.bit_generator.state
+                Checkpoint(trainer_name, angles, history, iteration[0], optimizer_state, rng_state).save(checkpoint)
+
+            if nisqai_trainer:
+                kwargs["state_callback"] = save
+            else:
+                extra["callback"] = save
+
+        # Gradient of the objective for gradient based trainers
+        if jac is None:
+            jac = trainer in GRADIENT_TRAINERS
+        if jac:
+            def gradient(angles):
+                indices = batch(angles)
+                with self._timer("train.gradient"):
+                    return self.gradient(angles, shots=shots, max_workers=max_workers, indices=indices)
+
+            extra["jac"] = gradient
+
+        res = minimize(obj, initial_angles, method=trainer, options=kwargs, **extra)
+
+        # Lower bounds are not costs of the angles, so report the best fully evaluated angles
+        if early_abort and best_angles[0] is not None:
+            res.x = best_angles[0]
+            res.fun = float(best[0])
+
+        if updates and memo is not None:
+            print("Memoized cost evaluations: {hits} hits, {misses} misses".format(**memo.info()))
+
+        if self.profiler is not None:
+            res.profile = self.profiler.stats()
+            if updates:
+                print(self.profiler.report())
 
         # TODO: Define a NISQAI standard output for trainer results
         return res
@@ -10,22 +10,35 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from numpy import array
+from numpy import allclose, arange, array, pi, random
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from pyquil import Program, get_qc
+from pyquil.gates import X
 from pyquil.api import QuantumComputer
 
 from nisqai.layer._base_ansatz import BaseAnsatz
+from nisqai.network._bounds import CostLowerBound
+from nisqai.network._checkpoint import Checkpoint
+from nisqai.network._memo import CostMemo
 from nisqai.network._network import Network
+from nisqai.cost._network_costs import CrossEntropy, Hinge
 from nisqai.data._cdata import random_data, CData, LabeledCData
 from nisqai.encode._dense_angle_encoding import DenseAngleEncoding
 from nisqai.encode._binary_encoding import BinaryEncoding
 from nisqai.layer._product_ansatz import ProductAnsatz
 from nisqai.measure._measure import Measurement
+from nisqai.measure._predictors import split_predictor
 from nisqai.encode._encoders import angle_simple_linear
 from nisqai.encode._feature_maps import nearest_neighbor
+from nisqai.simulate._base_simulator import BaseSimulator
+from nisqai.simulate._density_matrix import DensityMatrixSimulator
+from nisqai.simulate._statevector import StatevectorSimulator
+from nisqai.utils._profiler import Profiler
 
 
 class TestNetwork(unittest.TestCase):
@@ -86,6 +99,25 @@ class TestNetwork(unittest.TestCase):
         # Checks
         self.assertEqual(type(net0), BaseAnsatz)
 
+    def test_build_template(self):
+        """Tests that splicing the prebuilt template gives the concatenated and ordered program."""
+        qnn = self.get_simulator_network()
+        for index in range(qnn.num_data_points):
+            expected = qnn._encoder[index] + qnn._ansatz + qnn._measurement
+            expected.order()
+            self.assertEqual(qnn._build(index).circuit.out(), expected.circuit.out())
+
+        # The template is only rebuilt when a layer changes
+        template = qnn._suffix()
+        self.assertIs(qnn._suffix(), template)
+        structure = qnn._structure_hash()
+        qnn._ansatz.circuit.inst(X(0))
+        self.assertNotEqual(qnn._structure_hash(), structure)
+        self.assertIn("X 0", qnn._build(0).circuit.out())
+
+        qnn.rebuild()
+        self.assertIsNot(qnn._suffix(), template)
+
     def test_get_item(self):
         """Tests getting the correct circuit."""
         # Get network components
@@ -266,6 +298,483 @@ class TestNetwork(unittest.TestCase):
 
         print(res)
 
+    def test_parametric_compile_once(self):
+        """Tests that a parametric network compiles one executable for all data points."""
+        # Get components for the network
+        data = array([[1, 0], [0, 1]])
+        cdata = LabeledCData(data, labels=array([0, 1]))
+        encoder = BinaryEncoding(cdata)
+        ansatz = ProductAnsatz(2)
+        measure = Measurement(2, [0, 1])
+
+        # Build the network
+        qnn = Network([encoder, ansatz, measure], "2q-qvm", parametric=True)
+
+        # Make sure the same executable is used for every data point
+        self.assertIs(qnn.compile(0, shots=10), qnn.compile(1, shots=10))
+
+        # Make sure the encoded data point is propagated. With all angles zero the
+        # ansatz is (RX(pi/2) RZ(0))^3 = RX(3pi/2), so both outcomes are possible,
+        # but the outcome shape must match the measurement.
+        out = qnn.propagate(1, shots=10)
+        self.assertEqual(out.shots, 10)
+        self.assertEqual(out.num_qubits, 2)
+
+    def test_executable_cache(self):
+        """Tests that compiled executables are cached and reused."""
+        # Get a network
+        qnn = self.get_test_network("1q-qvm")
+
+        # Compile the same data point twice and a different one once
+        executable = qnn.compile(index=0, shots=10)
+        self.assertIs(qnn.compile(index=0, shots=10), executable)
+        qnn.compile(index=1, shots=10)
+
+        # Check the cache statistics
+        info = qnn.cache_info()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["size"], 2)
+
+        # Clear the cache
+        qnn.clear_cache()
+        self.assertEqual(qnn.cache_info()["size"], 0)
+
+    def test_parallel_cost_and_predict_all(self):
+        """Tests that propagating data points in a thread pool gives the same results as in serial."""
+        # Get components for the network
+        data = array([[1, 0], [0, 1], [1, 1], [0, 0]])
+        cdata = LabeledCData(data, labels=array([1, 0, 1, 0]))
+        encoder = BinaryEncoding(cdata)
+        ansatz = ProductAnsatz(2, gate_depth=2)
+        measure = Measurement(2, [0, 1])
+
+        # Predict the label from the first measured bit
+        def predictor(outcome):
+            return int(outcome.average()[0] > 0.5)
+
+        # Build the network
+        qnn = Network([encoder, ansatz, measure], "2q-qvm", predictor=predictor)
+
+        # With angles [pi, 0] on each qubit the measured bits are the encoded bits,
+        # so each data point has its own prediction
+        angles = [pi, 0.0, pi, 0.0]
+        serial = list(qnn.predict_all(angles, shots=10))
+        self.assertEqual(serial, [1, 0, 1, 0])
+        for max_workers in (2, 4):
+            parallel = list(qnn.predict_all(angles, shots=10, max_workers=max_workers))
+            for (ii, prediction) in enumerate(parallel):
+                self.assertEqual(prediction, serial[ii])
+            self.assertEqual(qnn.cost(angles, shots=10, max_workers=max_workers), qnn.cost(angles, shots=10))
+
+    @staticmethod
+    def get_simulator_network(parametric=False, measured=(0, 1)):
+        """Returns a network on the statevector simulator which predicts the first bit of each data point.
+
+        Networks with cost functions of the class probability must measure only the first qubit, measured=[0].
+        """
+        data = array([[1, 0], [0, 1], [1, 1], [0, 0]])
+        cdata = LabeledCData(data, labels=array([1, 0, 1, 0]))
+        encoder = BinaryEncoding(cdata)
+        ansatz = ProductAnsatz(2, gate_depth=2)
+        measure = Measurement(2, list(measured))
+
+        # Predict the label from the first measured bit
+        def predictor(outcome):
+            return int(outcome.average()[0] > 0.5)
+
+        return Network([encoder, ansatz, measure], StatevectorSimulator(seed=1),
+                       predictor=predictor, parametric=parametric)
+
+    def test_simulator(self):
+        """Tests running a network on the statevector simulator."""
+        # With angles [pi, 0] the ansatz on each qubit is Z up to a phase,
+        # so the measured bits are exactly the encoded bits
+        angles = [pi, 0.0, pi, 0.0]
+        for parametric in (False, True):
+            qnn = self.get_simulator_network(parametric)
+            self.assertEqual(qnn.cost(angles, shots=20), 0.0)
+            self.assertEqual(list(qnn.predict_all(angles, shots=20, max_workers=2)), [1, 0, 1, 0])
+
+    def test_parametric_layer_change(self):
+        """Tests that a parametric network is rebuilt after instructions are added to a layer."""
+        qnn = self.get_simulator_network(parametric=True)
+        angles = [0.3, 1.2, -0.4, 2.0]
+        before = qnn.propagate(0, angles, shots=None).probabilities()
+
+        qnn._layers[1].circuit.inst(X(0))
+        after = qnn.propagate(0, angles, shots=None).probabilities()
+        fresh = Network(qnn._layers, StatevectorSimulator(), parametric=True).propagate(0, angles, shots=None)
+        self.assertFalse(allclose(before, after))
+        self.assertTrue(allclose(after, fresh.probabilities()))
+
+    def test_exact_probabilities(self):
+        """Tests propagating data points with exact probabilities instead of samples."""
+        qnn = self.get_simulator_network()
+
+        # With angles [pi / 2, 0] the first qubit is measured as one with probability
+        # one half, independent of the encoded bit
+        angles = [pi / 2, 0.0, pi, 0.0]
+        out = qnn.propagate(1, angles, shots=None)
+        self.assertTrue(out.is_exact)
+        self.assertAlmostEqual(out.average()[0], 0.5)
+        self.assertAlmostEqual(out.average()[1], 1.0)
+
+        # Batched networks give the same probabilities
+        batched = Network(qnn._layers, StatevectorSimulator(), predictor=qnn.predictor, batched=True)
+        self.assertTrue(allclose(batched.propagate_all(angles, shots=None)[1].probabilities(),
+                                 out.probabilities()))
+
+        # The cost is exact, so it does not change between evaluations
+        self.assertEqual(qnn.cost([pi, 0.0, pi, 0.0], shots=None), 0.0)
+
+    def test_mini_batch_training(self):
+        """Tests evaluating the cost on mini-batches of data points."""
+        qnn = self.get_simulator_network()
+
+        # Relabel the third data point so that it is the only misclassified one
+        cdata = LabeledCData(qnn.data.data, labels=array([1, 0, 0, 0]))
+        layers = [BinaryEncoding(cdata)] + qnn._layers[1:]
+        qnn = Network(layers, StatevectorSimulator(), predictor=qnn.predictor)
+        batched = Network(layers, StatevectorSimulator(), predictor=qnn.predictor, batched=True)
+
+        angles = [pi, 0.0, pi, 0.0]
+        for network in (qnn, batched):
+            self.assertEqual(network.cost(angles, shots=None), 0.25)
+            self.assertEqual(network.cost(angles, shots=None, indices=[0, 2]), 0.5)
+            self.assertEqual(network.cost(angles, shots=None, indices=[1, 3]), 0.0)
+            self.assertEqual(network.cost(angles, shots=None, indices=[2]), 1.0)
+
+        # Training on mini-batches is reproducible for the same seed
+        results = [batched.train([pi / 2, 0.0, pi, 0.0], shots=None, batch_size=2, seed=5, maxiter=10)
+                   for _ in range(2)]
+        self.assertTrue(allclose(results[0].x, results[1].x))
+
+    def test_mini_batch_gradient(self):
+        """Tests that the cost and the gradient at the same angles are evaluated on the same mini-batch."""
+        layers = self.get_simulator_network(measured=[0])._layers
+        qnn = Network(layers, StatevectorSimulator(), cost_function=CrossEntropy())
+        calls = {"cost": [], "gradient": []}
+        for name in calls:
+            def record(angles, *args, method=getattr(qnn, name), calls=calls[name], **kwargs):
+                calls.append((tuple(angles), tuple(kwargs["indices"])))
+                return method(angles, *args, **kwargs)
+            setattr(qnn, name, record)
+
+        qnn.train([0.3, 1.2, -0.4, 2.0], trainer="BFGS", jac=True, shots=None, batch_size=2, seed=1, maxiter=3)
+        batches = dict(calls["cost"])
+        shared = [angles for (angles, _) in calls["gradient"] if angles in batches]
+        self.assertGreater(len(shared), 0)
+        for (angles, indices) in calls["gradient"]:
+            if angles in batches:
+                self.assertEqual(indices, batches[angles])
+
+    def test_early_abort(self):
+        """Tests stopping a cost evaluation once it cannot beat a bound."""
+        qnn = self.get_simulator_network()
+
+        # With angles [0, 0] the first qubit is flipped, so every data point is misclassified
+        bad = [0.0, 0.0, pi, 0.0]
+        self.assertEqual(qnn.cost(bad, shots=None), 1.0)
+
+        # The evaluation stops once the cost is strictly above the bound
+        cost = qnn.cost(bad, shots=None, bound=0.5)
+        self.assertIsInstance(cost, CostLowerBound)
+        self.assertEqual(cost, 0.75)
+        self.assertEqual(cost.num_evaluated, 3)
+
+        # Data points are evaluated in chunks when running in threads
+        cost = qnn.cost(bad, shots=None, bound=0.5, max_workers=3)
+        self.assertEqual(cost.num_evaluated, 3)
+
+        # Costs below the bound are exact
+        cost = qnn.cost([pi, 0.0, pi, 0.0], shots=None, bound=0.5)
+        self.assertNotIsInstance(cost, CostLowerBound)
+        self.assertEqual(cost, 0.0)
+
+        # Training with early aborts
+        res = qnn.train([pi, 0.0, pi, 0.0], shots=None, early_abort=True, maxiter=10)
+        self.assertEqual(res.fun, 0.0)
+        with self.assertRaises(ValueError):
+            qnn.train([pi, 0.0, pi, 0.0], shots=None, early_abort=True, batch_size=2)
+
+    def test_early_abort_result(self):
+        """Tests that training with early aborts reports the cost of the returned angles."""
+        rng = random.default_rng(4)
+        cdata = LabeledCData(rng.random((12, 2)), labels=rng.integers(0, 2, 12))
+        layers = [DenseAngleEncoding(cdata, angle_simple_linear, nearest_neighbor(2, 1)),
+                  ProductAnsatz(1, gate_depth=3), Measurement(1, [0])]
+        qnn = Network(layers, StatevectorSimulator(), predictor=split_predictor)
+        for (trainer, options) in (("COBYLA", dict(maxiter=60)), ("Powell", dict(maxfev=60)),
+                                   ("bounded_Powell", dict(maxfev=60))):
+            for _ in range(3):
+                res = qnn.train(rng.uniform(0, 2 * pi, 3), trainer=trainer, shots=None, early_abort=True,
+                                **options)
+                self.assertNotIsInstance(res.fun, CostLowerBound)
+                self.assertAlmostEqual(res.fun, qnn.cost(res.x, shots=None))
+
+    def test_memoized_training(self):
+        """Tests that training does not evaluate the same angles twice."""
+        qnn = self.get_simulator_network()
+
+        memo = CostMemo()
+        qnn.train([pi / 2, 0.1, pi, 0.2], trainer="Powell", shots=None, memo=memo, maxiter=3)
+        self.assertGreater(memo.info()["hits"], 0)
+
+        # Sampled costs are only memoized if explicitly allowed
+        with self.assertRaises(ValueError):
+            qnn.train([pi, 0.0, pi, 0.0], shots=10, memo=CostMemo())
+        qnn.train([pi, 0.0, pi, 0.0], shots=10, memo=CostMemo(allow_sampled=True), maxiter=2)
+
+    def test_cost_functions(self):
+        """Tests networks with smooth cost functions."""
+        layers = self.get_simulator_network(measured=[0])._layers
+        for batched in (False, True):
+            for cost_function in (CrossEntropy(), Hinge()):
+                qnn = Network(layers, StatevectorSimulator(), cost_function=cost_function, batched=batched)
+
+                # Every data point is classified with certainty
+                self.assertAlmostEqual(qnn.cost([pi, 0.0, pi, 0.0], shots=None), 0.0)
+
+                # Both classes have probability one half: one bit of cross entropy, unit hinge loss
+                self.assertAlmostEqual(qnn.cost([pi / 2, 0.0, pi, 0.0], shots=None), 1.0)
+
+    def test_batched_simulation(self):
+        """Tests that a batched network gives the same results as propagating each data point."""
+        qnn = self.get_simulator_network()
+        batched = Network(qnn._layers, StatevectorSimulator(seed=1), predictor=qnn.predictor, batched=True)
+
+        angles = [pi, 0.0, pi, 0.0]
+        self.assertEqual(batched.cost(angles, shots=20), 0.0)
+        self.assertEqual(list(batched.predict_all(angles, shots=20)), [1, 0, 1, 0])
+
+        # Both networks sample from the same probabilities at any angles
+        cdata = LabeledCData(random.default_rng(2).random((5, 4)), labels=array([0, 1, 1, 0, 1]))
+        layers = [DenseAngleEncoding(cdata, angle_simple_linear, nearest_neighbor(4, 2)),
+                  ProductAnsatz(2, gate_depth=2), Measurement(2, [0, 1])]
+        generic = [0.3, 1.2, -0.4, 2.0]
+        exact = Network(layers, StatevectorSimulator()).propagate_all(generic, shots=None)
+        outcomes = Network(layers, StatevectorSimulator(), batched=True).propagate_all(generic, shots=None)
+        self.assertEqual(len(outcomes), 5)
+        for (out, expected) in zip(outcomes, exact):
+            self.assertTrue(allclose(out.probabilities(), expected.probabilities()))
+        self.assertFalse(allclose(exact[0].probabilities(), exact[1].probabilities()))
+
+        # Exact probabilities give the same results
+        self.assertEqual(batched.cost(angles, shots=None), 0.0)
+
+        # Batched networks need a statevector simulator
+        with self.assertRaises(TypeError):
+            Network(qnn._layers, BaseSimulator("base"), batched=True)
+
+    def test_gradient(self):
+        """Tests the parameter-shift gradient against finite differences."""
+        layers = self.get_simulator_network(measured=[0])._layers
+        angles = array([0.3, 1.2, -0.4, 2.0])
+        for batched in (False, True):
+            qnn = Network(layers, StatevectorSimulator(), cost_function=CrossEntropy(), batched=batched)
+            grad = qnn.gradient(angles)
+
+            step = 1e-6
+            for ii in range(len(angles)):
+                shift = step * (arange(len(angles)) == ii)
+                diff = (qnn.cost(angles + shift, shots=None) - qnn.cost(angles - shift, shots=None)) / (2 * step)
+                self.assertAlmostEqual(grad[ii], diff, places=6)
+
+            # Gradients of a mini-batch only use its data points
+            self.assertEqual(qnn.gradient(angles, indices=[0, 1]).shape, (4,))
+
+        # Sampled gradients are close to the exact gradient
+        qnn = Network(layers, StatevectorSimulator(seed=1), cost_function=Hinge())
+        self.assertTrue(allclose(qnn.gradient(angles, shots=20000), qnn.gradient(angles), atol=0.1))
+
+        # The misclassification rate is not differentiable
+        with self.assertRaises(NotImplementedError):
+            self.get_simulator_network(measured=[0]).gradient(angles)
+
+    def test_gradient_training(self):
+        """Tests training with gradient based trainers."""
+        layers = self.get_simulator_network(measured=[0])._layers
+        qnn = Network(layers, StatevectorSimulator(), cost_function=CrossEntropy())
+        initial_angles = [2.0, 0.3, 2.0, 0.3]
+        initial_cost = qnn.cost(initial_angles, shots=None)
+        for trainer in ("adam", "sgd"):
+            res = qnn.train(initial_angles, trainer=trainer, shots=None, maxiter=50, learning_rate=0.1)
+            self.assertLess(res.fun, initial_cost)
+
+        # Gradients on mini-batches
+        res = qnn.train(initial_angles, trainer="adam", shots=None, batch_size=2, seed=1, maxiter=50)
+        self.assertLess(qnn.cost(res.x, shots=None), initial_cost)
+
+    def test_density_matrix(self):
+        """Tests running and differentiating a network on the noisy density matrix simulator."""
+        layers = self.get_simulator_network(measured=[0])._layers
+        angles = array([0.3, 1.2, -0.4, 2.0])
+
+        # Without noise, the cost matches the statevector simulator
+        exact = Network(layers, StatevectorSimulator(), cost_function=CrossEntropy()).cost(angles, shots=None)
+        qnn = Network(layers, DensityMatrixSimulator(), cost_function=CrossEntropy())
+        self.assertAlmostEqual(qnn.cost(angles, shots=None), exact)
+
+        # The parameter-shift rule holds with noise after the gates
+        computer = DensityMatrixSimulator(depolarizing=0.05, amplitude_damping=0.1, readout_error=0.02, seed=1)
+        qnn = Network(layers, computer, cost_function=CrossEntropy())
+        self.assertNotAlmostEqual(qnn.cost(angles, shots=None), exact)
+        grad = qnn.gradient(angles)
+        step = 1e-6
+        for ii in range(len(angles)):
+            shift = step * (arange(len(angles)) == ii)
+            diff = (qnn.cost(angles + shift, shots=None) - qnn.cost(angles - shift, shots=None)) / (2 * step)
+            self.assertAlmostEqual(grad[ii], diff, places=6)
+
+        # Noise blurs the predictions of the exact angles but sampling still runs
+        qnn = Network(layers, computer, predictor=self.get_simulator_network().predictor)
+        self.assertLess(qnn.cost([pi, 0.0, pi, 0.0], shots=100), 0.5)
+
+    def test_reproducible_parallel_sampling(self):
+        """Tests that sampled outcomes with a seeded simulator do not depend on the number of workers."""
+        layers = self.get_simulator_network()._layers
+        angles = array([0.3, 1.2, -0.4, 2.0])
+
+        outcomes = []
+        for max_workers in (None, 2, 4):
+            qnn = Network(layers, StatevectorSimulator(seed=5), cost_function=CrossEntropy())
+            outs = qnn.propagate_all(angles, shots=50, max_workers=max_workers)
+            outcomes.append([out.raw_outcome.tolist() for out in outs])
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertEqual(outcomes[0], outcomes[2])
+
+        # The data points get different samples, and the next call samples again
+        self.assertNotEqual(outcomes[0], [out.raw_outcome.tolist() for out in qnn.propagate_all(angles, shots=50)])
+
+    def test_profiler(self):
+        """Tests timing the phases of propagating data points."""
+        qnn = self.get_simulator_network()
+        profiler = Profiler()
+        qnn = Network(qnn._layers, StatevectorSimulator(seed=1), predictor=qnn.predictor, profiler=profiler)
+
+        self.assertEqual(qnn.cost([pi, 0.0, pi, 0.0], shots=10), 0.0)
+        timers = profiler.timers
+        for phase in ("build", "compile", "run", "outcome", "predict"):
+            self.assertIn(phase, timers)
+        self.assertEqual(timers["run"]["calls"], 4)
+        self.assertEqual(profiler.counters, {"compile.miss": 4, "propagate": 4})
+
+        # Training streams the statistics and stores them in the result
+        stream = []
+        res = qnn.train([pi, 0.0, pi, 0.0], shots=10, maxiter=6, profile_callback=stream.append)
+        self.assertEqual(len(stream), res.nfev)
+        self.assertEqual(res.profile["timers"]["train.cost"]["calls"], res.nfev)
+        self.assertGreater(res.profile["counters"]["compile.hit"], 0)
+
+        with self.assertRaises(ValueError):
+            self.get_simulator_network().train([pi, 0.0, pi, 0.0], profile_callback=print)
+
+    def test_deduplicate(self):
+        """Tests that identical feature vectors are propagated once."""
+        data = array([[1, 0], [0, 1], [1, 0], [1, 1], [0, 1], [1, 0]])
+        cdata = LabeledCData(data, labels=array([1, 0, 1, 1, 0, 0]))
+        angles = [0.3, 1.2, -0.4, 2.0]
+        for batched in (False, True):
+            networks = [
+                Network([BinaryEncoding(cdata), ProductAnsatz(2, gate_depth=2), Measurement(2, [0])],
+                        StatevectorSimulator(seed=1), cost_function=CrossEntropy(), batched=batched,
+                        predictor=lambda outcome: int(outcome.average()[0] > 0.5),
+                        profiler=Profiler(), deduplicate=deduplicate)
+                for deduplicate in (False, True)
+            ]
+            plain, deduplicated = networks
+
+            self.assertAlmostEqual(deduplicated.cost(angles, shots=None), plain.cost(angles, shots=None))
+            self.assertEqual(deduplicated.profiler.counters["propagate"], 3)
+            self.assertEqual(deduplicated.profiler.counters["deduplicated"], 3)
+
+            self.assertEqual(list(deduplicated.predict_all(angles, shots=None)),
+                             list(plain.predict_all(angles, shots=None)))
+            self.assertTrue(allclose(deduplicated.gradient(angles), plain.gradient(angles)))
+
+            # Duplicates within a mini-batch share one sampled outcome
+            outcomes = deduplicated.propagate_all(angles, shots=10, indices=[2, 1, 0])
+            self.assertIs(outcomes[0], outcomes[2])
+
+    def test_predict_stream(self):
+        """Tests predicting a generator of feature vectors in chunks."""
+        angles = [pi, 0.0, 0.0, 0.0]
+        features = array([[1, 0], [0, 1], [1, 1], [0, 0], [0, 1]] * 3)
+        expected = list(features[:, 0])
+        for batched in (False, True):
+            qnn = self.get_simulator_network(parametric=True)
+            qnn = Network(qnn._layers, StatevectorSimulator(), predictor=qnn.predictor, batched=batched,
+                          profiler=Profiler())
+
+            read = []
+
+            def stream():
+                for vector in features:
+                    read.append(vector)
+                    yield vector
+
+            predictions = qnn.predict_stream(stream(), angles, shots=None, chunk_size=4, max_workers=2)
+
+            # Feature vectors are only read one chunk at a time
+            self.assertEqual(next(predictions), expected[0])
+            self.assertEqual(len(read), 4)
+            self.assertEqual([expected[0]] + list(predictions), expected)
+            if not batched:
+                self.assertEqual(qnn.profiler.counters["compile.miss"], 1)
+
+        with self.assertRaises(ValueError):
+            qnn.predict_stream(iter(features), angles, chunk_size=0)
+        with self.assertRaises(ValueError):
+            list(qnn.predict_stream([[1, 0, 1]], angles, shots=None))
+
+    def test_checkpoint(self):
+        """Tests that a crashed training run resumed from a checkpoint ends like an uninterrupted run."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "run.npz")
+        layers = self.get_simulator_network(measured=[0])._layers
+        # (trainer, options, batch size, number of evaluations before the crash)
+        options = [("bounded_Powell", dict(maxfev=300), None, 120),
+                   ("adam", dict(maxiter=20, learning_rate=0.1), 2, 8)]
+        try:
+            for (trainer, kwargs, batch_size, crash_after) in options:
+                def train(qnn, **extra):
+                    return qnn.train([2.0, 0.3, 2.0, 0.3], trainer=trainer, shots=50, batch_size=batch_size,
+                                     seed=1, **dict(kwargs, **extra))
+
+                def network():
+                    return Network(layers, StatevectorSimulator(seed=2), cost_function=CrossEntropy())
+
+                expected = train(network())
+
+                # Stop the run after a few gradient or cost evaluations
+                qnn = network()
+                calls = []
+
+                def crash(function):
+                    def crashing(*args, **kw):
+                        calls.append(None)
+                        if len(calls) > crash_after:
+                            raise KeyboardInterrupt
+                        return function(*args, **kw)
+                    return crashing
+
+                qnn.cost = crash(qnn.cost)
+                qnn.gradient = crash(qnn.gradient)
+                with self.assertRaises(KeyboardInterrupt):
+                    train(qnn, checkpoint=path)
+                self.assertGreater(Checkpoint.load(path).iteration, 0)
+
+                res = train(network(), checkpoint=path, resume=path)
+                self.assertEqual(res.fun, expected.fun)
+                self.assertEqual(res.nfev, expected.nfev)
+
+                # Checkpoints can only be resumed with the same trainer
+                with self.assertRaises(ValueError):
+                    network().train([0.0] * 4, trainer="COBYLA", resume=path)
+        finally:
+            shutil.rmtree(directory)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,326 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Hyperparameter sweeps which train a Network for every configuration of a search space.
+
+A configuration is a dict of hyperparameters, e.g. the ansatz class, gate depth, encoder,
+shots and trainer. A Sweep builds a network for each configuration with a function
+
+    build(config, computer) --> nisqai.network.Network
+
+trains it, and appends one JSON line per configuration to a results file. Configurations
+with a result in the file are skipped, so a sweep which is stopped can be run again to
+finish the remaining configurations.
+
+Example usage:
+
+    >>> def build(config, computer):
+    >>>     ansatz = ProductAnsatz(2, gate_depth=config["gate_depth"])
+    >>>     return Network([config["encoder"](cdata), ansatz, measure], computer, predictor=predictor)
+    >>>
+    >>> space = dict(encoder=[DenseAngleEncoding, BinaryEncoding], gate_depth=[1, 2, 4], trainer=["COBYLA"])
+    >>> sweep = Sweep(build, grid_search(space), "sweep.jsonl", StatevectorSimulator(), processes=4)
+    >>> sweep.run()
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from copy import copy
+from hashlib import sha256
+import atexit
+import itertools
+import json
+import os
+import time
+
+from numpy import generic, ndarray, pi, random
+
+from nisqai.network._artifact import _qualified_name
+from nisqai.simulate._base_simulator import BaseSimulator
+from nisqai.utils._engine_pool import EnginePool
+from nisqai.utils._random import as_generator
+
+# Keys of a configuration which are passed to Network.train. The optimizer options
+# maxiter and maxfev are passed on to the trainer.
+TRAIN_OPTIONS = ("trainer", "shots", "batch_size", "sampling", "reshuffle", "jac", "maxiter", "maxfev")
+
+# Computer of the current worker process, see _start_worker
+_WORKER = {}
+
+
+def grid_search(space):
+    """Returns the list of all configurations in a grid.
+
+    Args:
+        space : Union[dict[str, Sequence], list[dict[str, Sequence]]]
+            Values of each hyperparameter. A list of grids gives the configurations
+            of each grid in order, e.g. to sweep options which only apply to some trainers.
+    """
+    if isinstance(space, dict):
+        space = [space]
+
+    configs = []
+    for grid in space:
+        names = list(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            configs.append(dict(zip(names, values)))
+    return configs
+
+
+def random_search(space, num_samples, seed=None):
+    """Returns a list of configurations drawn at random from the space.
+
+    Args:
+        space : dict[str, Union[Sequence, Callable]]
+            Values of each hyperparameter. A value is drawn uniformly from a sequence,
+            or by calling a function with a numpy.random.Generator, e.g.
+            lambda rng: 10 ** rng.uniform(-3, -1).
+
+        num_samples : int
+            Number of configurations.
+
+        seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+            Seed for the random number generator. See nisqai.utils.as_generator.
+    """
+    rng = as_generator(seed)
+    configs = []
+    for _ in range(num_samples):
+        config = {}
+        for (name, values) in space.items():
+            config[name] = values(rng) if callable(values) else values[rng.integers(len(values))]
+        configs.append(config)
+    return configs
+
+
+def config_key(config):
+    """Returns the configuration as a JSON string which identifies it in a results file.
+
+    Classes and functions are written as the module and name they are imported from.
+    """
+    return json.dumps(config, sort_keys=True, default=_jsonable)
+
+
+def _jsonable(obj):
+    """Returns a JSON serializable version of an object in a configuration."""
+    if isinstance(obj, (generic, ndarray)):
+        return obj.tolist()
+    return _qualified_name(obj)
+
+
+def load_results(path):
+    """Returns the records in a results file written by a Sweep, in the order they were written.
+
+    A record is a dict with the keys
+
+        key: Configuration as returned by config_key.
+        config: Configuration with classes and functions replaced by their names.
+        cost: Final cost of the training run.
+        angles: Trained angles.
+        nfev: Number of cost evaluations, if reported by the trainer.
+        score: Value of the score function of the Sweep, if given.
+        seconds: Wall time to build and train the network.
+        error: None, or the exception which stopped the run.
+
+    A last line which was cut off by a crash is ignored.
+
+    Args:
+        path : str
+            Path of the results file.
+    """
+    if not os.path.exists(path):
+        return []
+
+    records = []
+    with open(path) as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+class Sweep:
+    """Trains a Network for every configuration in a list, in a pool of processes."""
+
+    def __init__(self, build, configs, path, computer=None, processes=None, engines=False, seed=0,
+                 score=None, **train_kwargs):
+        """Initializes a Sweep.
+
+        Args:
+            build : Callable
+                Function build(config, computer) which returns the Network of a configuration.
+                Must be defined at module level to be sent to worker processes.
+
+            configs : Iterable[dict]
+                Configurations to run, e.g. from grid_search or random_search. Values must be
+                JSON serializable, or classes and functions defined at module level.
+
+            path : str
+                Path of the append-only results file, with one JSON record per line.
+                See load_results.
+
+            computer : Union[str, nisqai.simulate.BaseSimulator, pyquil.api.QuantumComputer] (default: None)
+                Computer passed to build. Simulators get a random number generator seeded
+                by the configuration, so results do not depend on the order of the runs.
+
+            processes : int (default: None)
+                Number of worker processes. If None or one, configurations run in this process.
+
+            engines : bool (default: False)
+                If True, each worker process starts its own QVM/quilc pair (see nisqai.utils.EnginePool)
+                and build gets a quantum computer named by the computer string on that engine.
+
+            seed : int (default: 0)
+                Seed of the sweep. Each configuration gets a seed from the sweep seed and the
+                configuration, for its initial angles, mini-batches and simulator.
+
+            score : Callable (default: None)
+                Function score(network) of the trained network which is stored in each record,
+                e.g. the accuracy on test data. Must be defined at module level.
+
+        kwargs:
+            Keyword arguments to Network.train which are the same for all configurations.
+            Configuration values for the keys in TRAIN_OPTIONS take precedence.
+        """
+        if engines and not isinstance(computer, str):
+            raise ValueError("engines requires the name of a quantum computer, e.g. \"2q-qvm\".")
+
+        self.build = build
+        self.path = path
+        self.computer = computer
+        self.processes = processes
+        self.engines = engines
+        self.seed = seed
+        self.score = score
+        self.train_kwargs = train_kwargs
+
+        # Configurations by key, without duplicates
+        self.configs = {}
+        for config in configs:
+            self.configs.setdefault(config_key(config), config)
+
+    def finished(self):
+        """Returns the set of keys of configurations with a result in the results file.
+
+        Configurations which raised an error are not finished and run again.
+        """
+        return set(record["key"] for record in load_results(self.path) if record.get("error") is None)
+
+    def pending(self):
+        """Returns the list of configurations without a result in the results file."""
+        finished = self.finished()
+        return [config for (key, config) in self.configs.items() if key not in finished]
+
+    def results(self):
+        """Returns the latest record of each configuration of the sweep in the results file."""
+        latest = dict((record["key"], record) for record in load_results(self.path))
+        return [latest[key] for key in self.configs if key in latest]
+
+    def run(self):
+        """Runs all pending configurations and returns their records in the order they finished.
+
+        Each record is appended to the results file as soon as its run finishes.
+        """
+        finished = self.finished()
+        jobs = [(self.build, config, self._seed(key), self.score, self.train_kwargs)
+                for (key, config) in self.configs.items() if key not in finished]
+        if not jobs:
+            return []
+
+        records = []
+        with self._open() as file:
+            if self.processes is None or self.processes <= 1:
+                pool = EnginePool(1) if self.engines else nullcontext()
+                with pool:
+                    computer = pool.dispatcher(self.computer) if self.engines else self.computer
+                    for job in jobs:
+                        records.append(self._write(file, _run_config(computer, *job)))
+                return records
+
+            with ProcessPoolExecutor(self.processes, initializer=_start_worker,
+                                     initargs=(self.computer, self.engines)) as executor:
+                futures = [executor.submit(_run_worker, *job) for job in jobs]
+                for future in as_completed(futures):
+                    records.append(self._write(file, future.result()))
+        return records
+
+    def _seed(self, key):
+        """Returns the SeedSequence of the configuration with the key."""
+        digest = int.from_bytes(sha256(key.encode()).digest()[:8], "little")
+        return random.SeedSequence([self.seed, digest])
+
+    def _open(self):
+        """Opens the results file for appending, ending a line which was cut off by a crash."""
+        file = open(self.path, "a+")
+        if file.tell() > 0:
+            file.seek(file.tell() - 1)
+            if file.read(1) != "\n":
+                file.write("\n")
+        return file
+
+    @staticmethod
+    def _write(file, record):
+        """Appends the record to the results file and returns it."""
+        file.write(json.dumps(record, default=_jsonable) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+        return record
+
+
+def _start_worker(computer, engines):
+    """Stores the computer of a worker process, starting its own engine if engines is True."""
+    if engines:
+        pool = EnginePool(1)
+        pool.start()
+        atexit.register(pool.stop)
+        computer = pool.dispatcher(computer)
+    _WORKER["computer"] = computer
+
+
+def _run_worker(*job):
+    """Runs a configuration on the computer of the worker process. See _run_config."""
+    return _run_config(_WORKER["computer"], *job)
+
+
+def _run_config(computer, build, config, seed, score, train_kwargs):
+    """Builds and trains the network of a configuration and returns its record.
+
+    Exceptions are stored in the record instead of stopping the sweep.
+    """
+    key = config_key(config)
+    record = dict(key=key, config=json.loads(key), cost=None, angles=None, nfev=None, score=None,
+                  seconds=None, error=None)
+    start = time.time()
+    try:
+        (simulator_seed, train_seed) = seed.spawn(2)
+        if isinstance(computer, BaseSimulator):
+            computer = copy(computer)
+            computer.rng = as_generator(simulator_seed)
+
+        network = build(config, computer)
+        rng = as_generator(train_seed)
+        initial_angles = rng.uniform(0.0, 2.0 * pi, len(network._ansatz.params.list_names()))
+
+        kwargs = dict(train_kwargs)
+        kwargs.update((name, config[name]) for name in TRAIN_OPTIONS if name in config)
+        res = network.train(initial_angles, seed=rng, **kwargs)
+
+        record.update(cost=float(res.fun), angles=[float(x) for x in res.x])
+        if "nfev" in res:
+            record["nfev"] = int(res["nfev"])
+        if score is not None:
+            record["score"] = score(network)
+    except Exception as err:
+        record["error"] = "{}: {}".format(type(err).__name__, err)
+    record["seconds"] = time.time() - start
+    return record
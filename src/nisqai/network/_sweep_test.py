@@ -0,0 +1,122 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, int64
+
+from nisqai.cost._network_costs import CrossEntropy
+from nisqai.data._cdata import LabeledCData
+from nisqai.encode._binary_encoding import BinaryEncoding
+from nisqai.layer._product_ansatz import ProductAnsatz
+from nisqai.measure._measure import Measurement
+from nisqai.network._network import Network
+from nisqai.network._sweep import Sweep, config_key, grid_search, load_results, random_search
+from nisqai.simulate._statevector import StatevectorSimulator
+
+
+def build(config, computer):
+    """Returns a network on two qubits with a product ansatz of the configured depth."""
+    if config["gate_depth"] < 1:
+        raise ValueError("gate_depth must be positive.")
+    cdata = LabeledCData(array([[1, 0], [0, 1], [1, 1], [0, 0]]), labels=array([1, 0, 1, 0]))
+    layers = [config["encoder"](cdata), config["ansatz"](2, gate_depth=config["gate_depth"]), Measurement(2, [0])]
+    return Network(layers, computer, cost_function=CrossEntropy())
+
+
+def num_angles(network):
+    """Returns the number of angles of the network."""
+    return len(network._ansatz.params.list_names())
+
+
+class SweepTest(unittest.TestCase):
+    """Unit tests for Sweep."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "sweep.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def get_sweep(self, configs, path=None, processes=None):
+        """Returns a sweep training with sampled costs on the statevector simulator."""
+        return Sweep(build, configs, path or self.path, StatevectorSimulator(), processes=processes,
+                     score=num_angles, shots=50, maxiter=5)
+
+    def test_search_spaces(self):
+        """Tests grid and random search spaces."""
+        space = dict(encoder=[BinaryEncoding], ansatz=[ProductAnsatz], gate_depth=[1, 2], trainer=["COBYLA"])
+        configs = grid_search(space)
+        self.assertEqual([config["gate_depth"] for config in configs], [1, 2])
+        self.assertEqual(len(grid_search([space, dict(space, trainer=["Powell", "adam"])])), 6)
+
+        configs = random_search(dict(space, shots=lambda rng: int(rng.integers(10, 100))), 5, seed=1)
+        self.assertEqual(len(configs), 5)
+        self.assertEqual(configs, random_search(dict(space, shots=lambda rng: int(rng.integers(10, 100))), 5, seed=1))
+        self.assertTrue(all(10 <= config["shots"] < 100 for config in configs))
+
+        # Keys do not depend on the order of the hyperparameters
+        self.assertEqual(config_key(dict(a=1, b=ProductAnsatz)), config_key(dict(b=ProductAnsatz, a=int64(1))))
+        self.assertIn("nisqai.layer._product_ansatz:ProductAnsatz", config_key(dict(b=ProductAnsatz)))
+        with self.assertRaises(ValueError):
+            config_key(dict(f=lambda x: x))
+
+    def test_run_and_restart(self):
+        """Tests that a sweep writes one record per configuration and skips them when run again."""
+        configs = grid_search(dict(encoder=[BinaryEncoding], ansatz=[ProductAnsatz], gate_depth=[0, 1, 2]))
+        sweep = self.get_sweep(configs + configs[:1])
+        self.assertEqual(len(sweep.pending()), 3)
+
+        records = sweep.run()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records, load_results(self.path))
+        failed = [record for record in records if record["error"] is not None]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0]["config"]["gate_depth"], 0)
+        for record in records:
+            if record["error"] is None:
+                self.assertEqual(len(record["angles"]), record["score"])
+                self.assertGreaterEqual(record["cost"], 0.0)
+
+        # Only the failed configuration runs again
+        self.assertEqual(sweep.pending(), configs[:1])
+        self.assertEqual(len(sweep.run()), 1)
+        self.assertEqual(len(load_results(self.path)), 4)
+        self.assertEqual(len(sweep.results()), 3)
+
+        # A line cut off by a crash is ignored, and the next record starts on a new line
+        with open(self.path, "a") as file:
+            file.write('{"key": "cut off')
+        more = grid_search(dict(encoder=[BinaryEncoding], ansatz=[ProductAnsatz], gate_depth=[3]))
+        sweep = self.get_sweep(configs + more)
+        self.assertEqual(len(sweep.run()), 2)
+        self.assertEqual(len(load_results(self.path)), 6)
+        self.assertEqual([record["config"]["gate_depth"] for record in sweep.run()], [0])
+
+    def test_processes(self):
+        """Tests that a pool of processes gives the same records as a serial sweep."""
+        configs = grid_search(dict(encoder=[BinaryEncoding], ansatz=[ProductAnsatz], gate_depth=[1, 2, 3],
+                                   trainer=["COBYLA", "Powell"]))
+        serial = self.get_sweep(configs).run()
+        parallel = self.get_sweep(configs, os.path.join(self.dir, "parallel.jsonl"), processes=2).run()
+
+        strip = lambda records: sorted(json.dumps(dict(record, seconds=None), sort_keys=True) for record in records)
+        self.assertEqual(strip(serial), strip(parallel))
+
+
+if __name__ == "__main__":
+    unittest.main()
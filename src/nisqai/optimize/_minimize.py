@@ -13,6 +13,10 @@
 
 from scipy.optimize import minimize as scipy_minimize
 from .bounded_Powell import bounded_Powell
+from .gradient_descent import adam, sgd
+
+# Methods implemented in NISQAI, by name
+NISQAI_METHODS = {"bounded_Powell": bounded_Powell, "adam": adam, "sgd": sgd}
 
 
 def minimize(*args, **kwargs):
@@ -21,11 +25,15 @@ def minimize(*args, **kwargs):
 	scipy.optimize.minimize function. There is one exception;
 	we have added a new minimizer method called "bounded_Powell".
 	To see its options, see help(nisqi.optimize.bounded_Powell).
+
+	The gradient based methods "adam" and "sgd" are also available.
+	They require the gradient of the objective as jac. See
+	help(nisqai.optimize.gradient_descent).
 	"""
 
 	kwargs = kwargs.copy()
 	method = kwargs.pop("method", "COBYLA")
-	if method == "bounded_Powell": method = bounded_Powell
+	if isinstance(method, str) and method in NISQAI_METHODS: method = NISQAI_METHODS[method]
 	kwargs["method"] = method
 
 	try: return scipy_minimize(*args, **kwargs)
@@ -33,6 +41,6 @@ def minimize(*args, **kwargs):
 
 	raise ValueError(
 		"Method options are any of scipy.optimize.minimize method options "
-		"or 'bounded_Powell'. To see all the optional arguments to 'bounded_Powell' "
+		"or 'bounded_Powell', 'adam' or 'sgd'. To see all the optional arguments to 'bounded_Powell' "
 		"see help(nisqi.optimize.bounded_Powell)."
 	)
@@ -11,7 +11,7 @@
 #   limitations under the License.
 
 from nisqai.optimize import minimize
-from numpy import sin, cos, random
+from numpy import array, sin, cos, random
 
 
 def test_minimize():
@@ -43,3 +43,45 @@ def test_minimize():
         # testing Powell
         assert minimize(fun, x0, method="Powell",
                         options=dict(maxfev=maxfev)).fun < -200
+
+
+def test_gradient_descent():
+    def fun(p):
+        """Quadratic function with minimum 1 at (1, -2)."""
+        return (p[0] - 1) ** 2 + 2 * (p[1] + 2) ** 2 + 1
+
+    def jac(p):
+        return array([2 * (p[0] - 1), 4 * (p[1] + 2)])
+
+    for method in ("adam", "sgd"):
+        res = minimize(fun, [0.0, 0.0], method=method, jac=jac,
+                       options=dict(maxiter=500, learning_rate=0.1))
+        assert abs(res.fun - 1) < 1e-6
+        assert res.nit == 500
+
+    res = minimize(fun, [0.0, 0.0], method="sgd", jac=jac,
+                   options=dict(maxiter=200, learning_rate=0.05, momentum=0.5))
+    assert abs(res.fun - 1) < 1e-6
+
+
+def test_resume_from_state():
+    def fun(p):
+        return (p[0] - 1) ** 2 + 2 * (p[1] + 2) ** 2 + sin(p[0] * p[1])
+
+    def jac(p):
+        return array([2 * (p[0] - 1) + p[1] * cos(p[0] * p[1]),
+                      4 * (p[1] + 2) + p[0] * cos(p[0] * p[1])])
+
+    for (method, options) in (("adam", dict(maxiter=20, learning_rate=0.1)),
+                              ("sgd", dict(maxiter=20, learning_rate=0.05, momentum=0.5)),
+                              ("bounded_Powell", dict(maxfev=100))):
+        expected = minimize(fun, [0.0, 0.0], method=method, jac=jac, options=options)
+
+        # Stop after the first iteration, then continue from its state
+        states = []
+        first = dict(options, state_callback=lambda x, state: states.append((x, state)))
+        minimize(fun, [0.0, 0.0], method=method, jac=jac, options=first)
+        x, state = states[0]
+        res = minimize(fun, x, method=method, jac=jac, options=dict(options, state=state))
+        assert abs(res.fun - expected.fun) < 1e-12
+        assert abs(array(res.x) - array(expected.x)).max() < 1e-12
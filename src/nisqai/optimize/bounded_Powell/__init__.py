@@ -47,6 +47,12 @@ upper_bound: list or array of numbers. upper_bound[i] is the upper bound
                                        will be used.
 callback: function of x, called after each iteration.
 gs: boolean, whether or not to use gram schmidt to keep direcs orthogonal.
+state_callback: function of x and a dict with the current direction vectors
+                ("direc"), number of function evaluations ("nfev") and function
+                value at x ("fun"), called
+                after each iteration. Passing the dict as state continues the
+                optimization from x.
+state: dict from state_callback to resume from. Overrides direc.
     
 Returns scipy.minimize.OptimizeResult
     See scipy's doucmentation for a description of attributes.
@@ -131,7 +131,8 @@ def normalize(vec):
 
 
 def _bounded_Powell(fun, x0, args, direc, ftol, xtol, maxls,
-                    maxfev, callback, lower_bound, upper_bound, gs):
+                    maxfev, callback, lower_bound, upper_bound, gs,
+                    nfev=0, fun0=None, state_callback=None):
     
     directions = [list(d) for d in direc]
     
@@ -139,7 +140,12 @@ def _bounded_Powell(fun, x0, args, direc, ftol, xtol, maxls,
 
     res = Result()
     res.add_x(x0)
-    res.add_f(f(x0))
+    if fun0 is None:
+        res.add_f(f(x0))
+    else:
+        # resuming, the function value at x0 is known
+        res.fevals.append(fun0)
+    res.nfev += nfev
     res.add_iter(res.get_f())
     
     options = dict(xatol=xtol)
@@ -197,19 +203,29 @@ def _bounded_Powell(fun, x0, args, direc, ftol, xtol, maxls,
             directions.reverse()
         
         x0 = res.get_x().copy()
+        
+        # state needed to continue from x0
+        if state_callback:
+            state_callback(copy(x0), dict(direc=array(directions), nfev=res.nfev, fun=res.get_f()))
     
     return res
 
 
 def _local_bounded_Powell(fun, x0, args, direc, ftol, xtol, maxls, 
-                          maxfev, callback, lower_bound, upper_bound, gs):
+                          maxfev, callback, lower_bound, upper_bound, gs,
+                          nfev=0, fun0=None, state_callback=None):
     directions = [list(d) for d in direc]
     
     f = lambda x: fun(x, *args)
 
     res = Result()
     res.add_x(x0)
-    res.add_f(f(x0))
+    if fun0 is None:
+        res.add_f(f(x0))
+    else:
+        # resuming, the function value at x0 is known
+        res.fevals.append(fun0)
+    res.nfev += nfev
     res.add_iter(res.get_f())
     
     options = dict(xatol=xtol)
@@ -270,6 +286,10 @@ def _local_bounded_Powell(fun, x0, args, direc, ftol, xtol, maxls,
             directions.reverse()
         
         x0 = res.get_x().copy()
+        
+        # state needed to continue from x0
+        if state_callback:
+            state_callback(copy(x0), dict(direc=array(directions), nfev=res.nfev, fun=res.get_f()))
     
     return res
 
@@ -308,6 +328,12 @@ def bounded_Powell(f, x0, args=(), **kwargs):
                                            will be used.
     callback: function of x, called after each iteration.
     gs: boolean, whether or not to use gram schmidt to keep direcs orthogonal.
+    state_callback: function of x and a dict with the current direction vectors
+                    ("direc"), number of function evaluations ("nfev") and function
+                    value at x ("fun"), called
+                    after each iteration. Passing the dict as state continues the
+                    optimization from x.
+    state: dict from state_callback to resume from. Overrides direc.
         
     Returns scipy.minimize.OptimizeResult
         See scipy's doucmentation for a description of attributes.
@@ -346,15 +372,22 @@ def bounded_Powell(f, x0, args=(), **kwargs):
     lower_bound = kwargs.pop("lower_bound", [-pi]*len(x0))
     upper_bound = kwargs.pop("upper_bound", [pi]*len(x0))
     gs = kwargs.pop("gs", False)
+    state_callback = kwargs.pop("state_callback", None)
+    state = kwargs.pop("state", None)
+    nfev, fun0 = 0, None
+    if state is not None:
+        direc, nfev, fun0 = state["direc"], int(state["nfev"]), float(state["fun"])
 
         
     if method == "locally-bounded":
         res = _local_bounded_Powell(f, x0, args, direc, ftol, xtol, maxls, 
-                                    maxfev, callback, lower_bound, upper_bound, gs)
+                                    maxfev, callback, lower_bound, upper_bound, gs,
+                                    nfev, fun0, state_callback)
         
     elif not method or method == "bounded_Powell":
         res = _bounded_Powell(f, x0, args, direc, ftol, xtol, maxls, 
-                              maxfev, callback, lower_bound, upper_bound, gs)
+                              maxfev, callback, lower_bound, upper_bound, gs,
+                              nfev, fun0, state_callback)
         
     else:
         raise ValueError(
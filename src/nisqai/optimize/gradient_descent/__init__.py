@@ -0,0 +1,22 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Gradient descent optimizers (SGD with momentum and Adam) for use with
+nisqai.optimize.minimize, e.g. with the parameter-shift gradient of a Network.
+
+Example usage:
+
+    >>> from nisqai.optimize import minimize
+    >>> res = minimize(fun, x0, method="adam", jac=gradient, options=dict(learning_rate=0.05))
+"""
+
+from ._gradient_descent import adam, sgd
@@ -0,0 +1,169 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Gradient descent optimizers in the format of scipy.optimize.minimize methods.
+
+Both optimizers are called with the gradient of the objective as jac:
+
+    >>> from nisqai.optimize import minimize
+    >>> res = minimize(fun, x0, method="adam", jac=gradient, options=dict(maxiter=200))
+
+The gradient is evaluated once per iteration. The objective is only evaluated once,
+at the final parameters, since gradient descent does not need its values.
+
+After each iteration, state_callback(x, state) is called with the optimizer state
+(the iteration number "t" and the moment estimates). A run which stopped can be
+continued by calling the optimizer again from x with the same options and state=state.
+"""
+
+from numpy import asarray, sqrt, zeros_like
+from scipy.optimize import OptimizeResult
+
+
+def _check_jac(jac):
+    """Raises a ValueError if no gradient function is given."""
+    if not callable(jac):
+        raise ValueError("Gradient descent requires the gradient of the objective as jac.")
+
+
+def _result(fun, x, args, nit, message):
+    """Returns an OptimizeResult with the objective evaluated at the final parameters."""
+    return OptimizeResult(
+        x=x, fun=fun(x, *args), nit=nit, nfev=1, njev=nit, success=True, message=message
+    )
+
+
+def sgd(fun, x0, args=(), jac=None, callback=None, maxiter=100, learning_rate=0.1, momentum=0.0,
+        state=None, state_callback=None, **unknown_options):
+    """Minimizes fun by (stochastic) gradient descent with optional momentum.
+
+    Args:
+        fun : Callable
+            Objective function, called as fun(x, *args).
+
+        x0 : array-like
+            Initial parameters.
+
+        args : tuple
+            Extra arguments for fun and jac.
+
+        jac : Callable
+            Gradient of the objective, called as jac(x, *args). May be a stochastic
+            estimate, e.g. from a mini-batch of data points.
+
+        callback : Callable
+            Function of the parameters called after each iteration.
+
+        maxiter : int (default: 100)
+            Number of iterations.
+
+        learning_rate : float (default: 0.1)
+            Step size.
+
+        momentum : float (default: 0.0)
+            Fraction of the previous step added to each step.
+
+        state : dict (default: None)
+            State from state_callback to resume from. The iterations already
+            done count towards maxiter.
+
+        state_callback : Callable
+            Function of the parameters and the optimizer state called after each iteration.
+
+    Returns : scipy.optimize.OptimizeResult
+    """
+    _check_jac(jac)
+    x = asarray(x0, dtype=float).copy()
+    step = zeros_like(x)
+    start = 0
+    if state is not None:
+        step, start = asarray(state["step"], dtype=float), int(state["t"])
+
+    for t in range(start + 1, maxiter + 1):
+        step = momentum * step - learning_rate * asarray(jac(x, *args))
+        x = x + step
+        if callback is not None:
+            callback(x.copy())
+        if state_callback is not None:
+            state_callback(x.copy(), dict(t=t, step=step.copy()))
+
+    return _result(fun, x, args, maxiter, "Maximum number of iterations reached.")
+
+
+def adam(fun, x0, args=(), jac=None, callback=None, maxiter=100, learning_rate=0.01, beta1=0.9,
+         beta2=0.999, eps=1e-8, state=None, state_callback=None, **unknown_options):
+    """Minimizes fun with the Adam optimizer (Kingma and Ba, https://arxiv.org/abs/1412.6980).
+
+    Args:
+        fun : Callable
+            Objective function, called as fun(x, *args).
+
+        x0 : array-like
+            Initial parameters.
+
+        args : tuple
+            Extra arguments for fun and jac.
+
+        jac : Callable
+            Gradient of the objective, called as jac(x, *args). May be a stochastic
+            estimate, e.g. from a mini-batch of data points.
+
+        callback : Callable
+            Function of the parameters called after each iteration.
+
+        maxiter : int (default: 100)
+            Number of iterations.
+
+        learning_rate : float (default: 0.01)
+            Step size.
+
+        beta1 : float (default: 0.9)
+            Decay rate of the first moment estimate.
+
+        beta2 : float (default: 0.999)
+            Decay rate of the second moment estimate.
+
+        eps : float (default: 1e-8)
+            Small number added to the denominator for numerical stability.
+
+        state : dict (default: None)
+            State from state_callback to resume from. The iterations already
+            done count towards maxiter.
+
+        state_callback : Callable
+            Function of the parameters and the optimizer state called after each iteration.
+
+    Returns : scipy.optimize.OptimizeResult
+    """
+    _check_jac(jac)
+    x = asarray(x0, dtype=float).copy()
+    m = zeros_like(x)
+    v = zeros_like(x)
+    start = 0
+    if state is not None:
+        m, v, start = asarray(state["m"], dtype=float), asarray(state["v"], dtype=float), int(state["t"])
+
+    for t in range(start + 1, maxiter + 1):
+        grad = asarray(jac(x, *args))
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad ** 2
+
+        # Bias corrected moment estimates
+        m_hat = m / (1 - beta1 ** t)
+        v_hat = v / (1 - beta2 ** t)
+        x = x - learning_rate * m_hat / (sqrt(v_hat) + eps)
+        if callback is not None:
+            callback(x.copy())
+        if state_callback is not None:
+            state_callback(x.copy(), dict(t=t, m=m.copy(), v=v.copy()))
+
+    return _result(fun, x, args, maxiter, "Maximum number of iterations reached.")
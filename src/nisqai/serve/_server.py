@@ -0,0 +1,421 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Local HTTP server for predictions of a trained Network, with request micro-batching.
+
+Concurrent requests are coalesced into micro-batches: the first request of a batch
+waits at most max_latency seconds for more requests (or until max_batch_size feature
+vectors are collected), then all feature vectors are predicted together through
+Network.predict_stream, i.e. as one batch for batched networks or in a pool of threads.
+
+Endpoints:
+
+    POST /predict   {"features": [[...], ...]}  -->  {"predictions": [...]}
+    GET  /stats     Throughput and latency statistics, see MicroBatcher.stats.
+    GET  /health    {"status": "ok"}
+
+Example usage:
+
+    >>> server = InferenceServer(qnn, angles, port=8000, max_latency=0.005)
+    >>> server.start()
+    >>> # POST {"features": [[0.1, 0.2]]} to http://127.0.0.1:8000/predict
+    >>> server.stop()
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from queue import Empty, Queue
+import threading
+import time
+
+from numpy import asarray, percentile
+
+from nisqai.network._artifact import load_network
+from nisqai.network._checkpoint import Checkpoint
+
+
+class MicroBatcher:
+    """Coalesces concurrent prediction requests into batches run by a single worker thread."""
+
+    def __init__(self, network, angles=None, shots=1000, max_batch_size=64, max_latency=0.005,
+                 max_workers=None, window=10000, preprocess=True):
+        """Initializes a MicroBatcher.
+
+        Args:
+            network : Union[nisqai.network.Network, str]
+                Trained network, or the path of an artifact written by nisqai.network.save_network
+                to load it from. Requires an encoder derived from BaseEncoding, see Network.predict_stream.
+
+            angles : Union[dict, list, numpy.ndarray, str]
+                Trained angles of the ansatz, or the path of a nisqai.network.Checkpoint
+                to load them from. If None, the current angles of the network are used.
+
+            shots : Union[int, None] (default: 1000)
+                Number of times to execute the circuit for one prediction.
+                If None, exact probabilities are used (simulators only).
+
+            max_batch_size : int (default: 64)
+                Maximum number of feature vectors in a batch.
+
+            max_latency : float (default: 0.005)
+                Maximum number of seconds the first request of a batch waits for more requests.
+
+            max_workers : int (default: None)
+                Number of threads used to run the feature vectors of a batch. See Network.predict_stream.
+
+            window : int (default: 10000)
+                Number of most recent requests used for latency percentiles.
+
+            preprocess : bool (default: True)
+                If True, requests hold raw feature vectors, which are preprocessed with the
+                steps and statistics of the training data (see CData.transform) before prediction.
+                If False, requests hold preprocessed feature vectors.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        if max_latency < 0:
+            raise ValueError("max_latency must be non-negative.")
+
+        if isinstance(network, str):
+            network = load_network(network)
+        if isinstance(angles, str):
+            angles = Checkpoint.load(angles).angles
+        if angles is not None:
+            network._set_angles(list(angles) if not isinstance(angles, dict) else angles)
+
+        self.network = network
+        self.shots = shots
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_workers = max_workers
+        self.preprocess = preprocess
+
+        self._queue = Queue()
+        self._thread = None
+        self._running = False
+
+        # Statistics
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._num_requests = 0
+        self._num_predictions = 0
+        self._num_batches = 0
+        self._num_errors = 0
+        self._busy = 0.0
+        self._start_time = None
+
+    def start(self):
+        """Starts the worker thread."""
+        if self._running:
+            return
+        self._running = True
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._work, name="nisqai-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the worker thread after the current batch. Requests still queued fail with a RuntimeError."""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        self._thread.join()
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except Empty:
+                break
+            if request is not None:
+                request[1].set_exception(RuntimeError("The micro-batcher was stopped."))
+
+    def submit(self, feature_vectors):
+        """Returns a concurrent.futures.Future of the list of predictions of the feature vectors.
+
+        Args:
+            feature_vectors : Iterable[array-like]
+                Feature vectors to predict, each with the number of raw features of the network's
+                data, or the number of features after preprocessing if preprocess is False.
+        """
+        if not self._running:
+            raise RuntimeError("The micro-batcher is not running. Call MicroBatcher.start first.")
+
+        # Check the request here, so that an invalid request does not fail the whole batch
+        feature_vectors = [asarray(vector, dtype=float) for vector in feature_vectors]
+        data = self.network.data
+        num_features = data.num_raw_features if self.preprocess else data.num_features
+        for vector in feature_vectors:
+            if vector.shape != (num_features,):
+                raise ValueError("Expected feature vectors of {} features.".format(num_features))
+
+        future = Future()
+        self._queue.put((feature_vectors, future, time.perf_counter()))
+        return future
+
+    def predict(self, feature_vectors, timeout=None):
+        """Returns the list of predictions of the feature vectors, waiting for their batch to run."""
+        return self.submit(feature_vectors).result(timeout)
+
+    def _next_batch(self):
+        """Returns the requests of the next batch, or None if the batcher was stopped."""
+        request = self._queue.get()
+        if request is None:
+            return None
+
+        # Wait for more requests until the batch is full or the latency window has passed
+        batch = [request]
+        size = len(request[0])
+        deadline = time.perf_counter() + self.max_latency
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch
+
+    def _work(self):
+        """Runs batches until the batcher is stopped."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            start = time.perf_counter()
+            features = [vector for (vectors, _, _) in batch for vector in vectors]
+            try:
+                if self.preprocess and features:
+                    features = self.network.data.transform(features)
+                predictions = [
+                    _to_builtin(p) for p in self.network.predict_stream(
+                        features, shots=self.shots, chunk_size=max(len(features), 1),
+                        max_workers=self.max_workers
+                    )
+                ]
+            except Exception as error:
+                with self._lock:
+                    self._num_errors += len(batch)
+                for (_, future, _) in batch:
+                    future.set_exception(error)
+                continue
+
+            # Hand each request its predictions
+            end = time.perf_counter()
+            position = 0
+            for (vectors, future, submitted) in batch:
+                future.set_result(predictions[position:position + len(vectors)])
+                position += len(vectors)
+
+            with self._lock:
+                self._num_batches += 1
+                self._num_requests += len(batch)
+                self._num_predictions += len(features)
+                self._busy += end - start
+                self._latencies.extend(end - submitted for (_, _, submitted) in batch)
+
+    def stats(self):
+        """Returns a dictionary of throughput and latency statistics.
+
+        Keys:
+            requests, predictions, batches, errors: Totals since the batcher started.
+            mean_batch_size: Mean number of feature vectors per batch.
+            throughput: Predictions per second since the batcher started.
+            utilization: Fraction of time spent running batches.
+            latency_mean, latency_p50, latency_p95, latency_p99: Seconds from submitting
+                a request to its predictions, over the most recent requests.
+        """
+        with self._lock:
+            elapsed = 0.0 if self._start_time is None else time.perf_counter() - self._start_time
+            latencies = asarray(self._latencies)
+            stats = dict(
+                requests=self._num_requests,
+                predictions=self._num_predictions,
+                batches=self._num_batches,
+                errors=self._num_errors,
+                mean_batch_size=self._num_predictions / self._num_batches if self._num_batches else 0.0,
+                throughput=self._num_predictions / elapsed if elapsed else 0.0,
+                utilization=self._busy / elapsed if elapsed else 0.0,
+            )
+        stats["latency_mean"] = float(latencies.mean()) if len(latencies) else 0.0
+        for q in (50, 95, 99):
+            stats["latency_p{}".format(q)] = float(percentile(latencies, q)) if len(latencies) else 0.0
+        return stats
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def _to_builtin(value):
+    """Returns NumPy scalars as built-in Python types so they can be written as JSON."""
+    return value.item() if hasattr(value, "item") else value
+
+
+class _PredictionHandler(BaseHTTPRequestHandler):
+    """Handles requests to an InferenceServer. The server is available as self.server."""
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(200, self.server.batcher.stats())
+        elif self.path == "/health":
+            self._reply(200, dict(status="ok"))
+        else:
+            self._reply(404, dict(error="Unknown path {}.".format(self.path)))
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._reply(404, dict(error="Unknown path {}.".format(self.path)))
+            return
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            features = json.loads(body.decode("utf-8"))["features"]
+        except (ValueError, KeyError, TypeError):
+            self._reply(400, dict(error='Expected a JSON object {"features": [[...], ...]}.'))
+            return
+        try:
+            predictions = self.server.batcher.predict(features, timeout=self.server.timeout_seconds)
+        except ValueError as error:
+            self._reply(400, dict(error=str(error)))
+            return
+        except Exception as error:
+            self._reply(500, dict(error=str(error)))
+            return
+        self._reply(200, dict(predictions=predictions))
+
+    def _reply(self, status, content):
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Does not log every request to stderr."""
+        pass
+
+
+class InferenceServer:
+    """HTTP server on the local host which serves the predictions of a trained Network."""
+
+    def __init__(self, network, angles=None, host="127.0.0.1", port=0, shots=1000, max_batch_size=64,
+                 max_latency=0.005, max_workers=None, timeout=60.0, preprocess=True):
+        """Initializes an InferenceServer.
+
+        Args:
+            network : Union[nisqai.network.Network, str]
+                Trained network or the path of an artifact. See MicroBatcher.
+
+            angles : Union[dict, list, numpy.ndarray, str]
+                Trained angles or the path of a Checkpoint. See MicroBatcher.
+
+            host : str (default: "127.0.0.1")
+                Address to listen on. The default only accepts connections from the local host.
+
+            port : int (default: 0)
+                Port to listen on. If zero, a free port is chosen, see InferenceServer.address.
+
+            shots, max_batch_size, max_latency, max_workers, preprocess:
+                See MicroBatcher.
+
+            timeout : float (default: 60.0)
+                Number of seconds a request waits for its predictions.
+        """
+        self.batcher = MicroBatcher(network, angles, shots, max_batch_size, max_latency, max_workers,
+                                    preprocess=preprocess)
+        self._httpd = ThreadingHTTPServer((host, port), _PredictionHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.batcher = self.batcher
+        self._httpd.timeout_seconds = timeout
+        self._thread = None
+
+    @property
+    def address(self):
+        """Returns the (host, port) the server listens on."""
+        return self._httpd.server_address[:2]
+
+    @property
+    def url(self):
+        """Returns the base URL of the server."""
+        return "http://{}:{}".format(*self.address)
+
+    def start(self):
+        """Starts serving requests in a background thread."""
+        self.batcher.start()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="nisqai-inference-server",
+                                        daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serves requests in the current thread until interrupted, then stops the server."""
+        self.batcher.start()
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stops serving requests and closes the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        self.batcher.stop()
+
+    def stats(self):
+        """Returns the throughput and latency statistics. See MicroBatcher.stats."""
+        return self.batcher.stats()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def serve(network, angles=None, host="127.0.0.1", port=8000, **kwargs):
+    """Serves the predictions of a trained network on the local host until interrupted.
+
+    Args:
+        network : Union[nisqai.network.Network, str]
+            Trained network or the path of an artifact. See MicroBatcher.
+
+        angles : Union[dict, list, numpy.ndarray, str]
+            Trained angles or the path of a Checkpoint. See MicroBatcher.
+
+        host : str (default: "127.0.0.1")
+            Address to listen on.
+
+        port : int (default: 8000)
+            Port to listen on.
+
+        kwargs:
+            Other keyword arguments of InferenceServer, e.g. max_latency.
+    """
+    server = InferenceServer(network, angles, host, port, **kwargs)
+    print("Serving predictions on {}".format(server.url))
+    server.serve_forever()
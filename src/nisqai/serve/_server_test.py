@@ -0,0 +1,148 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from numpy import array, pi
+
+from nisqai.data._cdata import LabeledCData
+from nisqai.encode._binary_encoding import BinaryEncoding
+from nisqai.layer._product_ansatz import ProductAnsatz
+from nisqai.measure._measure import Measurement
+from nisqai.network._artifact import save_network
+from nisqai.network._network import Network
+from nisqai.serve._server import InferenceServer, MicroBatcher
+from nisqai.simulate._statevector import StatevectorSimulator
+
+# With these angles, the prediction of a feature vector is its first bit
+ANGLES = [pi, 0.0, 0.0, 0.0]
+
+
+def first_bit(outcome):
+    """Predicts the first measured bit."""
+    return int(outcome.average()[0] > 0.5)
+
+
+def get_network(batched=True):
+    """Returns a network on the statevector simulator which predicts the first bit of each feature vector."""
+    cdata = LabeledCData(array([[1, 0], [0, 1]]), labels=array([1, 0]))
+    layers = [BinaryEncoding(cdata), ProductAnsatz(2, gate_depth=2), Measurement(2, [0, 1])]
+    return Network(layers, StatevectorSimulator(), predictor=first_bit, batched=batched)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Unit tests for MicroBatcher class."""
+
+    def test_coalesce(self):
+        """Tests that concurrent requests are predicted in few batches."""
+        for batched in (False, True):
+            with MicroBatcher(get_network(batched), ANGLES, shots=None, max_latency=0.05) as batcher:
+                futures = [batcher.submit([[ii % 2, 0], [1 - ii % 2, 1]]) for ii in range(10)]
+                for (ii, future) in enumerate(futures):
+                    self.assertEqual(future.result(), [ii % 2, 1 - ii % 2])
+
+                stats = batcher.stats()
+                self.assertEqual(stats["requests"], 10)
+                self.assertEqual(stats["predictions"], 20)
+                self.assertLess(stats["batches"], 10)
+                self.assertGreater(stats["latency_p99"], 0.0)
+
+    def test_max_batch_size(self):
+        """Tests that batches do not grow beyond the maximum size."""
+        with MicroBatcher(get_network(), ANGLES, shots=None, max_batch_size=4, max_latency=0.05) as batcher:
+            futures = [batcher.submit([[1, 0], [0, 0]]) for _ in range(6)]
+            for future in futures:
+                self.assertEqual(future.result(), [1, 0])
+            self.assertGreaterEqual(batcher.stats()["batches"], 3)
+
+    def test_invalid(self):
+        """Tests invalid requests and arguments."""
+        batcher = MicroBatcher(get_network(), ANGLES, shots=None)
+        with self.assertRaises(RuntimeError):
+            batcher.submit([[1, 0]])
+        with batcher:
+            with self.assertRaises(ValueError):
+                batcher.submit([[1, 0, 1]])
+            self.assertEqual(batcher.predict([[0, 1]]), [0])
+        with self.assertRaises(ValueError):
+            MicroBatcher(get_network(), max_batch_size=0)
+
+    def test_artifact(self):
+        """Tests serving a network loaded from an artifact."""
+        qnn = get_network(batched=False)
+        qnn._set_angles(ANGLES)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "model.npz")
+            save_network(qnn, path)
+            with MicroBatcher(path, shots=1000) as batcher:
+                self.assertEqual(batcher.predict([[1, 0], [0, 1]]), [1, 0])
+                self.assertEqual(batcher.network.cache_info()["misses"], 0)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_preprocessed_artifact(self):
+        """Tests that raw feature vectors are preprocessed like the training data of an artifact."""
+        cdata = LabeledCData(array([[4, 2], [2, 4], [4, 4], [2, 2]]), labels=array([1, 0, 1, 0]))
+        cdata.scale_features("min-max norm")
+        cdata.pad_one()
+        layers = [BinaryEncoding(cdata), ProductAnsatz(3, gate_depth=2), Measurement(3, [0])]
+        qnn = Network(layers, StatevectorSimulator(), predictor=first_bit)
+        qnn._set_angles([0.3, 1.2, -0.4, 2.0, 0.5, 0.1])
+
+        raw = [[4, 2], [2, 4], [2, 2]]
+        expected = list(qnn.predict_stream(cdata.transform(raw), shots=None))
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "model.npz")
+            save_network(qnn, path)
+            with MicroBatcher(path, shots=None) as batcher:
+                self.assertEqual(batcher.predict(raw), expected)
+            with MicroBatcher(path, shots=None, preprocess=False) as batcher:
+                with self.assertRaises(ValueError):
+                    batcher.predict(raw)
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestInferenceServer(unittest.TestCase):
+    """Unit tests for InferenceServer class."""
+
+    def test_server(self):
+        """Tests predictions, statistics and errors over HTTP."""
+        with InferenceServer(get_network(), ANGLES, shots=None, max_latency=0.02) as server:
+            def post(features):
+                request = Request(server.url + "/predict", data=json.dumps(dict(features=features)).encode())
+                return json.loads(urlopen(request).read())["predictions"]
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda ii: post([[ii % 2, 1]]), range(16)))
+            self.assertEqual(results, [[ii % 2] for ii in range(16)])
+
+            stats = json.loads(urlopen(server.url + "/stats").read())
+            self.assertEqual(stats["predictions"], 16)
+            self.assertEqual(json.loads(urlopen(server.url + "/health").read()), dict(status="ok"))
+
+            with self.assertRaises(HTTPError) as context:
+                post([[1, 0, 1]])
+            self.assertEqual(context.exception.code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
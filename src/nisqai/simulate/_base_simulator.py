@@ -0,0 +1,337 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Base class for simulators which run pyQuil programs locally with NumPy.
+
+Simulators follow the same interface as a pyquil.api.QuantumComputer, so they
+can be used anywhere a QuantumComputer is used in NISQAI:
+
+    computer.compiler.quil_to_native_quil(program) --> executable
+    computer.run(executable, memory_map) --> numpy.ndarray of sampled bits
+
+"Compiling" a program for a simulator parses it into a SimulatorExecutable:
+fixed gates are converted to matrices once, and only the parameters which
+depend on declared memory are evaluated when the executable is run.
+"""
+
+from functools import lru_cache
+
+from numpy import arange, array, asarray, cos, exp, moveaxis, ones, sin, tile, uint8, zeros
+
+from pyquil.quilatom import BinaryExp, Function, MemoryReference
+from pyquil.quilbase import Declare, Gate, Halt, Measurement, Pragma
+from pyquil.simulation.matrices import QUANTUM_GATES
+
+from nisqai.utils._random import as_generator
+
+
+class SimulatorExecutable:
+    """A pyQuil program parsed into operations which a simulator can apply."""
+
+    def __init__(self, program, qubits=None):
+        """Initializes a SimulatorExecutable.
+
+        Args:
+            program : pyquil.Program
+                Program to parse. Supported instructions are DECLARE, DEFGATE (without
+                parameters), standard gates, terminal MEASUREs, PRAGMA and HALT.
+
+            qubits : Iterable[int]
+                Qubit labels to simulate. Defaults to the qubits in the program. Giving
+                the same qubits to several executables lets them act on the same state.
+        """
+        self.num_shots = program.num_shots
+
+        # Map the qubit labels in the program to positions 0, 1, ..., n - 1
+        self.qubits = sorted(program.get_qubits() if qubits is None else qubits)
+        positions = dict((q, ii) for (ii, q) in enumerate(self.qubits))
+
+        # Matrices of gates defined in the program
+        defined = {}
+        for gate in program.defined_gates:
+            if gate.parameters:
+                raise ValueError("Parametric DEFGATE {} is not supported.".format(gate.name))
+            defined[gate.name] = asarray(gate.matrix, dtype=complex)
+
+        # Size of the readout register
+        self.num_readout = 0
+
+        # Operations are (matrix or matrix function, parameters, qubit positions) tuples.
+        # Measurements are (qubit position, readout offset) tuples.
+        self.operations = []
+        self.measurements = []
+        measured = set()
+        for instruction in program.instructions:
+            if isinstance(instruction, Gate):
+                if instruction.modifiers:
+                    raise ValueError("Gate modifiers are not supported: {}".format(instruction))
+                qubits = tuple(positions[q.index] for q in instruction.qubits)
+                if measured.intersection(qubits):
+                    raise ValueError("Gates after a measurement are not supported: {}".format(instruction))
+                self.operations.append(self._operation(instruction, qubits, defined))
+
+            elif isinstance(instruction, Measurement):
+                if instruction.classical_reg is None:
+                    continue
+                if instruction.classical_reg.name != "ro":
+                    raise ValueError("Measurements must be stored in the ro register.")
+                position = positions[instruction.qubit.index]
+                measured.add(position)
+                self.measurements.append((position, instruction.classical_reg.offset))
+                self.num_readout = max(self.num_readout, instruction.classical_reg.offset + 1)
+
+            elif isinstance(instruction, Declare):
+                if instruction.name == "ro":
+                    self.num_readout = max(self.num_readout, instruction.memory_size)
+
+            elif not isinstance(instruction, (Pragma, Halt)):
+                raise ValueError("Unsupported instruction: {}".format(instruction))
+
+    @property
+    def num_qubits(self):
+        """Returns the number of qubits in the program."""
+        return len(self.qubits)
+
+    @staticmethod
+    def _operation(gate, qubits, defined):
+        """Returns the operation tuple for a gate."""
+        if gate.name in defined:
+            return defined[gate.name], (), qubits
+        if gate.name not in QUANTUM_GATES:
+            raise ValueError("Unsupported gate: {}".format(gate.name))
+
+        matrix = QUANTUM_GATES[gate.name]
+        if not gate.params:
+            return asarray(matrix, dtype=complex), (), qubits
+
+        # Evaluate parameters which do not depend on memory now
+        params = tuple(resolve(p) if not _uses_memory(p) else p for p in gate.params)
+        if not any(_uses_memory(p) for p in params):
+            return asarray(matrix(*params), dtype=complex), (), qubits
+        return matrix, params, qubits
+
+    def matrices(self, memory_map=None):
+        """Yields (matrix, qubit positions) for each gate, using the memory map for parameters.
+
+        Args:
+            memory_map : dict
+                Values of the declared memory regions in the program.
+        """
+        for (matrix, params, qubits) in self.operations:
+            if params:
+                matrix = asarray(matrix(*[resolve(p, memory_map) for p in params]), dtype=complex)
+            yield matrix, qubits
+
+    def batched_matrices(self, batch_memory_map, num_samples):
+        """Yields (matrices, qubit positions) for each gate and a batch of memory maps.
+
+        Gates which depend on memory get an array of shape (num_samples, 2 ** k, 2 ** k)
+        with one matrix per memory map. Other gates get their single (2 ** k, 2 ** k) matrix.
+
+        Args:
+            batch_memory_map : dict
+                Values of the declared memory regions for all memory maps in the batch.
+                Each region is an array of shape (memory size, num_samples), so that
+                batch_memory_map[name][offset] is the vector of values in the batch.
+
+            num_samples : int
+                Number of memory maps in the batch.
+        """
+        for (matrix, params, qubits) in self.operations:
+            if params:
+                values = [resolve(p, batch_memory_map) * ones(num_samples) for p in params]
+                if matrix.__name__ in _BATCHED_GATES:
+                    matrix = _BATCHED_GATES[matrix.__name__](*values)
+                else:
+                    matrix = array([matrix(*args) for args in zip(*values)], dtype=complex)
+            yield matrix, qubits
+
+
+def _rx(phi):
+    """Returns RX matrices of shape (len(phi), 2, 2)."""
+    c, s = cos(phi / 2), -1j * sin(phi / 2)
+    return moveaxis(array([[c, s], [s, c]], dtype=complex), -1, 0)
+
+
+def _ry(phi):
+    """Returns RY matrices of shape (len(phi), 2, 2)."""
+    c, s = cos(phi / 2), sin(phi / 2)
+    return moveaxis(array([[c, -s], [s, c]], dtype=complex), -1, 0)
+
+
+def _rz(phi):
+    """Returns RZ matrices of shape (len(phi), 2, 2)."""
+    matrices = zeros((len(phi), 2, 2), dtype=complex)
+    matrices[:, 0, 0] = exp(-0.5j * phi)
+    matrices[:, 1, 1] = exp(0.5j * phi)
+    return matrices
+
+
+def _phase(phi):
+    """Returns PHASE matrices of shape (len(phi), 2, 2)."""
+    matrices = zeros((len(phi), 2, 2), dtype=complex)
+    matrices[:, 0, 0] = 1.0
+    matrices[:, 1, 1] = exp(1j * phi)
+    return matrices
+
+
+# Vectorized versions of the parametric gates used by the NISQAI encodings
+_BATCHED_GATES = {"RX": _rx, "RY": _ry, "RZ": _rz, "PHASE": _phase}
+
+
+def _uses_memory(param):
+    """Returns True if the parameter depends on a memory reference."""
+    if isinstance(param, MemoryReference):
+        return True
+    if isinstance(param, BinaryExp):
+        return _uses_memory(param.op1) or _uses_memory(param.op2)
+    if isinstance(param, Function):
+        return _uses_memory(param.expression)
+    return False
+
+
+def resolve(param, memory_map=None):
+    """Returns the numerical value of a gate parameter.
+
+    Args:
+        param : Union[float, complex, pyquil.quilatom.Expression]
+            Gate parameter, possibly an expression of memory references.
+
+        memory_map : dict
+            Values of the declared memory regions, in the format of pyQuil memory maps.
+    """
+    if isinstance(param, MemoryReference):
+        if memory_map is None or param.name not in memory_map:
+            raise ValueError("No value given for memory region {}.".format(param.name))
+        return memory_map[param.name][param.offset]
+    if isinstance(param, BinaryExp):
+        return param.fn(resolve(param.op1, memory_map), resolve(param.op2, memory_map))
+    if isinstance(param, Function):
+        return param.fn(resolve(param.expression, memory_map))
+    return param
+
+
+class BaseSimulator:
+    """Base class for NumPy simulators with the interface of a pyquil.api.QuantumComputer."""
+
+    def __init__(self, name, seed=None):
+        """Initializes a BaseSimulator.
+
+        Args:
+            name : str
+                Name of the simulator.
+
+            seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+                Seed for the random number generator used to sample measurement outcomes.
+                See nisqai.utils.as_generator.
+        """
+        self.name = name
+        self.rng = as_generator(seed)
+
+    @property
+    def compiler(self):
+        """Returns the simulator, which parses programs in place of a compiler."""
+        return self
+
+    def quil_to_native_quil(self, program):
+        """Returns the program parsed into a SimulatorExecutable."""
+        return SimulatorExecutable(program)
+
+    def _executable(self, executable):
+        """Returns a SimulatorExecutable, parsing the input if it is a pyquil.Program."""
+        if isinstance(executable, SimulatorExecutable):
+            return executable
+        return SimulatorExecutable(executable)
+
+    def probabilities(self, executable, memory_map=None):
+        """Returns the probabilities of all outcomes of the readout register.
+
+        The returned array has length 2 ** (size of the readout register). The bit
+        stored in ro[0] is the most significant bit of the index.
+        """
+        raise NotImplementedError
+
+    def run(self, executable, memory_map=None, rng=None):
+        """Runs the executable and returns sampled bits as an array of shape (shots, size of ro).
+
+        Args:
+            executable : Union[SimulatorExecutable, pyquil.Program]
+                Program to run.
+
+            memory_map : dict
+                Values of the declared memory regions in the program.
+
+            rng : numpy.random.Generator (default: None)
+                Generator to sample with instead of the generator of the simulator,
+                e.g. a child generator of a parallel job. See nisqai.utils.spawn_generators.
+        """
+        executable = self._executable(executable)
+        probs = self.probabilities(executable, memory_map)
+        return self.sample(probs, executable.num_shots, rng)
+
+    def sample(self, probs, shots, rng=None):
+        """Returns sampled bits as a uint8 array of shape (shots, number of bits).
+
+        The number of shots of each outcome is drawn from one multinomial distribution,
+        and the shots are then shuffled, so they are in random order as on a QVM.
+
+        Args:
+            probs : numpy.ndarray
+                Probabilities of all outcomes of the readout register, with ro[0]
+                the most significant bit of the index.
+
+            shots : int
+                Number of samples.
+
+            rng : numpy.random.Generator (default: None)
+                Generator to sample with. Defaults to the generator of the simulator.
+        """
+        rng = self.rng if rng is None else rng
+        counts = rng.multinomial(shots, asarray(probs, dtype=float))
+        outcomes = arange(len(probs)).repeat(counts)
+        rng.shuffle(outcomes)
+        return bit_table(len(probs))[outcomes]
+
+    def sample_batch(self, probs, shots, rng=None):
+        """Returns sampled bits for many probability vectors as a uint8 array of shape (len(probs), shots, number of bits).
+
+        The shots of each probability vector are in random order. See BaseSimulator.sample.
+
+        Args:
+            probs : numpy.ndarray
+                Array of shape (num_samples, 2 ** number of bits) with the probabilities
+                of all outcomes of the readout register in each row. See BaseSimulator.sample.
+
+            shots : int
+                Number of samples of each row.
+
+            rng : numpy.random.Generator (default: None)
+                Generator to sample with. Defaults to the generator of the simulator.
+        """
+        rng = self.rng if rng is None else rng
+        probs = asarray(probs, dtype=float)
+        counts = rng.multinomial(shots, probs)
+        outcomes = tile(arange(probs.shape[1]), len(probs)).repeat(counts.ravel()).reshape(len(probs), shots)
+        return bit_table(probs.shape[1])[rng.permuted(outcomes, axis=1)]
+
+
+@lru_cache(maxsize=None)
+def bit_table(num_outcomes):
+    """Returns the bits of all outcomes as a read-only uint8 array of shape (num_outcomes, number of bits).
+
+    Row i holds the bits of the integer i with the first bit the most significant.
+    """
+    num_bits = int(num_outcomes).bit_length() - 1
+    shifts = arange(num_bits - 1, -1, -1)
+    table = ((arange(num_outcomes)[:, None] >> shifts) & 1).astype(uint8)
+    table.flags.writeable = False
+    return table
@@ -0,0 +1,116 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+# Imports
+import unittest
+
+from numpy import array, pi, uint8
+
+from pyquil import Program
+from pyquil.gates import CNOT, H, MEASURE, RX, X
+from pyquil.quilatom import MemoryReference
+
+from nisqai.simulate._base_simulator import SimulatorExecutable, bit_table, resolve
+from nisqai.simulate._statevector import StatevectorSimulator
+
+
+class SimulatorExecutableTest(unittest.TestCase):
+    """Unit tests for SimulatorExecutable."""
+
+    def test_parse(self):
+        """Tests parsing a program with non-contiguous qubit labels."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=2)
+        prog += [H(3), CNOT(3, 7), MEASURE(7, ro[0]), MEASURE(3, ro[1])]
+        exe = SimulatorExecutable(prog)
+
+        self.assertEqual(exe.num_qubits, 2)
+        self.assertEqual(exe.qubits, [3, 7])
+        self.assertEqual(len(exe.operations), 2)
+        self.assertEqual(exe.measurements, [(1, 0), (0, 1)])
+        self.assertEqual(exe.num_readout, 2)
+
+    def test_parametric_gate(self):
+        """Tests that memory references are resolved from the memory map."""
+        prog = Program()
+        theta = prog.declare("theta", "REAL")
+        prog += RX(2 * theta, 0)
+        exe = SimulatorExecutable(prog)
+
+        # The parameter is only known once a memory map is given
+        with self.assertRaises(ValueError):
+            list(exe.matrices())
+
+        (matrix, qubits), = exe.matrices({"theta": [pi / 2]})
+        self.assertEqual(qubits, (0,))
+        self.assertAlmostEqual(abs(matrix[1, 0]), 1.0)
+
+    def test_unsupported(self):
+        """Tests that gates after a measurement raise an error."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=1)
+        prog += [MEASURE(0, ro[0]), X(0)]
+        with self.assertRaises(ValueError):
+            SimulatorExecutable(prog)
+
+    def test_resolve(self):
+        """Tests resolving parameter expressions."""
+        ref = MemoryReference("a", offset=1)
+        self.assertAlmostEqual(resolve(3 * ref + 1, {"a": [0.0, 2.0]}), 7.0)
+        self.assertEqual(resolve(0.5), 0.5)
+
+
+class SamplingTest(unittest.TestCase):
+    """Unit tests for sampling bits from exact probabilities."""
+
+    def test_bit_table(self):
+        """Tests that the first bit is the most significant bit of the outcome."""
+        self.assertEqual(bit_table(4).tolist(), [[0, 0], [0, 1], [1, 0], [1, 1]])
+        self.assertEqual(bit_table(8).dtype, uint8)
+
+    def test_sample(self):
+        """Tests the shape and frequencies of sampled bits."""
+        sim = StatevectorSimulator(seed=1)
+        bits = sim.sample(array([0.0, 0.25, 0.0, 0.75]), 4000)
+        self.assertEqual(bits.shape, (4000, 2))
+        self.assertEqual(bits.dtype, uint8)
+        self.assertTrue((bits[:, 1] == 1).all())
+        self.assertAlmostEqual(bits[:, 0].mean(), 0.75, delta=0.03)
+
+    def test_sample_batch(self):
+        """Tests sampling many probability vectors at once."""
+        sim = StatevectorSimulator(seed=2)
+        probs = array([[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], [0.5, 0.0, 0.5, 0.0]])
+        bits = sim.sample_batch(probs, 1000)
+        self.assertEqual(bits.shape, (3, 1000, 2))
+        self.assertTrue((bits[0] == 0).all())
+        self.assertTrue((bits[1] == 1).all())
+        self.assertTrue((bits[2, :, 1] == 0).all())
+        self.assertAlmostEqual(bits[2, :, 0].mean(), 0.5, delta=0.06)
+
+        # The same seed gives the same samples
+        self.assertEqual(StatevectorSimulator(seed=3).sample_batch(probs, 50).tolist(),
+                         StatevectorSimulator(seed=3).sample_batch(probs, 50).tolist())
+
+    def test_shot_order(self):
+        """Tests that sampled shots are in random order rather than grouped by outcome."""
+        sim = StatevectorSimulator(seed=4)
+        probs = array([0.25, 0.25, 0.25, 0.25])
+        for bits in (sim.sample(probs, 400), sim.sample_batch(array([probs, probs]), 400)[1]):
+            # A prefix of the shots sees every outcome with about the right frequency
+            prefix = bits[:100, 0] * 2 + bits[:100, 1]
+            self.assertEqual(sorted(set(prefix.tolist())), [0, 1, 2, 3])
+            self.assertAlmostEqual((prefix == 0).mean(), 0.25, delta=0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
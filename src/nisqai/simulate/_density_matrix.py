@@ -0,0 +1,229 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""NumPy density matrix simulator with noise channels for the circuits written by NISQAI networks."""
+
+import threading
+
+from numpy import array, clip, eye, kron, moveaxis, sqrt, tensordot, zeros
+
+from nisqai.simulate._base_simulator import BaseSimulator
+from nisqai.simulate._statevector import apply_gate, marginal_probabilities
+
+# Maximum number of qubits of a run of gates fused into one superoperator
+MAX_FUSED_QUBITS = 2
+
+# Pauli matrices for the depolarizing channel
+_PAULIS = (
+    array([[0, 1], [1, 0]], dtype=complex),
+    array([[0, -1j], [1j, 0]], dtype=complex),
+    array([[1, 0], [0, -1]], dtype=complex),
+)
+
+
+def depolarizing_kraus(p):
+    """Returns the Kraus operators of the single qubit depolarizing channel
+
+        rho --> (1 - p) rho + p I / 2.
+
+    Args:
+        p : float
+            Depolarizing probability in [0, 1].
+    """
+    return [sqrt(1 - 3 * p / 4) * eye(2, dtype=complex)] + [sqrt(p / 4) * pauli for pauli in _PAULIS]
+
+
+def amplitude_damping_kraus(gamma):
+    """Returns the Kraus operators of the single qubit amplitude damping channel, which decays |1> to |0>.
+
+    Args:
+        gamma : float
+            Probability in [0, 1] that |1> decays to |0>.
+    """
+    return [array([[1, 0], [0, sqrt(1 - gamma)]], dtype=complex),
+            array([[0, sqrt(gamma)], [0, 0]], dtype=complex)]
+
+
+def kraus_superoperator(kraus):
+    """Returns the superoperator sum_k K (x) K* of a channel with the given Kraus operators.
+
+    The superoperator acts on a density matrix flattened with the row index first,
+    i.e. on the pairs (row qubits, column qubits).
+    """
+    return sum(kron(op, op.conj()) for op in kraus)
+
+
+def _fuse(block, qubits):
+    """Returns (superoperator, qubits) of the superoperators in the block applied in order.
+
+    Args:
+        block : list[tuple[numpy.ndarray, tuple[int]]]
+            Superoperators and the qubit positions they act on, all within qubits.
+
+        qubits : tuple[int]
+            Qubit positions of the fused superoperator.
+    """
+    if len(block) == 1:
+        return block[0]
+    m = len(qubits)
+    tensor = eye(4 ** m, dtype=complex).reshape((2,) * 2 * m + (4 ** m,))
+    for (superop, op_qubits) in block:
+        axes = [qubits.index(q) for q in op_qubits]
+        tensor = apply_gate(tensor, superop, axes + [m + ii for ii in axes])
+    return tensor.reshape(4 ** m, 4 ** m), qubits
+
+
+class DensityMatrixSimulator(BaseSimulator):
+    """Simulates pyQuil programs with a NumPy density matrix and noise channels.
+
+    Every gate is followed by a depolarizing channel and then an amplitude damping channel
+    on each qubit it acts on. Each gate and its noise are fused into one superoperator,
+    which is applied to the density matrix with a single tensor contraction. The fused
+    superoperators of gates which do not depend on memory (e.g. CNOT, RX(pi / 2) or the
+    DEFGATEs of encodings) are cached by matrix. Readout errors flip measured bits.
+
+    Supports the same gates as StatevectorSimulator.
+
+    Example usage:
+
+        >>> computer = DensityMatrixSimulator(depolarizing=0.01, amplitude_damping=0.02, readout_error=0.03)
+        >>> qnn = Network([encoder, ansatz, measure], computer)
+    """
+
+    def __init__(self, depolarizing=0.0, amplitude_damping=0.0, readout_error=0.0, seed=None, cache_size=1024):
+        """Initializes a DensityMatrixSimulator.
+
+        Args:
+            depolarizing : float (default: 0.0)
+                Depolarizing probability of each qubit after each gate acting on it.
+                See depolarizing_kraus.
+
+            amplitude_damping : float (default: 0.0)
+                Decay probability of each qubit after each gate acting on it.
+                See amplitude_damping_kraus.
+
+            readout_error : Union[float, tuple[float, float]] (default: 0.0)
+                Probability that a measured bit is flipped, or the probabilities
+                (p(read 1 | 0), p(read 0 | 1)) of flipping zeros and ones.
+
+            seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+                Seed for the random number generator used to sample measurement outcomes.
+
+            cache_size : int (default: 1024)
+                Maximum number of fused superoperators of fixed gates to keep in memory.
+        """
+        super().__init__("numpy-density-matrix", seed)
+        if isinstance(readout_error, (int, float)):
+            readout_error = (readout_error, readout_error)
+        for prob in (depolarizing, amplitude_damping) + tuple(readout_error):
+            if not 0 <= prob <= 1:
+                raise ValueError("Noise probabilities must be in [0, 1].")
+
+        self.depolarizing = depolarizing
+        self.amplitude_damping = amplitude_damping
+        self.readout_error = tuple(readout_error)
+
+        # Superoperator of the noise after a gate on each qubit, or None without noise
+        self._noise = None
+        if depolarizing or amplitude_damping:
+            self._noise = (kraus_superoperator(amplitude_damping_kraus(amplitude_damping)) @
+                           kraus_superoperator(depolarizing_kraus(depolarizing)))
+
+        # Confusion matrix of a measured bit: confusion[read, actual]
+        (p01, p10) = self.readout_error
+        self._confusion = array([[1 - p01, p10], [p01, 1 - p10]])
+
+        self._cache_size = cache_size
+        self._superoperators = {}
+        self._lock = threading.Lock()
+
+    def _superoperator(self, matrix):
+        """Returns the superoperator of the gate followed by the noise on each of its qubits.
+
+        The superoperator acts on the axes (row qubits, column qubits) of the gate.
+        """
+        k = matrix.shape[0].bit_length() - 1
+        superop = kron(matrix, matrix.conj())
+        if self._noise is not None and k == 1:
+            superop = self._noise @ superop
+        elif self._noise is not None:
+            # Apply the noise of each qubit to the (row, column) pair of its output axes
+            tensor = superop.reshape((2,) * 2 * k + (4 ** k,))
+            for ii in range(k):
+                tensor = apply_gate(tensor, self._noise, (ii, k + ii))
+            superop = tensor.reshape(4 ** k, 4 ** k)
+        return superop
+
+    def _fixed_superoperator(self, matrix):
+        """Returns the superoperator of a gate which does not depend on memory, from the cache if possible."""
+        key = (matrix.shape, matrix.tobytes())
+        superop = self._superoperators.get(key)
+        if superop is None:
+            superop = self._superoperator(matrix)
+            with self._lock:
+                if len(self._superoperators) >= self._cache_size > 0:
+                    self._superoperators.pop(next(iter(self._superoperators)))
+                if self._cache_size > 0:
+                    self._superoperators[key] = superop
+        return superop
+
+    def density_matrix(self, executable, memory_map=None):
+        """Returns the final density matrix before measurement as a tensor of shape (2, ..., 2).
+
+        The first n axes are the row qubits and the last n axes the column qubits,
+        where axis i corresponds to the i-th smallest qubit label in the program.
+        """
+        executable = self._executable(executable)
+        n = executable.num_qubits
+        rho = zeros((2,) * 2 * n, dtype=complex)
+        rho[(0,) * 2 * n] = 1.0
+
+        for (superop, qubits) in self._blocks(executable, memory_map):
+            rho = apply_gate(rho, superop, qubits + tuple(n + q for q in qubits))
+        return rho
+
+    def _blocks(self, executable, memory_map):
+        """Yields (superoperator, qubit positions) of runs of consecutive gates on at most MAX_FUSED_QUBITS qubits.
+
+        Each run is fused into one superoperator, so the density matrix is contracted once per run.
+        """
+        block, block_qubits = [], ()
+        for (operation, (matrix, qubits)) in zip(executable.operations, executable.matrices(memory_map)):
+            superop = self._superoperator(matrix) if operation[1] else self._fixed_superoperator(matrix)
+            union = tuple(sorted(set(block_qubits).union(qubits)))
+            if block and len(union) > MAX_FUSED_QUBITS:
+                yield _fuse(block, block_qubits)
+                block, union = [], tuple(sorted(qubits))
+            block.append((superop, qubits))
+            block_qubits = union
+        if block:
+            yield _fuse(block, block_qubits)
+
+    def probabilities(self, executable, memory_map=None):
+        """Returns the probabilities of all outcomes of the readout register, including readout errors.
+
+        The returned array has length 2 ** (size of the readout register). The bit
+        stored in ro[0] is the most significant bit of the index.
+        """
+        executable = self._executable(executable)
+        n = executable.num_qubits
+        rho = self.density_matrix(executable, memory_map).reshape(2 ** n, 2 ** n)
+        probs = clip(rho.diagonal().real, 0.0, None).reshape((2,) * n)
+        probs = marginal_probabilities(probs, executable.measurements, executable.num_readout)
+
+        # Flip each measured bit according to the confusion matrix
+        if self.readout_error != (0, 0):
+            probs = probs.reshape((2,) * executable.num_readout)
+            for (_, offset) in executable.measurements:
+                probs = moveaxis(tensordot(self._confusion, probs, axes=(1, offset)), 0, offset)
+            probs = probs.reshape(-1)
+        return probs / probs.sum()
@@ -0,0 +1,122 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+# Imports
+import unittest
+
+from numpy import allclose, array, cos, eye, kron, sin, trace, zeros
+
+from pyquil import Program
+from pyquil.gates import CNOT, CZ, H, MEASURE, RX, RY, RZ, X
+
+from nisqai.data._cdata import CData
+from nisqai.encode._dense_angle_encoding import DenseAngleEncoding
+from nisqai.encode._encoders import angle_simple_linear
+from nisqai.encode._feature_maps import direct
+from nisqai.simulate._density_matrix import (
+    DensityMatrixSimulator, amplitude_damping_kraus, depolarizing_kraus
+)
+from nisqai.simulate._statevector import StatevectorSimulator
+
+
+class DensityMatrixSimulatorTest(unittest.TestCase):
+    """Unit tests for DensityMatrixSimulator."""
+
+    @staticmethod
+    def program():
+        """Returns a program with one and two qubit gates measuring two of three qubits."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=2)
+        x = prog.declare("x", "REAL", 1)
+        prog += [H(0), CNOT(0, 2), RX(0.3, 1), CZ(1, 2), RY(x[0], 0), RZ(0.7, 2), CNOT(2, 1),
+                 MEASURE(2, ro[0]), MEASURE(0, ro[1])]
+        return prog
+
+    def test_kraus(self):
+        """Tests that the noise channels preserve the trace."""
+        for kraus in (depolarizing_kraus(0.3), amplitude_damping_kraus(0.4)):
+            self.assertTrue(allclose(sum(op.conj().T @ op for op in kraus), eye(2)))
+
+    def test_noiseless(self):
+        """Tests that the noiseless simulator matches the statevector simulator."""
+        prog = self.program()
+        expected = StatevectorSimulator().probabilities(prog, {"x": [1.1]})
+        self.assertTrue(allclose(DensityMatrixSimulator().probabilities(prog, {"x": [1.1]}), expected))
+
+        # Gates defined by the encodings
+        encoder = DenseAngleEncoding(CData(array([[0.5, 0.2]])), angle_simple_linear, direct(1))
+        prog = encoder[0].circuit
+        ro = prog.declare("ro", memory_size=1)
+        prog += MEASURE(0, ro[0])
+        self.assertTrue(allclose(DensityMatrixSimulator().probabilities(prog),
+                                 StatevectorSimulator().probabilities(prog)))
+
+    def test_noise(self):
+        """Tests the noise channels against applying their Kraus operators to the full density matrix."""
+        p, gamma = 0.1, 0.2
+        sim = DensityMatrixSimulator(depolarizing=p, amplitude_damping=gamma)
+
+        prog = Program()
+        ro = prog.declare("ro", memory_size=2)
+        prog += [H(0), CNOT(0, 1), RY(0.4, 1), MEASURE(0, ro[0]), MEASURE(1, ro[1])]
+
+        def noise(rho, qubit):
+            for kraus in (depolarizing_kraus(p), amplitude_damping_kraus(gamma)):
+                ops = [kron(op, eye(2)) if qubit == 0 else kron(eye(2), op) for op in kraus]
+                rho = sum(op @ rho @ op.conj().T for op in ops)
+            return rho
+
+        h = array([[1, 1], [1, -1]]) / 2 ** 0.5
+        cnot = array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+        ry = array([[cos(0.2), -sin(0.2)], [sin(0.2), cos(0.2)]])
+        rho = zeros((4, 4))
+        rho[0, 0] = 1.0
+        for (matrix, qubits) in ((kron(h, eye(2)), (0,)), (cnot, (0, 1)), (kron(eye(2), ry), (1,))):
+            rho = matrix @ rho @ matrix.conj().T
+            for qubit in qubits:
+                rho = noise(rho, qubit)
+
+        self.assertAlmostEqual(trace(rho).real, 1.0)
+        self.assertTrue(allclose(sim.probabilities(prog), rho.diagonal().real))
+
+    def test_limits(self):
+        """Tests fully depolarizing and damping channels and readout errors."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=1)
+        prog += [X(0), MEASURE(0, ro[0])]
+        self.assertTrue(allclose(DensityMatrixSimulator(depolarizing=1.0).probabilities(prog), [0.5, 0.5]))
+        self.assertTrue(allclose(DensityMatrixSimulator(amplitude_damping=1.0).probabilities(prog), [1.0, 0.0]))
+        self.assertTrue(allclose(
+            DensityMatrixSimulator(amplitude_damping=0.3, readout_error=(0.0, 0.1)).probabilities(prog), [0.37, 0.63]
+        ))
+
+        # Readout errors flip each measured bit independently
+        prog = self.program()
+        exact = DensityMatrixSimulator().probabilities(prog, {"x": [0.5]})
+        noisy = DensityMatrixSimulator(readout_error=0.1).probabilities(prog, {"x": [0.5]})
+        flip = array([[0.9, 0.1], [0.1, 0.9]])
+        self.assertTrue(allclose(noisy, kron(flip, flip) @ exact))
+
+        with self.assertRaises(ValueError):
+            DensityMatrixSimulator(depolarizing=1.5)
+
+    def test_run(self):
+        """Tests sampling from the noisy simulator."""
+        prog = self.program()
+        prog.wrap_in_numshots_loop(50)
+        sim = DensityMatrixSimulator(depolarizing=0.05, seed=1)
+        exe = sim.compiler.quil_to_native_quil(prog)
+        self.assertEqual(sim.run(exe, {"x": [0.2]}).shape, (50, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Pure NumPy statevector simulator for the circuits written by NISQAI networks."""
+
+from numpy import abs as npabs, clip, eye, matmul, moveaxis, tensordot, transpose, zeros
+
+from nisqai.simulate._base_simulator import BaseSimulator
+
+
+def apply_gate(state, matrix, qubits, offset=0):
+    """Returns the state after applying the gate.
+
+    Args:
+        state : numpy.ndarray
+            State as a tensor of shape (2, 2, ..., 2) with one axis per qubit,
+            possibly after some leading axes (e.g., for a batch of states).
+
+        matrix : numpy.ndarray
+            Matrix of the gate, of shape (2 ** k, 2 ** k) for a k qubit gate.
+            The first qubit is the most significant bit, as in pyQuil.
+
+        qubits : tuple[int]
+            Qubits the gate acts on.
+
+        offset : int
+            Number of leading axes of the state before the qubit axes.
+    """
+    k = len(qubits)
+    axes = [offset + q for q in qubits]
+    tensor = matrix.reshape((2,) * 2 * k)
+    state = tensordot(tensor, state, axes=(list(range(k, 2 * k)), axes))
+
+    # tensordot puts the output axes of the gate first, so move them back
+    return moveaxis(state, list(range(k)), axes)
+
+
+def apply_batched_gate(states, matrices, qubits):
+    """Returns the states after applying a different matrix of the same gate to each state.
+
+    Args:
+        states : numpy.ndarray
+            Batch of states as a tensor of shape (num_samples, 2, 2, ..., 2).
+
+        matrices : numpy.ndarray
+            Matrices of the gate, of shape (num_samples, 2 ** k, 2 ** k).
+
+        qubits : tuple[int]
+            Qubits the gate acts on.
+    """
+    k = len(qubits)
+    axes = [1 + q for q in qubits]
+
+    # Bring the qubits of the gate next to the batch axis and apply all matrices in one matmul
+    states = moveaxis(states, axes, list(range(1, k + 1)))
+    shape = states.shape
+    states = matmul(matrices, states.reshape(shape[0], 2 ** k, -1))
+    return moveaxis(states.reshape(shape), list(range(1, k + 1)), axes)
+
+
+def marginal_probabilities(probs, measurements, num_readout, offset=0):
+    """Returns the probabilities of the readout register from the probabilities of all qubits.
+
+    Args:
+        probs : numpy.ndarray
+            Probabilities as a tensor of shape (2, 2, ..., 2) with one axis per qubit,
+            possibly after some leading axes (e.g., for a batch of states).
+
+        measurements : list[tuple[int, int]]
+            (qubit position, readout offset) for each measurement.
+
+        num_readout : int
+            Size of the readout register.
+
+        offset : int
+            Number of leading axes of the probabilities before the qubit axes.
+
+    Returns:
+        Array of shape (leading axes..., 2 ** num_readout) with ro[0] the most
+        significant bit. Readout bits which are never measured are zero.
+    """
+    lead = probs.shape[:offset]
+    num_qubits = probs.ndim - offset
+    measured = [q for (q, _) in measurements]
+
+    # Sum over the qubits which are not measured
+    unmeasured = tuple(offset + q for q in range(num_qubits) if q not in measured)
+    marginal = probs.sum(axis=unmeasured) if unmeasured else probs
+
+    # Order the remaining axes by readout offset
+    remaining = sorted(measured)
+    order = [remaining.index(q) for (q, _) in sorted(measurements, key=lambda m: m[1])]
+    marginal = transpose(marginal, list(range(offset)) + [offset + ii for ii in order])
+
+    # Place the measured bits in the readout register
+    out = zeros(lead + (2,) * num_readout)
+    index = [slice(None)] * offset + [0] * num_readout
+    for (_, ro_offset) in measurements:
+        index[offset + ro_offset] = slice(None)
+    out[tuple(index)] = marginal
+    return out.reshape(lead + (-1,))
+
+
+class StatevectorSimulator(BaseSimulator):
+    """Simulates pyQuil programs with a pure NumPy statevector.
+
+    Supports the gates written by NISQAI layers (RX, RY, RZ, CNOT, CZ, H, X, Z, PHASE,
+    and the other standard pyQuil gates), gates defined by DEFGATE matrices in the
+    encodings, and MEASURE at the end of the circuit.
+
+    Example usage:
+
+        >>> qnn = Network([encoder, ansatz, measure], StatevectorSimulator(seed=1))
+    """
+
+    def __init__(self, seed=None):
+        """Initializes a StatevectorSimulator.
+
+        Args:
+            seed : Union[int, numpy.random.SeedSequence, numpy.random.Generator]
+                Seed for the random number generator used to sample measurement outcomes.
+        """
+        super().__init__("numpy-statevector", seed)
+
+    def wavefunction(self, executable, memory_map=None):
+        """Returns the final state before measurement as a tensor with one axis per qubit.
+
+        Axis i corresponds to the i-th smallest qubit label in the program.
+        """
+        executable = self._executable(executable)
+        state = zeros((2,) * executable.num_qubits, dtype=complex)
+        state[(0,) * executable.num_qubits] = 1.0
+
+        for (matrix, qubits) in executable.matrices(memory_map):
+            state = apply_gate(state, matrix, qubits)
+        return state
+
+    def unitary(self, executable, memory_map=None):
+        """Returns the unitary matrix of the gates in the executable.
+
+        The first qubit (smallest label) is the most significant bit of the
+        row and column indices.
+        """
+        executable = self._executable(executable)
+        dim = 2 ** executable.num_qubits
+
+        # Row j of the propagated identity is the image of basis state j
+        states = eye(dim, dtype=complex).reshape((dim,) + (2,) * executable.num_qubits)
+        for (matrix, qubits) in executable.matrices(memory_map):
+            states = apply_gate(states, matrix, qubits, offset=1)
+        return states.reshape(dim, dim).T
+
+    def batch_wavefunctions(self, executable, batch_memory_map, num_samples):
+        """Returns the final states for a batch of memory maps, starting from all zeros.
+
+        Args:
+            executable : Union[SimulatorExecutable, pyquil.Program]
+                Program to simulate.
+
+            batch_memory_map : dict
+                Memory maps of the batch. See SimulatorExecutable.batched_matrices.
+
+            num_samples : int
+                Number of memory maps in the batch.
+
+        Returns:
+            Array of shape (num_samples, 2, 2, ..., 2) with one axis per qubit after the batch axis.
+        """
+        executable = self._executable(executable)
+        states = zeros((num_samples,) + (2,) * executable.num_qubits, dtype=complex)
+        states[(slice(None),) + (0,) * executable.num_qubits] = 1.0
+
+        for (matrix, qubits) in executable.batched_matrices(batch_memory_map, num_samples):
+            if matrix.ndim == 3:
+                states = apply_batched_gate(states, matrix, qubits)
+            else:
+                states = apply_gate(states, matrix, qubits, offset=1)
+        return states
+
+    def batch_probabilities(self, states, executable, memory_map=None):
+        """Returns the probabilities of the readout register after running the executable on each state.
+
+        All states are evolved by a single matrix multiplication with the unitary of the executable.
+
+        Args:
+            states : numpy.ndarray
+                Initial states of shape (num_samples, 2, 2, ..., 2), e.g. from batch_wavefunctions.
+
+            executable : Union[SimulatorExecutable, pyquil.Program]
+                Program to run on every state. Must act on the same qubits as the states.
+
+            memory_map : dict
+                Values of the declared memory regions in the program, shared by all states.
+
+        Returns:
+            Array of shape (num_samples, 2 ** size of the readout register).
+        """
+        executable = self._executable(executable)
+        num_samples = states.shape[0]
+        final = states.reshape(num_samples, -1) @ self.unitary(executable, memory_map).T
+        probs = npabs(final.reshape(states.shape)) ** 2
+        probs = marginal_probabilities(
+            probs, executable.measurements, executable.num_readout, offset=1
+        )
+
+        # Remove rounding errors so the probabilities can be sampled from
+        probs = clip(probs, 0.0, None)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def probabilities(self, executable, memory_map=None):
+        """Returns the probabilities of all outcomes of the readout register.
+
+        The returned array has length 2 ** (size of the readout register). The bit
+        stored in ro[0] is the most significant bit of the index.
+        """
+        executable = self._executable(executable)
+        probs = npabs(self.wavefunction(executable, memory_map)) ** 2
+        probs = marginal_probabilities(probs, executable.measurements, executable.num_readout)
+
+        # Remove rounding errors so the probabilities can be sampled from
+        probs = clip(probs, 0.0, None)
+        return probs / probs.sum()
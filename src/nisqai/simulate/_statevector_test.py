@@ -0,0 +1,108 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+# Imports
+import unittest
+
+from numpy import allclose, array, cos, pi, sin
+
+from pyquil import Program
+from pyquil.gates import CNOT, H, MEASURE, RY, RZ
+
+from nisqai.data._cdata import CData
+from nisqai.encode._dense_angle_encoding import DenseAngleEncoding
+from nisqai.encode._encoders import angle_simple_linear
+from nisqai.encode._feature_maps import direct
+from nisqai.simulate._statevector import StatevectorSimulator, apply_gate
+
+
+class StatevectorSimulatorTest(unittest.TestCase):
+    """Unit tests for StatevectorSimulator."""
+
+    @staticmethod
+    def bell_program(shots):
+        """Returns a program which prepares and measures a Bell state."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=2)
+        prog += [H(0), CNOT(0, 1), MEASURE(0, ro[0]), MEASURE(1, ro[1])]
+        prog.wrap_in_numshots_loop(shots)
+        return prog
+
+    def test_apply_gate(self):
+        """Tests that the first qubit of a gate is the most significant bit."""
+        state = array([1, 0, 0, 0], dtype=complex).reshape(2, 2)
+        cnot = array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+        flip = array([[0, 1], [1, 0]])
+        state = apply_gate(state, flip, (1,))
+        state = apply_gate(state, cnot, (1, 0))
+        self.assertTrue(allclose(state.reshape(-1), [0, 0, 0, 1]))
+
+    def test_bell_probabilities(self):
+        """Tests the probabilities of a Bell state."""
+        sim = StatevectorSimulator()
+        probs = sim.probabilities(self.bell_program(10))
+        self.assertTrue(allclose(probs, [0.5, 0, 0, 0.5]))
+
+    def test_run(self):
+        """Tests that sampled bits are correlated for a Bell state."""
+        sim = StatevectorSimulator(seed=0)
+        exe = sim.compiler.quil_to_native_quil(self.bell_program(100))
+        out = sim.run(exe)
+        self.assertEqual(out.shape, (100, 2))
+        self.assertTrue(all(out[:, 0] == out[:, 1]))
+
+    def test_partial_measurement(self):
+        """Tests measuring a subset of the qubits."""
+        prog = Program()
+        ro = prog.declare("ro", memory_size=1)
+        prog += [RY(pi / 3, 0), RY(pi / 2, 1), MEASURE(1, ro[0])]
+        probs = StatevectorSimulator().probabilities(prog)
+        self.assertTrue(allclose(probs, [0.5, 0.5]))
+
+    def test_encoding_defgate(self):
+        """Tests simulating the DEFGATE written by the dense angle encoding."""
+        cdata = CData(array([[0.5, 0.0]]))
+        encoder = DenseAngleEncoding(cdata, angle_simple_linear, direct(1))
+        prog = encoder[0].circuit
+        ro = prog.declare("ro", memory_size=1)
+        prog += MEASURE(0, ro[0])
+
+        # The encoded state is cos(theta)|0> + exp(i phi) sin(theta)|1> with theta = pi x / 2
+        theta = pi * 0.5 / 2
+        probs = StatevectorSimulator().probabilities(prog)
+        self.assertTrue(allclose(probs, [cos(theta) ** 2, sin(theta) ** 2]))
+
+    def test_batch_probabilities(self):
+        """Tests that batched simulation matches simulating each memory map separately."""
+        sim = StatevectorSimulator()
+
+        # Parametric program to encode a batch of values
+        prefix = Program()
+        x = prefix.declare("x", "REAL", 2)
+        prefix += [RY(x[0], 0), RZ(x[1], 0), RY(2 * x[1], 1)]
+
+        # Shared program applied to all encoded states
+        suffix = Program()
+        ro = suffix.declare("ro", memory_size=2)
+        suffix += [H(0), CNOT(0, 1), RY(0.3, 1), MEASURE(1, ro[0]), MEASURE(0, ro[1])]
+
+        values = array([[0.1, 0.2, 0.3], [1.0, 2.0, 3.0]])
+        states = sim.batch_wavefunctions(prefix, {"x": values}, 3)
+        batch = sim.batch_probabilities(states, suffix)
+
+        for ii in range(3):
+            single = sim.probabilities(prefix + suffix, {"x": list(values[:, ii])})
+            self.assertTrue(allclose(batch[ii], single))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,3 +12,6 @@
 
 from nisqai.utils._program_utils import order, ascii_drawer_simple
 from nisqai.utils._engine import Engine, checkStatusQVM, checkStatusQUILC, startQVMandQUILC
+from nisqai.utils._engine_pool import EnginePool, ComputerDispatcher
+from nisqai.utils._profiler import Profiler
+from nisqai.utils._random import as_generator, spawn_generators
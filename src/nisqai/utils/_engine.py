@@ -29,7 +29,8 @@ class DeactivateQVMError(Exception):
 class Engine:
     # Initializing the servers with default: None
     def __init__(self):
-        self.local_address = 'https://127.0.0.1:'
+        self.local_address = 'http://127.0.0.1:'
+        self.compiler_address = 'tcp://127.0.0.1:'
         self.qvm_server = None
         self.qvm_exec = None
         self.qvm_port = None
@@ -52,7 +53,8 @@ class Engine:
         Returns:
 
         """
-        if self._checkQVM():
+        # A server on a new port cannot already be running
+        if default_port and self._checkQVM():
             warnings.warn('Skipping... QVM server is already running!')
             # Generates list of all running processes
             proc_list = [x.as_dict(attrs=['pid', 'name'])
@@ -91,7 +93,8 @@ class Engine:
         Returns:
 
         """
-        if self._checkQUILC():
+        # A server on a new port cannot already be running
+        if default_port and self._checkQUILC():
             warnings.warn('Skipping... QUILC server is already running!')
             # Generates list of all running processes
             proc_list = [x.as_dict(attrs=['pid', 'name'])
@@ -126,7 +129,7 @@ class Engine:
         else:
             qvm_url = self.qvm_port if self.qvm_port is None else self.local_address + \
                 str(self.qvm_port)
-            quilc_url = self.quilc_port if self.quilc_port is None else self.local_address + \
+            quilc_url = self.quilc_port if self.quilc_port is None else self.compiler_address + \
                 str(self.quilc_port)
             # Forest Connections are used when we assign modified ports to the servers
             self.forest_connection = ForestConnection(sync_endpoint = qvm_url,
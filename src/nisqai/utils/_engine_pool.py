@@ -0,0 +1,204 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Pool of QVM and quilc servers for running many circuits in parallel.
+
+A single QVM process becomes the bottleneck once circuits are run in parallel
+(see the max_workers argument of Network.cost). An EnginePool starts several
+QVM servers on free ports and returns a ComputerDispatcher which hands each
+circuit execution to a computer that is not busy. Networks compile each program
+once and cache the executable, so all computers share a single quilc server.
+
+Example usage:
+
+    >>> pool = EnginePool(4)
+    >>> pool.start()
+    >>> qnn = Network([encoder, ansatz, measure], pool.dispatcher("1q-qvm"))
+    >>> qnn.cost(angles, max_workers=4)
+    >>> pool.stop()
+"""
+
+# Imports
+from contextlib import contextmanager
+from queue import Queue
+import socket
+import time
+
+from pyquil import get_qc
+from pyquil.api import ForestConnection
+
+from nisqai.utils._engine import Engine
+
+
+class ComputerDispatcher:
+    """Load balances circuit executions over a list of identical quantum computers.
+
+    Each computer is used by at most one thread at a time. A thread which runs
+    a program gets the first computer which is free, waiting if all are busy.
+    """
+
+    def __init__(self, computers):
+        """Initializes a ComputerDispatcher.
+
+        Args:
+            computers : list[pyquil.api.QuantumComputer]
+                Quantum computers to dispatch to. All computers must have the same name
+                so that a program compiled for one of them runs on all of them.
+        """
+        if len(computers) == 0:
+            raise ValueError("At least one computer is required.")
+        if len(set(computer.name for computer in computers)) != 1:
+            raise ValueError("All computers must have the same name.")
+
+        self.computers = list(computers)
+        self._free = Queue()
+        for computer in self.computers:
+            self._free.put(computer)
+
+    @property
+    def name(self):
+        """Returns the name of the computers."""
+        return self.computers[0].name
+
+    @property
+    def compiler(self):
+        """Returns the compiler of the first computer."""
+        return self.computers[0].compiler
+
+    @contextmanager
+    def acquire(self):
+        """Context manager which returns a free computer and releases it afterwards."""
+        computer = self._free.get()
+        try:
+            yield computer
+        finally:
+            self._free.put(computer)
+
+    def run(self, executable, memory_map=None):
+        """Runs the executable on a free computer and returns the raw results.
+
+        Args:
+            executable : pyquil.Program
+                Compiled program to run.
+
+            memory_map : dict
+                Values of the declared memory regions in the program.
+        """
+        with self.acquire() as computer:
+            return computer.run(executable, memory_map=memory_map)
+
+    def __len__(self):
+        """Returns the number of computers."""
+        return len(self.computers)
+
+
+class EnginePool:
+    """Pool of QVM servers, each running on its own port, which share one quilc server."""
+
+    def __init__(self, num_engines, qvm_executable=None, quilc_executable=None, timeout=30.0):
+        """Initializes an EnginePool.
+
+        Args:
+            num_engines : int
+                Number of QVM servers to start.
+
+            qvm_executable : str
+                Path to the qvm server executable.
+
+            quilc_executable : str
+                Path to the quilc server executable.
+
+            timeout : float
+                Number of seconds to wait for each server to accept connections.
+        """
+        if num_engines <= 0:
+            raise ValueError("num_engines must be a positive integer.")
+        self.num_engines = num_engines
+        self.qvm_executable = qvm_executable
+        self.quilc_executable = quilc_executable
+        self.timeout = timeout
+
+        # Engines running the QVM servers, and the engine running the quilc server
+        self.engines = []
+        self.compiler = None
+
+    def start(self):
+        """Starts all QVM servers and the quilc server and waits until they accept connections.
+
+        If a server fails to start, the servers which were already started are stopped
+        before the error is raised.
+        """
+        try:
+            self.compiler = Engine()
+            self.compiler.startQUILC(self.quilc_executable, default_port=False)
+            for _ in range(self.num_engines):
+                engine = Engine()
+                self.engines.append(engine)
+                engine.startQVM(self.qvm_executable, default_port=False)
+
+            _wait_for_port(self.compiler.quilc_port, self.timeout)
+            compiler_endpoint = self.compiler.compiler_address + str(self.compiler.quilc_port)
+            for engine in self.engines:
+                _wait_for_port(engine.qvm_port, self.timeout)
+                engine.forest_connection = ForestConnection(
+                    sync_endpoint=engine.local_address + str(engine.qvm_port), compiler_endpoint=compiler_endpoint
+                )
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        """Stops all QVM servers and the quilc server of the pool which are running."""
+        for engine in self.engines:
+            if engine.qvm_server is not None:
+                engine.stopQVM()
+        if self.compiler is not None and self.compiler.quilc_server is not None:
+            self.compiler.stopQUILC()
+        self.engines = []
+        self.compiler = None
+
+    def dispatcher(self, computer_name):
+        """Returns a ComputerDispatcher with one quantum computer per engine.
+
+        Args:
+            computer_name : str
+                Name of the quantum computer, e.g. "2q-qvm".
+        """
+        if len(self.engines) == 0:
+            raise RuntimeError("The engine pool is not running. Call EnginePool.start first.")
+        return ComputerDispatcher(
+            [get_qc(computer_name, connection=engine.forest_connection) for engine in self.engines]
+        )
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        """Returns the number of engines in the pool."""
+        return self.num_engines
+
+
+def _wait_for_port(port, timeout):
+    """Waits until a server on the local host accepts connections on the port."""
+    start = time.time()
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1.0):
+                return
+        except OSError:
+            if time.time() - start > timeout:
+                raise TimeoutError("No server is accepting connections on port {}.".format(port))
+            time.sleep(0.1)
@@ -0,0 +1,131 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from numpy import array
+
+from nisqai.utils._engine import Engine
+from nisqai.utils._engine_pool import ComputerDispatcher, EnginePool
+
+
+class CountingComputer:
+    """Stand-in for a QuantumComputer which records how it is used."""
+
+    def __init__(self, name="1q-qvm"):
+        self.name = name
+        self.compiler = None
+        self.runs = 0
+        self.busy = False
+        self.overlapped = False
+
+    def run(self, executable, memory_map=None):
+        if self.busy:
+            self.overlapped = True
+        self.busy = True
+        time.sleep(0.01)
+        self.runs += 1
+        self.busy = False
+        return array([[0]])
+
+
+class TestComputerDispatcher(unittest.TestCase):
+    """Unit tests for ComputerDispatcher class."""
+
+    def test_spreads_runs(self):
+        """Tests that runs from many threads are spread over all computers without overlap."""
+        computers = [CountingComputer() for _ in range(3)]
+        dispatcher = ComputerDispatcher(computers)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: dispatcher.run(None), range(30)))
+
+        self.assertEqual(sum(computer.runs for computer in computers), 30)
+        self.assertTrue(all(computer.runs > 0 for computer in computers))
+        self.assertFalse(any(computer.overlapped for computer in computers))
+
+    def test_acquire_releases(self):
+        """Tests that an acquired computer is released after use."""
+        dispatcher = ComputerDispatcher([CountingComputer()])
+        with dispatcher.acquire() as computer:
+            self.assertEqual(computer.name, "1q-qvm")
+        with dispatcher.acquire() as computer:
+            self.assertEqual(computer.name, "1q-qvm")
+
+    def test_name(self):
+        """Tests the name of the dispatcher is the name of the computers."""
+        dispatcher = ComputerDispatcher([CountingComputer("2q-qvm"), CountingComputer("2q-qvm")])
+        self.assertEqual(dispatcher.name, "2q-qvm")
+        self.assertEqual(len(dispatcher), 2)
+
+    def test_different_names(self):
+        """Tests that computers with different names raise an error."""
+        with self.assertRaises(ValueError):
+            ComputerDispatcher([CountingComputer("1q-qvm"), CountingComputer("2q-qvm")])
+
+    def test_no_computers(self):
+        """Tests that an empty list of computers raises an error."""
+        with self.assertRaises(ValueError):
+            ComputerDispatcher([])
+
+
+class TestEnginePool(unittest.TestCase):
+    """Unit tests for EnginePool class."""
+
+    def test_invalid_size(self):
+        """Tests that a pool must have at least one engine."""
+        with self.assertRaises(ValueError):
+            EnginePool(0)
+
+    def test_dispatcher_before_start(self):
+        """Tests that a dispatcher cannot be made before the pool is started."""
+        with self.assertRaises(RuntimeError):
+            EnginePool(2).dispatcher("1q-qvm")
+
+    def test_failed_start(self):
+        """Tests that the servers already started are stopped when a server fails to start."""
+        engines = []
+
+        class FailingEngine(Engine):
+            """Engine which records its servers instead of starting them, and fails on the third QVM."""
+
+            def __init__(self):
+                super().__init__()
+                engines.append(self)
+
+            def startQVM(self, qvm_executable=None, default_port=True):
+                if len(engines) == 4:
+                    raise OSError("qvm failed to start")
+                self.qvm_port, self.qvm_server = 1, Mock()
+
+            def startQUILC(self, quilc_executable=None, default_port=True):
+                self.quilc_port, self.quilc_server = 2, Mock()
+
+        pool = EnginePool(3)
+        with patch("nisqai.utils._engine_pool.Engine", FailingEngine):
+            with self.assertRaises(OSError):
+                pool.start()
+
+        # One quilc server and the first two QVM servers were started, and all were stopped
+        self.assertEqual(len(engines), 4)
+        self.assertTrue(engines[0].quilc_server.terminate.called)
+        for engine in engines[1:3]:
+            self.assertTrue(engine.qvm_server.terminate.called)
+        self.assertIsNone(engines[3].qvm_server)
+        self.assertEqual(pool.engines, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
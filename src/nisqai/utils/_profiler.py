@@ -0,0 +1,148 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Counters and timers for finding where time goes in a Network.
+
+A Profiler attached to a Network times each phase of propagating a data point:
+
+    "build": Splicing the encoder circuit of a data point into the other layers.
+    "compile": Compiling a program (quilc), only on executable cache misses.
+    "run": Running the executable on the computer.
+    "outcome": Constructing the MeasurementOutcome.
+    "predict": Calling the predictor.
+    "simulate": Batched simulation of all data points (batched networks only).
+
+and counts cache hits and misses ("compile.hit", "compile.miss"), propagated
+data points ("propagate") and data points which share the outcome of an identical
+feature vector ("deduplicated"). Network.train adds the "train.cost" and "train.gradient"
+timers for each evaluation of the objective and its gradient.
+
+Example usage:
+
+    >>> profiler = Profiler()
+    >>> qnn = Network([encoder, ansatz, measure], "2q-qvm", profiler=profiler)
+    >>> qnn.train(initial_angles)
+    >>> print(profiler.report())
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+from numpy import histogram
+
+
+class Profiler:
+    """Thread safe counters and cumulative timers, with optional per-call histograms."""
+
+    def __init__(self, histograms=False):
+        """Initializes a Profiler.
+
+        Args:
+            histograms : bool (default: False)
+                If True, the duration of every timed call is stored so that
+                Profiler.histogram can be used. Otherwise only totals are kept.
+        """
+        self.histograms = histograms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Removes all counts and timings."""
+        with self._lock:
+            self._counters = {}
+            self._timers = {}
+            self._durations = {}
+
+    def count(self, name, n=1):
+        """Adds n to the counter with the given name."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        """Adds one call of the given duration to the timer with the given name."""
+        with self._lock:
+            calls, total, low, high = self._timers.get(name, (0, 0.0, seconds, seconds))
+            self._timers[name] = (calls + 1, total + seconds, min(low, seconds), max(high, seconds))
+            if self.histograms:
+                self._durations.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Context manager which adds the time spent in the block to the timer with the given name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def wrap(self, name, function):
+        """Returns a function which calls the function and adds its duration to the timer with the given name."""
+        def timed(*args, **kwargs):
+            with self.timer(name):
+                return function(*args, **kwargs)
+        return timed
+
+    @property
+    def counters(self):
+        """Returns a dictionary of {name: count}."""
+        with self._lock:
+            return dict(self._counters)
+
+    @property
+    def timers(self):
+        """Returns a dictionary of {name: {"calls", "total", "mean", "min", "max"}} with times in seconds."""
+        with self._lock:
+            return dict(
+                (name, dict(calls=calls, total=total, mean=total / calls, min=low, max=high))
+                for (name, (calls, total, low, high)) in self._timers.items()
+            )
+
+    def durations(self, name):
+        """Returns the list of durations of all calls of the timer. Requires histograms=True."""
+        if not self.histograms:
+            raise ValueError("Durations of single calls are only stored with histograms=True.")
+        with self._lock:
+            return list(self._durations.get(name, []))
+
+    def histogram(self, name, bins=10):
+        """Returns (counts, bin edges) of the durations of all calls of the timer, as numpy.histogram.
+
+        Args:
+            name : str
+                Name of the timer.
+
+            bins : Union[int, Sequence[float]] (default: 10)
+                Number of bins or bin edges in seconds.
+        """
+        return histogram(self.durations(name), bins=bins)
+
+    def stats(self):
+        """Returns a dictionary with the "counters" and "timers" of the profiler."""
+        return dict(counters=self.counters, timers=self.timers)
+
+    def report(self):
+        """Returns a table of all timers, sorted by total time, followed by all counters."""
+        lines = ["{:<20}{:>10}{:>14}{:>14}".format("timer", "calls", "total (s)", "mean (ms)")]
+        timers = self.timers
+        for name in sorted(timers, key=lambda key: -timers[key]["total"]):
+            timer = timers[name]
+            lines.append("{:<20}{:>10d}{:>14.4f}{:>14.4f}".format(
+                name, timer["calls"], timer["total"], 1000 * timer["mean"]
+            ))
+        counters = self.counters
+        if counters:
+            lines.append("")
+            lines.append("{:<20}{:>10}".format("counter", "count"))
+            for name in sorted(counters):
+                lines.append("{:<20}{:>10d}".format(name, counters[name]))
+        return "\n".join(lines)
@@ -0,0 +1,69 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+
+from nisqai.utils._profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    """Unit tests for Profiler class."""
+
+    def test_counters(self):
+        """Tests counting from several threads."""
+        profiler = Profiler()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: profiler.count("calls"), range(100)))
+        profiler.count("shots", 10)
+        self.assertEqual(profiler.counters, {"calls": 100, "shots": 10})
+
+    def test_timers(self):
+        """Tests cumulative timers."""
+        profiler = Profiler()
+        for _ in range(3):
+            with profiler.timer("sleep"):
+                time.sleep(0.01)
+        profiler.add_time("fixed", 2.0)
+        profiler.add_time("fixed", 4.0)
+
+        timers = profiler.timers
+        self.assertEqual(timers["sleep"]["calls"], 3)
+        self.assertGreaterEqual(timers["sleep"]["total"], 0.03)
+        self.assertEqual(timers["fixed"], dict(calls=2, total=6.0, mean=3.0, min=2.0, max=4.0))
+
+        # Wrapped functions are timed and return their values
+        square = profiler.wrap("square", lambda x: x ** 2)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(profiler.timers["square"]["calls"], 1)
+
+        # Histograms require storing the duration of every call
+        with self.assertRaises(ValueError):
+            profiler.histogram("fixed")
+
+        self.assertIn("sleep", profiler.report())
+        profiler.reset()
+        self.assertEqual(profiler.stats(), dict(counters={}, timers={}))
+
+    def test_histogram(self):
+        """Tests histograms of the durations of single calls."""
+        profiler = Profiler(histograms=True)
+        for seconds in (0.5, 1.5, 1.6, 2.5):
+            profiler.add_time("run", seconds)
+        counts, edges = profiler.histogram("run", bins=[0, 1, 2, 3])
+        self.assertEqual(list(counts), [1, 2, 1])
+        self.assertEqual(profiler.durations("run"), [0.5, 1.5, 1.6, 2.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Random number generators for reproducible runs, in serial or in parallel.
+
+NISQAI never uses the global NumPy random state. Functions and classes with
+randomness take a seed, which may be
+
+    None: fresh entropy from the operating system,
+    int: a fixed seed,
+    numpy.random.SeedSequence: a seed sequence, e.g. one of SeedSequence.spawn,
+    numpy.random.Generator: a generator, which is used (and advanced) directly,
+
+and parallel work gets one child generator per job from spawn_generators, so
+the results do not depend on the number of workers.
+"""
+
+from numpy import random
+
+
+def as_generator(seed=None):
+    """Returns a numpy.random.Generator for the seed. Generators are returned unchanged.
+
+    Args:
+        seed : Union[None, int, numpy.random.SeedSequence, numpy.random.Generator]
+            Seed of the generator.
+    """
+    return random.default_rng(seed)
+
+
+def spawn_generators(rng, num):
+    """Returns a list of num independent generators derived from the generator.
+
+    The children are seeded by a SeedSequence whose entropy is drawn from rng, so they
+    only depend on the state of rng, and rng advances by the same amount for any num.
+
+    Args:
+        rng : numpy.random.Generator
+            Parent generator.
+
+        num : int
+            Number of child generators, e.g. one per job.
+    """
+    entropy = rng.integers(0, 2 ** 63, size=4).tolist()
+    return [random.default_rng(child) for child in random.SeedSequence(entropy).spawn(num)]
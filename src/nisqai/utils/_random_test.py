@@ -0,0 +1,44 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from numpy import random
+
+from nisqai.utils._random import as_generator, spawn_generators
+
+
+class RandomTest(unittest.TestCase):
+    """Unit tests for the random number generator helpers."""
+
+    def test_as_generator(self):
+        """Tests converting seeds to generators."""
+        rng = random.default_rng(1)
+        self.assertIs(as_generator(rng), rng)
+        self.assertEqual(as_generator(7).random(), random.default_rng(7).random())
+        self.assertEqual(as_generator(random.SeedSequence(7)).random(), random.default_rng(7).random())
+
+    def test_spawn_generators(self):
+        """Tests that child generators are reproducible and independent."""
+        draws = [[child.random() for child in spawn_generators(random.default_rng(2), 4)] for _ in range(2)]
+        self.assertEqual(draws[0], draws[1])
+        self.assertEqual(len(set(draws[0])), 4)
+
+        # The first children do not depend on the number of children, and the parent advances the same
+        rng, other = random.default_rng(2), random.default_rng(2)
+        self.assertEqual([child.random() for child in spawn_generators(other, 2)], draws[0][:2])
+        spawn_generators(rng, 4)
+        self.assertEqual(rng.random(), other.random())
+
+
+if __name__ == "__main__":
+    unittest.main()